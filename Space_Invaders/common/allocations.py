@@ -0,0 +1,25 @@
+class AllocationCounter:
+    """
+    Conta le allocazioni di oggetti di gioco (entità, Rect, crescita degli archivi).
+    La simulazione azzera il conteggio del frame all'inizio di ogni step:
+    durante il gioco a regime il valore per frame deve restare a zero.
+    """
+    __slots__ = ("frame", "total", "by_kind")
+
+    def __init__(self):
+        self.frame = 0
+        self.total = 0
+        self.by_kind = {}
+
+    def record(self, kind, count=1):
+        """Registra una o più allocazioni del tipo indicato"""
+        self.frame += count
+        self.total += count
+        self.by_kind[kind] = self.by_kind.get(kind, 0) + count
+
+    def start_frame(self):
+        """Azzera il contatore del frame corrente"""
+        self.frame = 0
+
+# Contatore condiviso da tutti i moduli
+ALLOCATIONS = AllocationCounter()
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import mmap
+import os
+import pygame
+import numpy as np
+
+CACHE_MAGIC = b"SIIC"
+CACHE_VERSION = 1
+# Allineamento dei dati dei pixel nel file
+CACHE_ALIGN = 16
+
+def _file_hash(path):
+    """Hash SHA-1 del contenuto di un file sorgente"""
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+class ImageCache:
+    def __init__(self, path, base_path):
+        """
+        Cache su disco delle immagini già scalate, in pixel RGBA grezzi:
+        - path: file della cache
+        - base_path: cartella degli asset (per controllare i sorgenti)
+        Il file viene mappato in memoria e le Surface sono create direttamente
+        dal buffer, senza decodifica né ridimensionamento. Le voci il cui file
+        sorgente è cambiato (data di modifica e hash) vengono ignorate e
+        rigenerate al prossimo save().
+        """
+        self.path = path
+        self.base_path = base_path
+        self.stale = False  # True se il file va riscritto
+        self._entries = {}  # Chiave -> {"source", "width", "height", "offset"}
+        self._sources = {}  # Sorgente -> {"mtime", "size", "sha1"}
+        self._new = {}      # Chiave -> (sorgente, Surface) da aggiungere al file
+        self._file = None
+        self._mmap = None
+        self.open()
+
+    @staticmethod
+    def key(relative_path, size, keep_aspect_ratio):
+        return f"{relative_path}|{size[0]}x{size[1]}|{int(bool(keep_aspect_ratio))}"
+
+    def open(self):
+        """Mappa il file della cache e scarta le voci con sorgente cambiato"""
+        self.close()
+        self._entries, self._sources = {}, {}
+        if not os.path.exists(self.path):
+            self.stale = True
+            return
+        try:
+            self._file = open(self.path, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if self._mmap[:4] != CACHE_MAGIC:
+                raise ValueError("intestazione non valida")
+            version, header_size = np.frombuffer(self._mmap[4:12], dtype="<u4").tolist()
+            if version != CACHE_VERSION:
+                raise ValueError(f"versione {version} non supportata")
+            header = json.loads(self._mmap[12:12 + header_size].decode("utf-8"))
+        except Exception as e:
+            print(f"Cache immagini ignorata ({self.path}): {e}")
+            self.close()
+            self.stale = True
+            return
+
+        for source, info in header["sources"].items():
+            if self._source_valid(source, info):
+                self._sources[source] = info
+            else:
+                self.stale = True
+        self._entries = {key: entry for key, entry in header["entries"].items()
+                         if entry["source"] in self._sources}
+
+    def _source_valid(self, source, info):
+        full_path = self.base_path / source
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return False
+        if stat.st_mtime_ns == info["mtime"] and stat.st_size == info["size"]:
+            return True
+        # Data cambiata: il contenuto può essere identico (es. checkout)
+        if stat.st_size == info["size"] and _file_hash(full_path) == info["sha1"]:
+            info["mtime"] = stat.st_mtime_ns
+            self.stale = True  # Aggiorna la data registrata al prossimo salvataggio
+            return True
+        return False
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def has_source(self, relative_path):
+        """True se la cache contiene varianti valide dell'immagine"""
+        return relative_path in self._sources
+
+    def get(self, key):
+        """Surface costruita dai pixel in cache (None se la voce manca)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        size = (entry["width"], entry["height"])
+        start = entry["offset"]
+        pixels = memoryview(self._mmap)[start:start + size[0] * size[1] * 4]
+        image = pygame.image.frombuffer(pixels, size, "RGBA")
+        if pygame.display.get_surface():
+            # Copia nel formato del display (necessaria anche per staccarsi dal file)
+            return image.convert_alpha()
+        return image.copy()
+
+    def put(self, key, relative_path, surface):
+        """Aggiunge una variante scalata da scrivere al prossimo save()"""
+        self._new[key] = (relative_path, surface)
+        self.stale = True
+
+    def save(self):
+        """Riscrive il file con le voci ancora valide e quelle nuove"""
+        blobs, entries, sources = [], {}, dict(self._sources)
+        for key, entry in self._entries.items():
+            if key not in self._new:
+                start = entry["offset"]
+                blobs.append((key, entry["source"], entry["width"], entry["height"],
+                              self._mmap[start:start + entry["width"] * entry["height"] * 4]))
+        for key, (source, surface) in self._new.items():
+            if source not in sources:
+                full_path = self.base_path / source
+                stat = os.stat(full_path)
+                sources[source] = {"mtime": stat.st_mtime_ns, "size": stat.st_size,
+                                   "sha1": _file_hash(full_path)}
+            width, height = surface.get_size()
+            blobs.append((key, source, width, height, pygame.image.tobytes(surface, "RGBA")))
+
+        # I dati seguono l'intestazione, la cui lunghezza dipende a sua volta dagli offset
+        relative, position = {}, 0
+        for key, source, width, height, data in blobs:
+            entries[key] = {"source": source, "width": width, "height": height}
+            relative[key] = position
+            position += -(-len(data) // CACHE_ALIGN) * CACHE_ALIGN
+        data_start = 0
+        while True:
+            for key, entry in entries.items():
+                entry["offset"] = data_start + relative[key]
+            header = json.dumps({"sources": sources, "entries": entries}).encode("utf-8")
+            needed = -(-(12 + len(header)) // CACHE_ALIGN) * CACHE_ALIGN
+            if needed <= data_start:
+                break
+            data_start = needed
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(CACHE_MAGIC)
+            f.write(np.array([CACHE_VERSION, len(header)], dtype="<u4").tobytes())
+            f.write(header)
+            for (key, _, _, _, data) in blobs:
+                f.seek(entries[key]["offset"])
+                f.write(data)
+        # Il file mappato va chiuso prima di sostituirlo (necessario su Windows)
+        self.close()
+        os.replace(temp_path, self.path)
+        self._new.clear()
+        self.stale = False
+        self.open()
@@ -0,0 +1,46 @@
+import threading
+
+class BackgroundLoader:
+    def __init__(self, tasks):
+        """
+        Esegue una lista di caricamenti su un thread separato:
+        - tasks: lista di (descrizione, funzione) eseguite in ordine
+        Il thread principale legge progress/status/done senza bloccarsi.
+        Le funzioni non devono toccare il display (niente convert/convert_alpha):
+        quella parte va fatta dal thread principale quando done è True.
+        """
+        self.tasks = list(tasks)
+        self.completed = 0
+        self.status = self.tasks[0][0] if self.tasks else ""
+        self.errors = []
+        self._thread = threading.Thread(target=self._run, name="asset-loader", daemon=True)
+
+    def start(self):
+        """Avvia il caricamento in background"""
+        self._thread.start()
+        return self
+
+    def _run(self):
+        for description, task in self.tasks:
+            self.status = description
+            try:
+                task()
+            except Exception as e:
+                print(f"Errore nel caricamento in background ({description}): {e}")
+                self.errors.append((description, e))
+            self.completed += 1
+
+    @property
+    def progress(self):
+        """Frazione dei caricamenti completati (0.0 - 1.0)"""
+        return self.completed / len(self.tasks) if self.tasks else 1.0
+
+    @property
+    def done(self):
+        return self.completed >= len(self.tasks)
+
+    def wait(self, timeout=None):
+        """Attende la fine di tutti i caricamenti"""
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        return self.done
@@ -1,97 +1,235 @@
-import pygame
-from pathlib import Path
-
-class AssetManager:
-    def __init__(self, base_path="assets"):
-        """
-        Gestisce il caricamento di tutti gli asset del gioco
-        - base_path: percorso base degli asset (default 'assets')
-        """
-        self.base_path = Path(__file__).parent.parent / base_path
-        self._images = {}
-        self._fonts = {}
-        self._sounds = {}  # Dizionario per i suoni brevi
-        self._music = None  # Percorso della musica corrente
-        
-        # Inizializza il mixer audio
-        pygame.mixer.init()
-        
-    def load_image(self, relative_path, size=None, keep_aspect_ratio=False):
-        """Carica un'immagine con opzioni avanzate di ridimensionamento"""
-        try:
-            full_path = self.base_path / relative_path
-            image = pygame.image.load(str(full_path)).convert_alpha()
-            
-            if size:
-                if keep_aspect_ratio:
-                    # Calcola il rapporto di scala mantenendo le proporzioni
-                    scale = min(size[0]/image.get_width(), size[1]/image.get_height())
-                    new_size = (int(image.get_width() * scale), 
-                            int(image.get_height() * scale))
-                    return pygame.transform.scale(image, new_size)
-                else:
-                    return pygame.transform.scale(image, size)
-            return image
-        except Exception as e:
-            print(f"Errore nel caricamento dell'immagine {relative_path}: {e}")
-            # Crea un fallback visibile
-            surf = pygame.Surface((50, 50), pygame.SRCALPHA)
-            pygame.draw.rect(surf, (255, 0, 0), (0, 0, 50, 50), 2)
-            return surf
-    
-    def get_image(self, relative_path):
-        """Recupera un'immagine già caricata"""
-        return self._images.get(relative_path)
-    
-    def load_background(self, relative_path, screen_size):
-        """Carica uno sfondo già scalato alla dimensione dello schermo"""
-        bg = self.load_image(relative_path)
-        return pygame.transform.scale(bg, screen_size)
-    
-    # Metodi per la gestione dell'audio
-    def load_sound(self, relative_path, volume=0.5):
-        """Carica un effetto sonoro"""
-        try:
-            full_path = self.base_path / relative_path
-            sound = pygame.mixer.Sound(str(full_path))
-            sound.set_volume(volume)
-            self._sounds[relative_path] = sound
-            return sound
-        except Exception as e:
-            print(f"Errore nel caricamento del suono {relative_path}: {e}")
-            return None
-    
-    def play_sound(self, relative_path):
-        """Riproduce un effetto sonoro"""
-        if relative_path in self._sounds:
-            self._sounds[relative_path].play()
-    
-    def load_music(self, relative_path, volume=0.5):
-        """Carica una traccia musicale"""
-        try:
-            full_path = self.base_path / relative_path
-            pygame.mixer.music.load(str(full_path))
-            pygame.mixer.music.set_volume(volume)
-            self._music = relative_path
-            return True
-        except Exception as e:
-            print(f"Errore nel caricamento della musica {relative_path}: {e}")
-            return False
-    
-    def play_music(self, loops=-1):
-        """Riproduce la musica (loops=-1 per ripetere all'infinito)"""
-        if self._music:
-            pygame.mixer.music.play(loops)
-    
-    def stop_music(self):
-        """Ferma la riproduzione musicale"""
-        pygame.mixer.music.stop()
-    
-    def set_music_volume(self, volume):
-        """Imposta il volume della musica (0.0 - 1.0)"""
-        pygame.mixer.music.set_volume(volume)
-    
-    def set_sound_volume(self, relative_path, volume):
-        """Imposta il volume di un effetto sonoro specifico"""
-        if relative_path in self._sounds:
-            self._sounds[relative_path].set_volume(volume)
\ No newline at end of file
+import pygame
+from collections import OrderedDict
+from pathlib import Path
+from common.asset_cache import ImageCache
+from common.sound_mixer import SoundMixer
+
+# Memoria massima occupata dalle immagini in cache (in byte)
+IMAGE_CACHE_BYTES = 64 * 1024 * 1024
+# Numero massimo di testi renderizzati tenuti in cache
+TEXT_CACHE_SIZE = 256
+# File della cache su disco delle immagini scalate (relativo alla cartella degli asset)
+IMAGE_CACHE_FILE = ".cache/images.bin"
+
+class AssetManager:
+    def __init__(self, base_path="assets", max_cache_bytes=IMAGE_CACHE_BYTES, disk_cache=IMAGE_CACHE_FILE):
+        """
+        Gestisce il caricamento di tutti gli asset del gioco
+        - base_path: percorso base degli asset (default 'assets')
+        - max_cache_bytes: limite di memoria della cache immagini (politica LRU)
+        - disk_cache: file della cache delle immagini scalate (None per disattivarla)
+        """
+        self.base_path = Path(__file__).parent.parent / base_path
+        # Varianti scalate già pronte su disco: evitano decodifica e ridimensionamento
+        self.disk_cache = ImageCache(str(self.base_path / disk_cache), self.base_path) if disk_cache else None
+        # Cache immagini: (percorso, dimensione, mantieni proporzioni) -> Surface
+        # Le immagini originali hanno dimensione None
+        self._images = OrderedDict()
+        self._images_bytes = 0
+        # Immagini decodificate in background, in attesa della conversione
+        self._decoded = {}
+        self.max_cache_bytes = max_cache_bytes
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._fonts = {}  # Registro dei font: (nome, dimensione) -> Font
+        self._texts = OrderedDict()  # Testi renderizzati (politica LRU)
+        self._sounds = {}  # Dizionario per i suoni brevi: percorso -> (Sound, categoria)
+        self._music = None  # Percorso della musica corrente
+        
+        # Inizializza il mixer audio (con la configurazione di pre_init_mixer, se chiamata)
+        pygame.mixer.init()
+        # Canali riservati per categoria, limite di voci e de-duplicamento per frame
+        self.sound_mixer = SoundMixer()
+        
+    def load_image(self, relative_path, size=None, keep_aspect_ratio=False):
+        """
+        Carica un'immagine con opzioni avanzate di ridimensionamento.
+        Originali e varianti scalate restano in cache: le Surface restituite
+        sono condivise e non vanno modificate.
+        """
+        key = (relative_path, tuple(size) if size else None, bool(size) and keep_aspect_ratio)
+        image = self._cache_get(key)
+        if image is not None:
+            return image
+
+        try:
+            if size and self.disk_cache:
+                image = self.disk_cache.get(ImageCache.key(relative_path, size, keep_aspect_ratio))
+                if image is not None:
+                    self._cache_put(key, image)
+                    return image
+            if size:
+                # La variante scalata parte dall'originale (anch'esso in cache)
+                image = self.load_image(relative_path)
+                if keep_aspect_ratio:
+                    # Calcola il rapporto di scala mantenendo le proporzioni
+                    scale = min(size[0]/image.get_width(), size[1]/image.get_height())
+                    new_size = (int(image.get_width() * scale), 
+                            int(image.get_height() * scale))
+                    image = pygame.transform.scale(image, new_size)
+                else:
+                    image = pygame.transform.scale(image, size)
+                if self.disk_cache:
+                    self.disk_cache.put(ImageCache.key(relative_path, size, keep_aspect_ratio),
+                                        relative_path, image)
+            else:
+                image = self._decoded.pop(relative_path, None)
+                if image is None:
+                    full_path = self.base_path / relative_path
+                    image = pygame.image.load(str(full_path))
+                image = image.convert_alpha()
+            self._cache_put(key, image)
+            return image
+        except Exception as e:
+            print(f"Errore nel caricamento dell'immagine {relative_path}: {e}")
+            # Crea un fallback visibile
+            surf = pygame.Surface((50, 50), pygame.SRCALPHA)
+            pygame.draw.rect(surf, (255, 0, 0), (0, 0, 50, 50), 2)
+            return surf
+    
+    def preload_image(self, relative_path):
+        """
+        Decodifica un'immagine senza convertirla (sicuro su un thread separato):
+        la conversione avviene al primo load_image sul thread principale
+        """
+        # Solo letture della cache: il thread principale può usarla nel frattempo
+        if relative_path in self._decoded or (relative_path, None, False) in self._images:
+            return
+        if self.disk_cache and self.disk_cache.has_source(relative_path):
+            return  # Le varianti scalate arrivano dalla cache su disco
+        try:
+            full_path = self.base_path / relative_path
+            self._decoded[relative_path] = pygame.image.load(str(full_path))
+        except Exception as e:
+            print(f"Errore nel caricamento dell'immagine {relative_path}: {e}")
+
+    def get_image(self, relative_path, size=None, keep_aspect_ratio=False):
+        """Recupera un'immagine già caricata (None se non è in cache)"""
+        key = (relative_path, tuple(size) if size else None, bool(size) and keep_aspect_ratio)
+        return self._cache_get(key)
+    
+    def load_background(self, relative_path, screen_size):
+        """Carica uno sfondo già scalato alla dimensione dello schermo"""
+        return self.load_image(relative_path, screen_size)
+
+    # Gestione della cache immagini
+    def _cache_get(self, key):
+        image = self._images.get(key)
+        if image is None:
+            self.cache_misses += 1
+            return None
+        self.cache_hits += 1
+        self._images.move_to_end(key)
+        return image
+
+    def _cache_put(self, key, image):
+        self._images[key] = image
+        self._images_bytes += self._surface_bytes(image)
+        # Elimina le immagini usate meno di recente finché si rientra nel limite
+        while self._images_bytes > self.max_cache_bytes and len(self._images) > 1:
+            _, evicted = self._images.popitem(last=False)
+            self._images_bytes -= self._surface_bytes(evicted)
+
+    @staticmethod
+    def _surface_bytes(surface):
+        return surface.get_pitch() * surface.get_height()
+
+    def clear_image_cache(self):
+        """Svuota la cache immagini"""
+        self._images.clear()
+        self._images_bytes = 0
+
+    def save_disk_cache(self):
+        """Aggiorna il file della cache su disco se ci sono varianti nuove o non più valide"""
+        if not self.disk_cache or not self.disk_cache.stale:
+            return False
+        try:
+            self.disk_cache.save()
+            return True
+        except Exception as e:
+            print(f"Errore nel salvataggio della cache immagini: {e}")
+            return False
+
+    def cache_stats(self):
+        """Statistiche della cache immagini (voci, memoria, hit e miss)"""
+        return {
+            "entries": len(self._images),
+            "bytes": self._images_bytes,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+        }
+    
+    # Font e testi
+    def get_font(self, name, size):
+        """Restituisce un font dal registro, creandolo solo al primo utilizzo"""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size)
+            self._fonts[key] = font
+        return font
+
+    def render_text(self, text, size, color, font_name=None, antialias=True):
+        """
+        Renderizza un testo riusando la Surface già prodotta per la stessa
+        combinazione di stringa, font, dimensione e colore
+        """
+        key = (text, font_name, size, tuple(color), antialias)
+        surface = self._texts.get(key)
+        if surface is None:
+            surface = self.get_font(font_name, size).render(text, antialias, color)
+            self._texts[key] = surface
+            if len(self._texts) > TEXT_CACHE_SIZE:
+                self._texts.popitem(last=False)
+        else:
+            self._texts.move_to_end(key)
+        return surface
+
+    # Metodi per la gestione dell'audio
+    def load_sound(self, relative_path, volume=0.5, category="sfx"):
+        """Carica un effetto sonoro (category: gruppo di canali su cui suonarlo)"""
+        try:
+            full_path = self.base_path / relative_path
+            sound = pygame.mixer.Sound(str(full_path))
+            sound.set_volume(volume)
+            self._sounds[relative_path] = (sound, category)
+            return sound
+        except Exception as e:
+            print(f"Errore nel caricamento del suono {relative_path}: {e}")
+            return None
+    
+    def play_sound(self, relative_path):
+        """Riproduce un effetto sonoro"""
+        if relative_path in self._sounds:
+            sound, category = self._sounds[relative_path]
+            self.sound_mixer.play(sound, category, relative_path)
+    
+    def load_music(self, relative_path, volume=0.5):
+        """Carica una traccia musicale"""
+        try:
+            full_path = self.base_path / relative_path
+            pygame.mixer.music.load(str(full_path))
+            pygame.mixer.music.set_volume(volume)
+            self._music = relative_path
+            return True
+        except Exception as e:
+            print(f"Errore nel caricamento della musica {relative_path}: {e}")
+            return False
+    
+    def play_music(self, loops=-1):
+        """Riproduce la musica (loops=-1 per ripetere all'infinito)"""
+        if self._music:
+            pygame.mixer.music.play(loops)
+    
+    def stop_music(self):
+        """Ferma la riproduzione musicale"""
+        pygame.mixer.music.stop()
+    
+    def set_music_volume(self, volume):
+        """Imposta il volume della musica (0.0 - 1.0)"""
+        pygame.mixer.music.set_volume(volume)
+    
+    def set_sound_volume(self, relative_path, volume):
+        """Imposta il volume di un effetto sonoro specifico"""
+        if relative_path in self._sounds:
+            self._sounds[relative_path][0].set_volume(volume)
\ No newline at end of file
@@ -0,0 +1,35 @@
+class LayerCompositor:
+    def __init__(self):
+        """
+        Gestisce i livelli precomposti della scena:
+        - livelli statici: costruiti una sola volta per chiave (sfondo, cornici, griglia)
+        - livelli HUD: ricostruiti solo quando cambia il loro stato (es. punteggio e vite)
+        Per frame restano da comporre solo gli sprite in movimento.
+        """
+        self._static = {}
+        self._hud = {}
+
+    def static_layer(self, key, build):
+        """Restituisce il livello statico per la chiave, costruendolo con build() la prima volta"""
+        layer = self._static.get(key)
+        if layer is None:
+            layer = build()
+            self._static[key] = layer
+        return layer
+
+    def hud_layer(self, name, state, build):
+        """
+        Restituisce (Surface, cambiato): il livello viene ricostruito con build()
+        solo quando state è diverso da quello dell'ultima costruzione
+        """
+        cached = self._hud.get(name)
+        if cached is not None and cached[0] == state:
+            return cached[1], False
+        layer = build()
+        self._hud[name] = (state, layer)
+        return layer, True
+
+    def invalidate(self):
+        """Scarta tutti i livelli (es. dopo il cambio dello sfondo)"""
+        self._static.clear()
+        self._hud.clear()
@@ -0,0 +1,65 @@
+import pygame
+
+# Oltre questo numero di rettangoli conviene aggiornare l'intera finestra
+MAX_DIRTY_RECTS = 128
+
+class DirtyRectRenderer:
+    def __init__(self, screen, background):
+        """
+        Rendering a rettangoli sporchi:
+        - screen: superficie della finestra
+        - background: superficie statica da cui ripristinare le aree liberate
+        Ogni frame cancella gli sprite del frame precedente ripristinando lo
+        sfondo, disegna i nuovi e invia al display solo le aree cambiate.
+        """
+        self.screen = screen
+        self.background = background
+        self._previous = []  # Aree occupate dagli sprite nel frame precedente
+        self._current = []
+        self._dirty = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        """Forza il ridisegno completo al prossimo frame (es. cambio di schermata)"""
+        self.full_redraw = True
+
+    def set_background(self, background):
+        """Cambia la superficie di ripristino e forza un ridisegno completo"""
+        self.background = background
+        self.invalidate()
+
+    def begin(self):
+        """Ripristina lo sfondo sotto gli sprite del frame precedente"""
+        if self.full_redraw or len(self._previous) > MAX_DIRTY_RECTS:
+            # Con molti sprite un'unica copia dello sfondo costa meno di tante piccole
+            self.screen.blit(self.background, (0, 0))
+            self.full_redraw = True
+        else:
+            for rect in self._previous:
+                self.screen.blit(self.background, rect, rect)
+            self._dirty.extend(self._previous)
+
+    def draw(self, batch):
+        """Disegna una sequenza (surface, posizione, area) e ne registra le aree"""
+        rects = self.screen.blits(batch)
+        self._current.extend(rects)
+        self._dirty.extend(rects)
+
+    def mark(self, rect):
+        """Segnala un'area cambiata al di fuori degli sprite (es. interfaccia)"""
+        self._dirty.append(pygame.Rect(rect))
+
+    def touches(self, rect):
+        """True se l'area verrà aggiornata in questo frame"""
+        return self.full_redraw or rect.collidelist(self._dirty) != -1
+
+    def present(self):
+        """Invia al display le aree cambiate e prepara il frame successivo"""
+        if self.full_redraw or len(self._dirty) > MAX_DIRTY_RECTS:
+            pygame.display.flip()
+        elif self._dirty:
+            pygame.display.update(self._dirty)
+        self.full_redraw = False
+        self._previous, self._current = self._current, self._previous
+        self._current.clear()
+        self._dirty.clear()
@@ -0,0 +1,251 @@
+import numpy as np
+import pygame
+from common.allocations import ALLOCATIONS
+
+class EntityStore:
+    # Campi memorizzati come array contigui (uno per attributo)
+    # px, py: posizione al tick precedente (per l'interpolazione del rendering)
+    FIELDS = ("x", "y", "w", "h", "vx", "vy", "kind", "id", "px", "py")
+
+    def __init__(self, capacity=64, fixed=False):
+        """
+        Archivio struttura-di-array per entità rettangolari (nemici, proiettili):
+        - capacity: capacità iniziale (raddoppia quando viene superata)
+        - fixed: se True l'archivio funziona da pool a capacità fissa: non cresce
+          mai e spawn() restituisce -1 quando è pieno
+        Le entità vive occupano sempre gli indici [0, count): le rimozioni sono
+        differite (flag alive) e applicate in blocco da compact().
+        Ogni entità riceve anche un id stabile, che non cambia con la compattazione
+        (slot_of[id] restituisce l'indice corrente). Nei pool a capacità fissa
+        gli id delle entità rimosse vengono riusati (sempre i più piccoli
+        liberi): gli id restano sotto capacity e slot_of non cresce mai.
+        """
+        self.capacity = capacity
+        self.fixed = fixed
+        self.count = 0
+        for field in self.FIELDS:
+            setattr(self, "_" + field, np.zeros(capacity, dtype=np.int32))
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._dead = 0
+        self._next_id = 0
+        self.slot_of = np.full(capacity, -1, dtype=np.int32)
+
+    # Viste sulle sole entità in uso
+    @property
+    def x(self):
+        return self._x[:self.count]
+
+    @property
+    def y(self):
+        return self._y[:self.count]
+
+    @property
+    def w(self):
+        return self._w[:self.count]
+
+    @property
+    def h(self):
+        return self._h[:self.count]
+
+    @property
+    def vx(self):
+        return self._vx[:self.count]
+
+    @property
+    def vy(self):
+        return self._vy[:self.count]
+
+    @property
+    def kind(self):
+        return self._kind[:self.count]
+
+    @property
+    def px(self):
+        return self._px[:self.count]
+
+    @property
+    def py(self):
+        return self._py[:self.count]
+
+    @property
+    def id(self):
+        return self._id[:self.count]
+
+    @property
+    def alive(self):
+        return self._alive[:self.count]
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self, needed):
+        """Aumenta la capacità degli array mantenendo i dati esistenti"""
+        ALLOCATIONS.record("EntityStore")
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for field in self.FIELDS + ("alive",):
+            old = getattr(self, "_" + field)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, "_" + field, new)
+        self.capacity = capacity
+
+    def _assign_ids(self, start, end):
+        """Assegna id stabili alle entità appena create negli indici [start, end)"""
+        if self.fixed:
+            # Id liberi = senza slot (le entità morte non compattate tengono il loro)
+            ids = np.flatnonzero(self.slot_of[:self.capacity] < 0)[:end - start]
+            self._id[start:end] = ids
+            self.slot_of[ids] = np.arange(start, end)
+            self._next_id = max(self._next_id, int(ids[-1]) + 1) if len(ids) else self._next_id
+            return
+        first, last = self._next_id, self._next_id + (end - start)
+        if last > len(self.slot_of):
+            size = len(self.slot_of)
+            while size < last:
+                size *= 2
+            ALLOCATIONS.record("EntityStore")
+            slot_of = np.full(size, -1, dtype=np.int32)
+            slot_of[:len(self.slot_of)] = self.slot_of
+            self.slot_of = slot_of
+        self._id[start:end] = np.arange(first, last)
+        self.slot_of[first:last] = np.arange(start, end)
+        self._next_id = last
+
+    def spawn(self, x, y, w, h, vx=0, vy=0, kind=0):
+        """Aggiunge un'entità e ne restituisce l'indice (-1 se il pool è pieno)"""
+        if self.count >= self.capacity:
+            if self.fixed:
+                return -1
+            self._grow(self.count + 1)
+        i = self.count
+        self._x[i], self._y[i], self._w[i], self._h[i] = x, y, w, h
+        self._vx[i], self._vy[i], self._kind[i] = vx, vy, kind
+        self._px[i], self._py[i] = x, y
+        self._alive[i] = True
+        self.count += 1
+        self._assign_ids(i, i + 1)
+        return i
+
+    def spawn_many(self, xs, ys, w, h, vx=0, vy=0, kinds=0):
+        """Aggiunge un blocco di entità (xs, ys array; gli altri valori scalari o array)"""
+        n = len(xs)
+        if self.fixed:
+            n = min(n, self.capacity - self.count)
+            xs, ys = xs[:n], ys[:n]
+            kinds = kinds if np.isscalar(kinds) else kinds[:n]
+        start, end = self.count, self.count + n
+        if end > self.capacity:
+            self._grow(end)
+        self._x[start:end] = xs
+        self._y[start:end] = ys
+        self._w[start:end] = w
+        self._h[start:end] = h
+        self._vx[start:end] = vx
+        self._vy[start:end] = vy
+        self._kind[start:end] = kinds
+        self._px[start:end] = xs
+        self._py[start:end] = ys
+        self._alive[start:end] = True
+        self.count = end
+        self._assign_ids(start, end)
+
+    def kill(self, index):
+        """Segna una o più entità come morte (rimozione differita)"""
+        self._alive[:self.count][index] = False
+        self._dead = self.count - int(np.count_nonzero(self.alive))
+
+    def kill_mask(self, mask):
+        """Segna come morte le entità selezionate da una maschera booleana"""
+        if mask.any():
+            self.alive[mask] = False
+            self._dead = self.count - int(np.count_nonzero(self.alive))
+
+    def compact(self):
+        """Rimuove le entità morte mantenendo l'ordine delle vive"""
+        if not self._dead:
+            return
+        keep = np.flatnonzero(self.alive)
+        n = len(keep)
+        self.slot_of[self.id[~self.alive]] = -1
+        for field in self.FIELDS:
+            arr = getattr(self, "_" + field)
+            arr[:n] = arr[keep]
+        self._alive[:n] = True
+        self._alive[n:self.count] = False
+        self.count = n
+        self._dead = 0
+        self.slot_of[self.id] = np.arange(n)
+
+    def clear(self):
+        """Svuota l'archivio senza liberare la memoria"""
+        self._alive[:self.count] = False
+        self.count = 0
+        self._dead = 0
+        self.slot_of[:self._next_id] = -1
+        self._next_id = 0
+
+    def save_positions(self):
+        """Memorizza le posizioni correnti come posizioni del tick precedente"""
+        self.px[:] = self.x
+        self.py[:] = self.y
+
+    def positions(self, alpha=1.0):
+        """
+        Posizioni interpolate tra il tick precedente (alpha=0) e quello
+        corrente (alpha=1), arrotondate ai pixel
+        """
+        if alpha >= 1.0:
+            return self.x, self.y
+        xs = self.px + np.rint((self.x - self.px) * alpha).astype(np.int32)
+        ys = self.py + np.rint((self.y - self.py) * alpha).astype(np.int32)
+        return xs, ys
+
+    def get_state(self):
+        """Copia dei dati delle entità vive (dizionario di array)"""
+        self.compact()
+        state = {field: getattr(self, field).copy() for field in self.FIELDS}
+        state["next_id"] = np.array([self._next_id], dtype=np.int64)
+        return state
+
+    def set_state(self, state):
+        """Sostituisce il contenuto dell'archivio con uno stato di get_state()"""
+        self.clear()
+        n = len(state["x"])
+        if n > self.capacity:
+            if self.fixed:
+                raise ValueError(f"Stato con {n} entità oltre la capacità del pool ({self.capacity})")
+            self._grow(n)
+        for field in self.FIELDS:
+            getattr(self, "_" + field)[:n] = state[field]
+        self._alive[:n] = True
+        self.count = n
+        next_id = int(state["next_id"][0])
+        if next_id > len(self.slot_of):
+            self.slot_of = np.full(next_id, -1, dtype=np.int32)
+        self._next_id = next_id
+        self.slot_of[self.id] = np.arange(n)
+
+    def move(self):
+        """Applica le velocità a tutte le entità"""
+        self.x[:] += self.vx
+        self.y[:] += self.vy
+
+    def overlaps(self, rect):
+        """Maschera delle entità che si sovrappongono a un pygame.Rect"""
+        x, y = self.x, self.y
+        return ((x < rect.right) & (x + self.w > rect.left) &
+                (y < rect.bottom) & (y + self.h > rect.top) & self.alive)
+
+    def overlap_matrix(self, other):
+        """Matrice (len(self) x len(other)) delle coppie che si sovrappongono"""
+        x, y, w, h = self.x[:, None], self.y[:, None], self.w[:, None], self.h[:, None]
+        return ((x < other.x + other.w) & (other.x < x + w) &
+                (y < other.y + other.h) & (other.y < y + h))
+
+    def rect(self, index):
+        """Costruisce il pygame.Rect di un'entità (per il rendering)"""
+        ALLOCATIONS.record("Rect")
+        return pygame.Rect(int(self._x[index]), int(self._y[index]),
+                           int(self._w[index]), int(self._h[index]))
@@ -0,0 +1,92 @@
+import numpy as np
+
+class Formation:
+    def __init__(self):
+        """
+        Stato aggregato della formazione nemica, aggiornato in modo incrementale:
+        - colonne (nemici con la stessa x) ordinate da sinistra a destra
+        - per ogni colonna i nemici dall'alto in basso: l'ultimo è quello in prima fila
+        - bordo sinistro, destro e inferiore della formazione
+        La formazione si muove in blocco, quindi gli spostamenti aggiornano solo
+        un offset; le eliminazioni toccano la colonna del nemico e, se serve,
+        i bordi. Controlli dei bordi, dell'invasione e scelta del tiratore
+        costano O(1) o O(colonne) invece di O(nemici).
+        """
+        self.dx = self.dy = 0       # Spostamento dalla costruzione
+        self.width = self.height = 0
+        self.col_x = np.zeros(0, dtype=np.int64)  # x iniziale di ogni colonna
+        self.members = []           # Colonna -> id dei nemici vivi ordinati per y
+        self.member_y = []          # Colonna -> y iniziali corrispondenti
+        self.active = []            # Indici delle colonne non vuote, in ordine
+        self._col_of = {}           # Id -> colonna
+        self._bottom = 0
+
+    def build(self, enemies):
+        """Ricostruisce la formazione dalle entità vive di un EntityStore"""
+        self.dx = self.dy = 0
+        self._col_of = {}
+        if not len(enemies):
+            self.col_x = np.zeros(0, dtype=np.int64)
+            self.members, self.member_y, self.active = [], [], []
+            self._bottom = 0
+            return
+        self.width, self.height = int(enemies.w.max()), int(enemies.h.max())
+        self.col_x, columns = np.unique(enemies.x, return_inverse=True)
+        # Ordinati per colonna, poi dall'alto in basso
+        order = np.lexsort((enemies.id, enemies.y, columns))
+        ids, ys, columns = enemies.id[order].tolist(), enemies.y[order].tolist(), columns[order]
+        bounds = np.searchsorted(columns, np.arange(len(self.col_x) + 1)).tolist()
+        self.members = [ids[start:end] for start, end in zip(bounds, bounds[1:])]
+        self.member_y = [ys[start:end] for start, end in zip(bounds, bounds[1:])]
+        self._col_of = dict(zip(ids, columns.tolist()))
+        self.active = list(range(len(self.col_x)))
+        self._update_bottom()
+
+    def shift(self, dx, dy):
+        """Sposta l'intera formazione"""
+        self.dx += dx
+        self.dy += dy
+
+    def remove(self, ids):
+        """Toglie dalla formazione i nemici eliminati"""
+        front_changed = False
+        for entity_id in np.atleast_1d(ids).tolist():
+            col = self._col_of.pop(entity_id, None)
+            if col is None:
+                continue
+            members = self.members[col]
+            index = members.index(entity_id)
+            front_changed |= index == len(members) - 1
+            del members[index]
+            del self.member_y[col][index]
+            if not members:
+                self.active.remove(col)
+        if front_changed:
+            self._update_bottom()
+
+    def _update_bottom(self):
+        # y iniziale più bassa tra i nemici in prima fila (O(colonne))
+        self._bottom = max((self.member_y[col][-1] for col in self.active), default=0)
+
+    def __len__(self):
+        return len(self._col_of)
+
+    @property
+    def left(self):
+        return int(self.col_x[self.active[0]]) + self.dx
+
+    @property
+    def right(self):
+        return int(self.col_x[self.active[-1]]) + self.width + self.dx
+
+    @property
+    def bottom(self):
+        return self._bottom + self.height + self.dy
+
+    def front(self, col):
+        """Id del nemico in prima fila (il più basso) nella colonna indicata"""
+        return self.members[col][-1]
+
+    def random_shooter(self, rng):
+        """Id del nemico in prima fila di una colonna non vuota scelta a caso"""
+        return self.front(self.active[rng.randrange(len(self.active))])
@@ -0,0 +1,74 @@
+from collections import deque
+
+# Tempo di lavoro disponibile per frame (ms) per restare a 60 fps
+FRAME_BUDGET_MS = 1000 / 60
+# Frame misurati prima di ogni decisione
+BUDGET_WINDOW = 60
+# Attesa massima prima di risalire (in finestre) dopo salite fallite di seguito
+MAX_RAISE_BACKOFF = 16
+
+class FrameBudget:
+    def __init__(self, levels, budget_ms=FRAME_BUDGET_MS, window=BUDGET_WINDOW, headroom=0.5):
+        """
+        Livello di degrado scelto in base al tempo di frame misurato:
+        - levels: numero di livelli (0 = qualità piena, levels - 1 = il più economico)
+        - budget_ms: tempo di frame da non superare
+        - window: frame mediati prima di cambiare livello
+        - headroom: si risale solo sotto questa frazione del budget (al
+          livello superiore il frame costa di più: senza margine si oscillerebbe)
+        Sopra il budget si scende di un livello, con margine si risale. Se
+        dopo una salita si deve subito riscendere, l'attesa prima della
+        prossima salita raddoppia. pressure indica se l'ultima finestra
+        chiedeva di andare oltre i livelli disponibili: +1 sopra il budget
+        al livello più basso, -1 con margine a qualità piena, 0 altrimenti.
+        """
+        self.levels = levels
+        self.budget_ms = budget_ms
+        self.headroom = headroom
+        self.level = 0
+        self.average_ms = 0.0  # Media della finestra che ha deciso l'ultimo cambio
+        self.pressure = 0
+        self._samples = deque(maxlen=window)
+        self._frames = 0  # Frame dall'ultimo cambio di livello
+        self._raised = False  # L'ultimo cambio è stato una salita
+        self._raise_after = window
+
+    def record(self, frame_ms):
+        """Registra il tempo di un frame; restituisce True se il livello è cambiato"""
+        samples = self._samples
+        samples.append(frame_ms)
+        self._frames += 1
+        if len(samples) < samples.maxlen:
+            return False
+        average = sum(samples) / len(samples)
+        window = samples.maxlen
+        self.pressure = 0
+        if average > self.budget_ms and self.level < self.levels - 1:
+            if self._raised and self._frames <= window:
+                self._raise_after = min(self._raise_after * 2, window * MAX_RAISE_BACKOFF)
+            self.level += 1
+            self._raised = False
+        elif (average < self.budget_ms * self.headroom and self.level > 0
+              and self._frames >= self._raise_after):
+            self.level -= 1
+            self._raised = True
+        else:
+            if average > self.budget_ms:
+                self.pressure = 1
+            elif average < self.budget_ms * self.headroom and self.level == 0:
+                self.pressure = -1
+            if self._frames > window and self._raised:
+                # La salita ha retto: l'attesa torna quella iniziale
+                self._raise_after, self._raised = window, False
+            return False
+        # Le misure del livello precedente non valgono più
+        self.average_ms = average
+        samples.clear()
+        self._frames = 0
+        return True
+
+    def restart(self):
+        """Scarta le misure raccolte (es. quando il regolatore torna a ricevere i frame)"""
+        self._samples.clear()
+        self._frames = 0
+        self.pressure = 0
@@ -0,0 +1,39 @@
+from common.player import PLAYER_SHOT_COOLDOWN, PLAYER_BULLET_SPEED, PLAYER_SPEED
+from common.shoot import ENEMY_BULLET_SPEED, ENEMY_SHOT_FREQUENCY
+from common.enemy import ENEMY_SPEED
+
+class GameConfig:
+    """
+    Costanti di bilanciamento del gioco riunite in un unico oggetto
+    (velocità in pixel per tick, intervalli in tick). I valori predefiniti
+    sono le costanti dei moduli: Simulation e VectorSimulation leggono da qui.
+    """
+    FIELDS = ("enemy_speed", "enemy_bullet_speed", "enemy_shot_frequency",
+              "player_speed", "player_bullet_speed", "player_shot_cooldown")
+
+    def __init__(self, enemy_speed=ENEMY_SPEED, enemy_bullet_speed=ENEMY_BULLET_SPEED,
+                 enemy_shot_frequency=ENEMY_SHOT_FREQUENCY, player_speed=PLAYER_SPEED,
+                 player_bullet_speed=PLAYER_BULLET_SPEED, player_shot_cooldown=PLAYER_SHOT_COOLDOWN):
+        self.enemy_speed = enemy_speed
+        self.enemy_bullet_speed = enemy_bullet_speed
+        self.enemy_shot_frequency = enemy_shot_frequency
+        self.player_speed = player_speed
+        self.player_bullet_speed = player_bullet_speed
+        self.player_shot_cooldown = player_shot_cooldown
+
+    def replace(self, **changes):
+        """Copia della configurazione con alcuni valori cambiati"""
+        values = self.as_dict()
+        values.update(changes)
+        return GameConfig(**values)
+
+    def as_dict(self):
+        """Valori della configurazione come dizionario (serializzabile in JSON)"""
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __eq__(self, other):
+        return isinstance(other, GameConfig) and self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={value}" for name, value in self.as_dict().items())
+        return f"GameConfig({values})"
@@ -1,10 +1,18 @@
-from enum import Enum
-
-# ===== GAME STATE ===== #
-class GameState(Enum):
-    MENU = 0
-    PLAYING = 1
-    VICTORY = 2
-    GAMEOVER = 3
-    SETTINGS = 4
-    # ... si può espandere per necessità
\ No newline at end of file
+from enum import Enum, IntFlag
+
+# ===== GAME STATE ===== #
+class GameState(Enum):
+    MENU = 0
+    PLAYING = 1
+    VICTORY = 2
+    GAMEOVER = 3
+    SETTINGS = 4
+    # ... si può espandere per necessità
+
+# ===== INPUT ACTIONS ===== #
+class Action(IntFlag):
+    """Azioni di input che guidano la simulazione (combinabili: LEFT | SHOOT)"""
+    NONE = 0
+    LEFT = 1
+    RIGHT = 2
+    SHOOT = 4
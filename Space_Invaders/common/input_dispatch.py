@@ -0,0 +1,81 @@
+import time
+from collections import deque
+import numpy as np
+import pygame
+
+# Campioni di latenza conservati per i percentili
+LATENCY_HISTORY = 600
+
+def event_code(event):
+    """Tasto o bottone del mouse di un evento (None per gli altri eventi)"""
+    if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+        return event.key
+    if event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+        return event.button
+    return None
+
+class InputDispatcher:
+    def __init__(self):
+        """
+        Tabella degli handler di input per stato:
+        {stato: {(tipo di evento, tasto/bottone): [handler]}}
+        Con key=None un handler riceve ogni evento di quel tipo; con stato
+        None vale in tutti gli stati. Gli handler ricevono l'evento e
+        restituiscono False se l'evento non ha avuto effetto.
+        """
+        self._table = {}
+
+    def register(self, state, event_type, handler, key=None):
+        """Registra un handler per un tipo di evento (e tasto) in uno stato"""
+        self._table.setdefault(state, {}).setdefault((event_type, key), []).append(handler)
+
+    def handlers(self, state, event):
+        """Handler registrati per l'evento nello stato indicato, in ordine"""
+        found = []
+        for table in (self._table.get(None), self._table.get(state)):
+            if table:
+                found.extend(table.get((event.type, event_code(event)), ()))
+                found.extend(table.get((event.type, None), ()))
+        return found
+
+    def dispatch(self, state, event):
+        """Passa l'evento ai suoi handler; restituisce True se almeno uno lo ha gestito"""
+        handled = False
+        for handler in self.handlers(state, event):
+            handled |= handler(event) is not False
+        return handled
+
+class InputLatency:
+    def __init__(self, history=LATENCY_HISTORY):
+        """
+        Latenza tra l'arrivo di un input e la presentazione del suo effetto:
+        - arrived(): input letto dalla coda degli eventi
+        - applied(): gli input arrivati hanno modificato lo stato di gioco
+        - presented(): frame con il loro effetto mostrato a schermo
+        """
+        self._pending = []  # Istanti di arrivo non ancora applicati
+        self._applied = []  # Istanti di arrivo applicati, in attesa del frame
+        self.samples = deque(maxlen=history)  # Latenze misurate in secondi
+        self.count = 0
+
+    def arrived(self, timestamp=None):
+        self._pending.append(time.perf_counter() if timestamp is None else timestamp)
+
+    def applied(self):
+        if self._pending:
+            self._applied.extend(self._pending)
+            self._pending.clear()
+
+    def presented(self):
+        if not self._applied:
+            return
+        now = time.perf_counter()
+        self.samples.extend(now - arrival for arrival in self._applied)
+        self.count += len(self._applied)
+        self._applied.clear()
+
+    def summary(self, percentiles=(50, 95, 99)):
+        """Percentili della latenza in millisecondi (vuoto se non ci sono campioni)"""
+        if not self.samples:
+            return ()
+        return tuple(np.percentile(np.fromiter(self.samples, float), percentiles) * 1000)
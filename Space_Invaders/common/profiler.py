@@ -0,0 +1,102 @@
+import json
+import time
+from collections import deque
+import numpy as np
+
+# Frame considerati per i percentili (10 secondi a 60 FPS)
+PROFILE_HISTORY = 600
+# Eventi conservati per l'esportazione della traccia (i più vecchi vengono scartati)
+TRACE_EVENTS = 50000
+# Ordine delle fasi nel riepilogo (le fasi non elencate seguono in ordine di comparsa)
+PHASES = ("events", "update", "player", "enemy_movement", "enemy_fire", "projectiles",
+          "collisions", "game_conditions", "render_static", "render_playfield",
+          "render_hud", "render_screens", "render_overlay", "flip", "idle", "frame")
+
+class FrameProfiler:
+    """
+    Profiler per fase del ciclo di gioco. Ogni mark(fase) attribuisce alla
+    fase il tempo trascorso dal mark precedente; a fine frame i tempi
+    finiscono in finestre scorrevoli di PROFILE_HISTORY frame (percentili)
+    e nella traccia esportabile in formato Chrome trace (chrome://tracing,
+    Perfetto). Disattivato non misura nulla.
+    """
+
+    def __init__(self, history=PROFILE_HISTORY, max_events=TRACE_EVENTS):
+        self.enabled = False
+        self.history = history
+        self.frame_count = 0
+        self._samples = {}  # Fase -> tempi degli ultimi frame (array circolare)
+        self._frame = {}    # Fase -> tempo accumulato nel frame corrente
+        self._frame_start = self._last = time.perf_counter()
+        self._origin = self._frame_start
+        self.events = deque(maxlen=max_events)  # (fase, inizio, durata) in secondi
+
+    def enable(self, enabled=True):
+        """Attiva o disattiva le misure (il frame corrente riparte da adesso)"""
+        self.enabled = enabled
+        self._frame_start = self._last = time.perf_counter()
+        self._frame.clear()
+
+    def begin_frame(self):
+        """Inizio di un frame del ciclo principale"""
+        if not self.enabled:
+            return
+        self._frame_start = self._last = time.perf_counter()
+        self._frame.clear()
+
+    def mark(self, phase):
+        """Chiude la fase indicata: le attribuisce il tempo dal mark precedente"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._frame[phase] = self._frame.get(phase, 0.0) + elapsed
+        self.events.append((phase, self._last, elapsed))
+        self._last = now
+
+    def end_frame(self):
+        """Fine del frame: registra i tempi per fase e la durata totale"""
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self._frame_start
+        self.events.append(("frame", self._frame_start, total))
+        self._frame["frame"] = total
+
+        slot = self.frame_count % self.history
+        for phase, values in self._samples.items():
+            values[slot] = self._frame.pop(phase, 0.0)
+        for phase, elapsed in self._frame.items():
+            # Fase nuova: i frame precedenti valgono zero
+            values = np.zeros(self.history)
+            values[slot] = elapsed
+            self._samples[phase] = values
+        self._frame.clear()
+        self.frame_count += 1
+
+    def summary(self, percentiles=(50, 95, 99)):
+        """Percentili (in millisecondi) di ogni fase sugli ultimi frame: {fase: (p50, p95, p99)}"""
+        filled = min(self.frame_count, self.history)
+        if not filled:
+            return {}
+        order = {phase: i for i, phase in enumerate(PHASES)}
+        phases = sorted(self._samples, key=lambda phase: order.get(phase, len(order)))
+        return {phase: tuple(np.percentile(self._samples[phase][:filled], percentiles) * 1000)
+                for phase in phases}
+
+    def reset(self):
+        """Scarta le statistiche e la traccia raccolte"""
+        self.frame_count = 0
+        self._samples.clear()
+        self._frame.clear()
+        self.events.clear()
+
+    def export_trace(self, path):
+        """Salva gli eventi raccolti in formato Chrome trace JSON"""
+        trace = [{"name": phase, "ph": "X", "pid": 1, "tid": 1, "cat": "frame" if phase == "frame" else "phase",
+                  "ts": round((start - self._origin) * 1e6, 3), "dur": round(duration * 1e6, 3)}
+                 for phase, start, duration in self.events]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+# Profiler condiviso dal ciclo di gioco e dalla simulazione
+PROFILER = FrameProfiler()
@@ -0,0 +1,64 @@
+import json
+import time
+
+from common.frame_budget import FrameBudget, FRAME_BUDGET_MS, BUDGET_WINDOW
+
+# Costi opzionali nell'ordine in cui si rinuncia a loro quando il frame è lento:
+# - background: sfondo ridisegnato solo sotto gli sprite (rettangoli sporchi)
+# - effects: meno voci contemporanee per gli effetti sonori
+# - hud: sidebar aggiornata a frequenza ridotta
+# - smoothing: niente interpolazione delle posizioni tra un tick e l'altro
+QUALITY_STEPS = ("background", "effects", "hud", "smoothing")
+# Si recupera qualità solo sotto questa frazione del budget
+QUALITY_HEADROOM = 0.75
+
+class QualityGovernor(FrameBudget):
+    def __init__(self, steps=QUALITY_STEPS, budget_ms=FRAME_BUDGET_MS, window=BUDGET_WINDOW, log_path=None):
+        """
+        Riduce la qualità un passo alla volta quando il frame supera il budget
+        e la ripristina quando torna margine:
+        - steps: costi opzionali, dal primo a cui rinunciare all'ultimo
+        - budget_ms, window: vedi FrameBudget
+        - log_path: file (JSON lines) a cui aggiungere ogni cambio, se indicato
+        level è il numero di passi attivi: degraded(step) dice se un costo è sospeso.
+        """
+        super().__init__(len(steps) + 1, budget_ms, window, QUALITY_HEADROOM)
+        self.steps = steps
+        self.log_path = log_path
+        self.changes = []  # Cambi di questa sessione (gli stessi record del log)
+        self._started = time.perf_counter()
+
+    def degraded(self, step):
+        """True se il costo opzionale step è sospeso al livello corrente"""
+        return self.steps.index(step) < self.level
+
+    def record(self, frame_ms):
+        """Registra il tempo di un frame; un cambio di livello finisce nel log"""
+        previous = self.level
+        if not super().record(frame_ms):
+            return False
+        lowered = self.level > previous
+        entry = {
+            "time": round(time.time(), 3),
+            "session_s": round(time.perf_counter() - self._started, 1),
+            "level": self.level,
+            "step": self.steps[max(self.level, previous) - 1],
+            "direction": "down" if lowered else "up",
+            "frame_ms": round(self.average_ms, 2),
+        }
+        self.changes.append(entry)
+        print(f"Qualità: {'disattivato' if lowered else 'riattivato'} {entry['step']} "
+              f"(frame medio {entry['frame_ms']:.1f} ms, livello {self.level})")
+        if self.log_path:
+            try:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+            except OSError as e:
+                print(f"Errore nella scrittura del log della qualità: {e}")
+        return True
+
+    def summary(self):
+        """(cambi verso il basso, cambi verso l'alto, livello più basso raggiunto)"""
+        down = sum(entry["direction"] == "down" for entry in self.changes)
+        lowest = max((entry["level"] for entry in self.changes), default=0)
+        return down, len(self.changes) - down, lowest
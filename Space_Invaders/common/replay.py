@@ -0,0 +1,142 @@
+import json
+import numpy as np
+
+from common.game_state import GameState, Action
+from common.game_config import GameConfig
+from common.waves import WaveSet
+
+REPLAY_VERSION = 1
+# Tick tra due keyframe (10 secondi a 60 tick/s)
+KEYFRAME_INTERVAL = 600
+
+def _pack_state(state):
+    """Unisce gli array di uno stato in un unico buffer (indice JSON + dati grezzi)"""
+    index = [[key, values.dtype.str, len(values)] for key, values in state.items()]
+    header = json.dumps(index).encode("utf-8")
+    parts = [np.array([len(header)], dtype="<u4").tobytes(), header]
+    parts.extend(np.ascontiguousarray(values).tobytes() for values in state.values())
+    return np.frombuffer(b"".join(parts), dtype=np.uint8)
+
+def _unpack_state(buffer):
+    """Operazione inversa di _pack_state"""
+    data = buffer.tobytes()
+    header_size = int(np.frombuffer(data[:4], dtype="<u4")[0])
+    offset = 4 + header_size
+    state = {}
+    for key, dtype, length in json.loads(data[4:offset].decode("utf-8")):
+        values = np.frombuffer(data, dtype=dtype, count=length, offset=offset)
+        state[key] = values.copy()
+        offset += values.nbytes
+    return state
+
+class ReplayRecorder:
+    def __init__(self, sim, keyframe_interval=KEYFRAME_INTERVAL):
+        """
+        Registra una partita come sequenza di input per tick:
+        - sim: simulazione da registrare (gli step passano da step())
+        - keyframe_interval: ogni quanti tick salvare uno stato completo
+        """
+        self.sim = sim
+        self.keyframe_interval = keyframe_interval
+        self.start()
+
+    def start(self):
+        """Inizia una nuova registrazione dallo stato corrente della simulazione"""
+        self.start_tick = self.sim.frame
+        self.seed = self.sim.seed
+        self.inputs = bytearray()  # Un byte (flag Action) per tick
+        self.keyframes = {self.start_tick: self.sim.get_state()}
+
+    def step(self, actions=Action.NONE):
+        """Registra l'input del tick ed esegue lo step della simulazione"""
+        sim = self.sim
+        if sim.state == GameState.PLAYING:
+            tick = sim.frame
+            if tick % self.keyframe_interval == 0 and tick not in self.keyframes:
+                self.keyframes[tick] = sim.get_state()
+            self.inputs.append(int(actions))
+        return sim.step(actions)
+
+    def save(self, path):
+        """Salva la replay (archivio npz compresso): input, keyframe e riepilogo finale"""
+        sim = self.sim
+        meta = {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "start_tick": self.start_tick,
+            "keyframe_interval": self.keyframe_interval,
+            "grid": [sim.grid_width, sim.grid_height, sim.cell_size, sim.sidebar_width],
+            "config": sim.config.as_dict(),
+            "waves": sim.waves.as_dict(),
+            "final": {"tick": sim.frame, "score": sim.score, "lives": sim.lives, "state": sim.state.name},
+        }
+        arrays = {
+            "meta": np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+            "inputs": np.frombuffer(bytes(self.inputs), dtype=np.uint8),
+        }
+        for tick, state in self.keyframes.items():
+            arrays[f"keyframe/{tick}"] = _pack_state(state)
+        with open(path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+
+class Replay:
+    def __init__(self, meta, inputs, keyframes):
+        """
+        Replay caricata da file:
+        - meta: intestazione (seme, tick iniziale, riepilogo finale)
+        - inputs: array di flag Action, uno per tick a partire da start_tick
+        - keyframes: dizionario tick -> stato della simulazione
+        """
+        self.meta = meta
+        self.inputs = inputs
+        self.keyframes = keyframes
+        self.start_tick = meta["start_tick"]
+        # Le replay senza configurazione sono state registrate con i valori predefiniti
+        self.config = GameConfig(**meta.get("config", {}))
+        # ...e quelle senza ondate con la sola formazione classica
+        self.waves = WaveSet.from_dict(meta["waves"]) if "waves" in meta else WaveSet()
+        self.end_tick = self.start_tick + len(inputs)
+        self._keyframe_ticks = sorted(keyframes)
+
+    @classmethod
+    def load(cls, path):
+        """Carica una replay salvata da ReplayRecorder.save()"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            if meta["version"] != REPLAY_VERSION:
+                raise ValueError(f"Versione della replay non supportata: {meta['version']}")
+            inputs = data["inputs"].copy()
+            keyframes = {}
+            for name in data.files:
+                if name.startswith("keyframe/"):
+                    keyframes[int(name.split("/", 1)[1])] = _unpack_state(data[name])
+        return cls(meta, inputs, keyframes)
+
+    def action_at(self, tick):
+        """Input registrato per il tick indicato"""
+        return Action(int(self.inputs[tick - self.start_tick]))
+
+    def seek(self, sim, tick):
+        """
+        Porta la simulazione al tick indicato ripartendo dal keyframe
+        precedente più vicino, senza rigiocare dall'inizio
+        """
+        tick = max(self.start_tick, min(tick, self.end_tick))
+        sim.waves = self.waves
+        sim.configure(self.config)
+        index = np.searchsorted(self._keyframe_ticks, tick, side="right") - 1
+        sim.set_state(self.keyframes[self._keyframe_ticks[index]])
+        self.advance(sim, tick - sim.frame)
+
+    def advance(self, sim, ticks):
+        """Esegue fino a ticks step con gli input registrati; restituisce gli eventi"""
+        events = []
+        end = min(sim.frame + ticks, self.end_tick)
+        while sim.frame < end and sim.state == GameState.PLAYING:
+            events.extend(sim.step(self.action_at(sim.frame)))
+        return events
+
+    def finished(self, sim):
+        """True se la simulazione ha consumato tutti gli input registrati"""
+        return sim.frame >= self.end_tick or sim.state != GameState.PLAYING
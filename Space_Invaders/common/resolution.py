@@ -0,0 +1,21 @@
+from common.frame_budget import FrameBudget, FRAME_BUDGET_MS, BUDGET_WINDOW
+
+# Risoluzioni interne dell'area di gioco (frazione della risoluzione nativa)
+RESOLUTION_TIERS = (1.0, 0.75, 0.5)
+# Si torna alla risoluzione superiore solo sotto metà del budget
+UPSCALE_HEADROOM = 0.5
+
+class ResolutionScaler(FrameBudget):
+    def __init__(self, tiers=RESOLUTION_TIERS, budget_ms=FRAME_BUDGET_MS, window=BUDGET_WINDOW):
+        """
+        Sceglie la risoluzione interna dell'area di gioco in base al tempo
+        di frame misurato:
+        - tiers: scale disponibili, dalla più alta alla più bassa
+        - budget_ms, window: vedi FrameBudget
+        """
+        super().__init__(len(tiers), budget_ms, window, UPSCALE_HEADROOM)
+        self.tiers = tiers
+
+    @property
+    def scale(self):
+        return self.tiers[self.level]
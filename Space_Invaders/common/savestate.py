@@ -0,0 +1,104 @@
+import os
+import struct
+import numpy as np
+
+from common.game_state import GameState
+from common.game_config import GameConfig
+from common.entity_store import EntityStore
+from common.simulation import ENTITY_STORES
+from common.waves import WaveSet
+
+SAVE_MAGIC = b"SISV"
+SAVE_VERSION = 1
+
+# Layout fisso all'inizio del file (little endian):
+# - magic, versione
+# - contatori della simulazione: punteggio, vite, cooldown dello sparo nemico,
+#   tick, stato della simulazione, seme, ondata
+# - giocatore: x, y, sinistra, destra, cooldown, x e y al tick precedente
+# - GameConfig (un intero per campo, nell'ordine di GameConfig.FIELDS)
+# - stato del Game, modalità infinita, CRC32 dei dati delle ondate
+# - per ogni archivio di entità: numero di entità e prossimo id
+# Seguono lo stato del generatore casuale (625 uint32) e, per ogni archivio,
+# i campi di EntityStore.FIELDS uno dopo l'altro (count int32 ciascuno).
+SAVE_HEADER = struct.Struct("<4sH7q7q6iBBI" + "Iq" * len(ENTITY_STORES))
+RNG_WORDS = 625
+FIELD_TYPE = np.dtype("<i4")
+
+def save_state(sim, game_state=None):
+    """
+    Stato completo della simulazione in un buffer binario a layout fisso
+    (niente pickle). game_state è lo stato del Game da ripristinare
+    (quello della simulazione se None).
+    """
+    game_state = game_state if game_state is not None else sim.state
+    # I campi si leggono direttamente dagli archivi, senza le copie di get_state()
+    stores, counts = [getattr(sim, name) for name in ENTITY_STORES], []
+    for store in stores:
+        store.compact()
+        counts += [len(store), store._next_id]
+    header = SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION, *sim.counter_values(), *sim.player_values(),
+                              *(int(getattr(sim.config, field)) for field in GameConfig.FIELDS),
+                              game_state.value, sim.waves.endless, sim.waves.checksum, *counts)
+    parts = [header, sim.rng_words().tobytes()]
+    for store in stores:
+        parts.extend(getattr(store, field).astype(FIELD_TYPE, copy=False).tobytes() for field in EntityStore.FIELDS)
+    return b"".join(parts)
+
+def load_state(data, sim):
+    """
+    Ripristina nella simulazione esistente un buffer di save_state(), senza
+    ricreare oggetti né ricaricare asset. Restituisce lo stato del Game salvato.
+    """
+    if len(data) < SAVE_HEADER.size or data[:4] != SAVE_MAGIC:
+        raise ValueError("Salvataggio non valido")
+    values = SAVE_HEADER.unpack_from(data)
+    if values[1] != SAVE_VERSION:
+        raise ValueError(f"Versione del salvataggio non supportata: {values[1]}")
+    counters, player, config = values[2:9], values[9:16], values[16:22]
+    game_state, endless, checksum = values[22:25]
+    store_values = values[25:]
+    # La dimensione attesa si ricava dall'intestazione prima di leggere gli array
+    expected = SAVE_HEADER.size + RNG_WORDS * 4 + sum(store_values[0::2]) * len(EntityStore.FIELDS) * FIELD_TYPE.itemsize
+    if expected != len(data):
+        raise ValueError("Salvataggio troncato o con dati in eccesso")
+
+    state = {
+        "counters": np.array(counters, dtype=np.int64),
+        "player": np.array(player, dtype=np.int64),
+        "rng": np.frombuffer(data, dtype="<u4", count=RNG_WORDS, offset=SAVE_HEADER.size),
+    }
+    offset = SAVE_HEADER.size + RNG_WORDS * 4
+    for i, name in enumerate(ENTITY_STORES):
+        count, next_id = store_values[2 * i], store_values[2 * i + 1]
+        for field in EntityStore.FIELDS:
+            state[f"{name}.{field}"] = np.frombuffer(data, dtype=FIELD_TYPE, count=count, offset=offset)
+            offset += count * FIELD_TYPE.itemsize
+        state[f"{name}.next_id"] = np.array([next_id], dtype=np.int64)
+
+    waves = sim.waves if bool(endless) == sim.waves.endless else WaveSet(sim.waves.data, bool(endless))
+    if checksum != waves.checksum:
+        print("Attenzione: le ondate sono cambiate dopo il salvataggio")
+    # Con una campagna accorciata l'ondata salvata può non esistere più:
+    # si rifiuta il salvataggio prima di toccare la simulazione
+    if waves.wave(counters[6]) is None:
+        raise ValueError(f"L'ondata {counters[6] + 1} del salvataggio non esiste più")
+    sim.waves = waves
+    sim.configure(GameConfig(**dict(zip(GameConfig.FIELDS, config))))
+    sim.set_state(state)
+    return GameState(game_state)
+
+def write_save(path, sim, game_state=None):
+    """Salva su file (scrittura su file temporaneo e sostituzione)"""
+    data = save_state(sim, game_state)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return len(data)
+
+def read_save(path, sim):
+    """Carica un file di write_save() nella simulazione; restituisce lo stato del Game"""
+    with open(path, "rb") as f:
+        return load_state(f.read(), sim)
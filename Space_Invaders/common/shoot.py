@@ -1,36 +1,36 @@
-import pygame
-
-PLAYER_BULLET_SPEED = 10
-ENEMY_BULLET_SPEED = 8
-
-ENEMY_SHOT_FREQUENCY = 30
-
-class Shoot:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 4, 10)
-        self.speed = PLAYER_BULLET_SPEED
-        self.active = True
-        self.color = (0, 255, 0)
-
-    def update(self):
-        self.rect.y -= self.speed
-        if self.rect.bottom < 0:
-            self.active = False
-
-    def draw(self, surface):
-        pygame.draw.rect(surface, self.color, self.rect)
-
-class EnemyShot:
-    def __init__(self, x, y):
-        self.rect = pygame.Rect(x, y, 4, 10)
-        self.speed = ENEMY_BULLET_SPEED
-        self.active = True
-        self.color = (255, 255, 0)
-
-    def update(self):
-        self.rect.y += self.speed
-        if self.rect.top > pygame.display.get_surface().get_height():
-            self.active = False
-
-    def draw(self, surface):
-        pygame.draw.rect(surface, self.color, self.rect)
\ No newline at end of file
+import pygame
+
+PLAYER_BULLET_SPEED = 10
+ENEMY_BULLET_SPEED = 8
+
+ENEMY_SHOT_FREQUENCY = 60  # Tick tra due colpi nemici
+
+SHOT_WIDTH = 4
+SHOT_HEIGHT = 10
+PLAYER_BULLET_COLOR = (0, 255, 0)
+ENEMY_BULLET_COLOR = (255, 255, 0)
+
+# Capacità fissa dei pool di proiettili (oltre questo numero i colpi vengono scartati)
+PROJECTILE_POOL_SIZE = 256
+
+class Shoot:
+    """
+    Aspetto del proiettile del giocatore, usato come modello per l'atlante
+    degli sprite: posizioni e movimento sono nell'EntityStore della simulazione
+    """
+    __slots__ = ("rect", "color")
+
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, SHOT_WIDTH, SHOT_HEIGHT)
+        self.color = PLAYER_BULLET_COLOR
+
+    def draw(self, surface):
+        pygame.draw.rect(surface, self.color, self.rect)
+
+class EnemyShot(Shoot):
+    """Aspetto del colpo nemico (modello per l'atlante, come Shoot)"""
+    __slots__ = ()
+
+    def __init__(self, x, y):
+        super().__init__(x, y)
+        self.color = ENEMY_BULLET_COLOR
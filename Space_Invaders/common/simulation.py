@@ -0,0 +1,342 @@
+import random
+from array import array
+import numpy as np
+
+from common.game_state import GameState, Action
+from common.player import Player
+from common.shoot import SHOT_WIDTH, SHOT_HEIGHT, PROJECTILE_POOL_SIZE
+from common.enemy import ENEMY_DROP
+from common.game_config import GameConfig
+from common.entity_store import EntityStore
+from common.spatial_grid import SpatialGrid
+from common.formation import Formation
+from common.waves import WaveSet
+from common.allocations import ALLOCATIONS
+from common.profiler import PROFILER
+
+# Tick di simulazione al secondo: velocità e intervalli sono espressi per tick
+TICK_RATE = 60
+
+# Archivi di entità che compongono lo stato della simulazione
+ENTITY_STORES = ("enemies", "bullets", "enemy_shots")
+
+# Eventi prodotti dalla simulazione (il livello di presentazione li traduce in suoni)
+EVENT_SHOOT = "shoot"
+EVENT_EXPLOSION = "explosion"
+EVENT_WAVE = "wave"  # Inizio di una nuova ondata
+
+class Simulation:
+    def __init__(self, grid_width=15, grid_height=20, cell_size=40, sidebar_width=200, seed=None, config=None,
+                 waves=None):
+        """
+        Motore di gioco puro, senza dipendenze da display o mixer:
+        - grid_width, grid_height: dimensioni della griglia di gioco (in celle)
+        - cell_size: dimensione di una cella in pixel
+        - sidebar_width: larghezza della sidebar (il giocatore si muove su tutto lo schermo)
+        - seed: seme del generatore casuale della partita (casuale se None)
+        - config: costanti di bilanciamento (GameConfig, quelle predefinite se None)
+        - waves: sequenza di ondate (WaveSet; None = la sola formazione classica)
+        La simulazione avanza un frame alla volta con step(actions): a parità di
+        seme e di input, ogni partita si ripete identica.
+        """
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.cell_size = cell_size
+        self.sidebar_width = sidebar_width
+        self.game_width = grid_width * cell_size
+        self.screen_width = self.game_width + sidebar_width
+        self.screen_height = grid_height * cell_size
+
+        self.player = Player(
+            x = self.screen_width // 2 - 25,
+            y = self.screen_height - 60,
+            width = 50,
+            height = 50,
+            screen_width = self.screen_width
+        )
+        self.player.cell_size = cell_size
+        self.player.sidebar_width = sidebar_width
+        self.player.screen_height = self.screen_height
+
+        # Entità in archivi struttura-di-array (kind = tipo di sprite per i nemici)
+        # I proiettili usano pool a capacità fissa: nessuna allocazione durante il gioco
+        self.enemies = EntityStore()
+        self.bullets = EntityStore(PROJECTILE_POOL_SIZE, fixed=True)
+        self.enemy_shots = EntityStore(PROJECTILE_POOL_SIZE, fixed=True)
+        # Broadphase delle collisioni sulla griglia di gioco
+        self.enemy_grid = SpatialGrid(grid_width, grid_height, cell_size)
+        # Bordi della formazione e prima fila di ogni colonna (aggiornati in modo incrementale)
+        self.formation = Formation()
+        self.events = []
+        self.frame_allocations = 0  # Allocazioni di oggetti di gioco nell'ultimo step
+        # Generatore casuale della partita (non si usa il modulo random globale)
+        self.rng = random.Random()
+        self.waves = waves or WaveSet()
+        self.wave_layout = None
+        self.configure(config or GameConfig())
+        self.reset(seed)
+
+    def configure(self, config):
+        """
+        Applica le costanti di bilanciamento (GameConfig); la velocità dei
+        nemici vale dalla prossima ondata. Velocità e frequenza di fuoco
+        indicate da un'ondata hanno la precedenza.
+        """
+        self.config = config
+        self.enemy_shot_frequency = config.enemy_shot_frequency  # Tick tra i colpi
+        if self.wave_layout and self.wave_layout.fire_rate is not None:
+            self.enemy_shot_frequency = self.wave_layout.fire_rate
+        self.player.speed = config.player_speed
+        self.player.bullet_speed = config.player_bullet_speed
+        self.player.shot_cooldown_ticks = config.player_shot_cooldown
+
+    def reset(self, seed=None):
+        """
+        Riporta la simulazione allo stato iniziale di una partita
+        - seed: seme del generatore casuale (se None ne viene scelto uno nuovo)
+        """
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng.seed(self.seed)
+        self.enemies.clear()
+        self.bullets.clear()
+        self.enemy_shots.clear()
+        self.events.clear()
+        self.enemy_grid.clear()
+        self._start_wave(0)
+
+        self.player.reset()
+        self.player.rect.x = self.screen_width // 2 - 25
+        self.player.rect.y = self.screen_height - 60
+
+        self.score = 0
+        self.lives = 3
+        self.enemy_shot_cooldown = 0
+        self.frame = 0
+        self.player_previous = self.player.rect.topleft
+        self.state = GameState.PLAYING
+
+    def _start_wave(self, index):
+        """Crea la formazione dell'ondata indicata (ordinata per colonne, da sinistra a destra)"""
+        self.wave = index
+        self.wave_layout = self.waves.wave(index)
+        self.configure(self.config)
+        self.wave_layout.spawn(self.enemies, self.rng, self._wave_speed(len(self.wave_layout)))
+        self.enemy_grid.update(self.enemies)
+        self.formation.build(self.enemies)
+
+    def _wave_speed(self, remaining):
+        """Velocità della formazione dell'ondata corrente con remaining nemici vivi"""
+        layout = self.wave_layout
+        base = layout.speed if layout.speed is not None else self.config.enemy_speed
+        return layout.speed_for(remaining, base)
+
+    def _next_wave(self):
+        """
+        Passa all'ondata successiva senza azzerare la partita: giocatore,
+        punteggio e vite restano, i proiettili in volo vengono rimossi
+        """
+        self.bullets.clear()
+        self.enemy_shots.clear()
+        self._start_wave(self.wave + 1)
+        self.enemies.save_positions()
+        self.enemy_shot_cooldown = self.enemy_shot_frequency
+        self.events.append(EVENT_WAVE)
+
+    def step(self, actions=Action.NONE):
+        """
+        Avanza la simulazione di un frame.
+        - actions: combinazione di Action (LEFT/RIGHT tenuti premuti, SHOOT per sparare)
+        Restituisce la lista degli eventi generati nel frame.
+        """
+        self.events.clear()
+        if self.state != GameState.PLAYING:
+            return self.events
+        ALLOCATIONS.start_frame()
+        PROFILER.mark("update")
+
+        # Posizioni del tick precedente per l'interpolazione del rendering
+        self.player_previous = self.player.rect.topleft
+        self.enemies.save_positions()
+        self.bullets.save_positions()
+        self.enemy_shots.save_positions()
+
+        self.player.set_moving("left", bool(actions & Action.LEFT))
+        self.player.set_moving("right", bool(actions & Action.RIGHT))
+        if actions & Action.SHOOT and self.player.shoot(self.bullets):
+            self.events.append(EVENT_SHOOT)
+
+        self.player.update()
+        PROFILER.mark("player")
+
+        # Movimento nemici (in blocco sugli array, bordi letti dalla formazione)
+        enemies, formation = self.enemies, self.formation
+        if len(enemies):
+            if enemies.vx[0] > 0:
+                edge_hit = formation.right >= self.game_width
+            else:
+                edge_hit = formation.left <= 0
+
+            if edge_hit:
+                enemies.y[:] += ENEMY_DROP
+                enemies.vx[:] *= -1
+                formation.shift(0, ENEMY_DROP)
+            enemies.x[:] += enemies.vx
+            formation.shift(int(enemies.vx[0]), 0)
+            self.enemy_grid.update(enemies)
+        PROFILER.mark("enemy_movement")
+
+        # Sparo nemico: spara il nemico in prima fila di una colonna casuale
+        if len(enemies) and self.enemy_shot_cooldown <= 0:
+            shooter = int(enemies.slot_of[formation.random_shooter(self.rng)])
+            self.enemy_shots.spawn(
+                int(enemies.x[shooter] + enemies.w[shooter] // 2) - 2,
+                int(enemies.y[shooter] + enemies.h[shooter]),
+                SHOT_WIDTH, SHOT_HEIGHT, vy=self.config.enemy_bullet_speed
+            )
+            self.enemy_shot_cooldown = self.enemy_shot_frequency
+        else:
+            self.enemy_shot_cooldown -= 1
+        PROFILER.mark("enemy_fire")
+
+        # Aggiorna proiettili e rimuove quelli usciti dallo schermo
+        self.bullets.move()
+        self.bullets.kill_mask(self.bullets.y + self.bullets.h < 0)
+        self.bullets.compact()
+
+        self.enemy_shots.move()
+        self.enemy_shots.kill_mask(self.enemy_shots.y > self.screen_height)
+        self.enemy_shots.compact()
+        PROFILER.mark("projectiles")
+
+        # Controlla collisioni
+        self._check_collisions()
+        PROFILER.mark("collisions")
+        self._check_game_conditions()
+        PROFILER.mark("game_conditions")
+        self.frame += 1
+        self.frame_allocations = ALLOCATIONS.frame
+        return self.events
+
+    def _check_collisions(self):
+        # Collisione proiettili giocatore con nemici: ogni proiettile controlla
+        # solo i nemici nelle celle che tocca ed elimina il primo colpito;
+        # le rimozioni sono applicate alla fine
+        bullets, enemies = self.bullets, self.enemies
+        near = []
+        if len(bullets) and len(enemies):
+            # Solo i proiettili che toccano celle occupate passano alla narrowphase
+            near = np.flatnonzero(self.enemy_grid.occupied(bullets.x, bullets.y, bullets.w, bullets.h))
+        if len(near):
+            ex, ey = enemies.x.tolist(), enemies.y.tolist()
+            ew, eh = enemies.w.tolist(), enemies.h.tolist()
+            slot_of = enemies.slot_of
+            hit_enemies = set()
+            dead_bullets, dead_enemies = [], []
+            for b, bx, by, bw, bh in zip(near.tolist(), bullets.x[near].tolist(), bullets.y[near].tolist(),
+                                         bullets.w[near].tolist(), bullets.h[near].tolist()):
+                target = None
+                for entity_id in self.enemy_grid.query(bx, by, bw, bh):
+                    e = int(slot_of[entity_id])
+                    if (e not in hit_enemies and (target is None or e < target) and
+                            bx < ex[e] + ew[e] and ex[e] < bx + bw and
+                            by < ey[e] + eh[e] and ey[e] < by + bh):
+                        target = e
+                if target is not None:
+                    hit_enemies.add(target)
+                    dead_bullets.append(b)
+                    dead_enemies.append(target)
+            if dead_enemies:
+                kills = len(dead_enemies)
+                self.enemy_grid.remove(enemies.id[dead_enemies])
+                self.formation.remove(enemies.id[dead_enemies])
+                bullets.kill(dead_bullets)
+                enemies.kill(dead_enemies)
+                bullets.compact()
+                enemies.compact()
+                self.events.extend([EVENT_EXPLOSION] * kills)  # Suono nemico colpito
+                self.score += 100 * kills  # 100 punti per ogni nemico ucciso
+                if len(enemies):
+                    # La formazione accelera man mano che si assottiglia (curva dell'ondata)
+                    speed = self._wave_speed(len(enemies))
+                    if abs(int(enemies.vx[0])) != speed:
+                        enemies.vx[:] = np.sign(enemies.vx) * speed
+
+        # Collisione colpi nemici con giocatore (al massimo uno per frame)
+        hit = self.enemy_shots.overlaps(self.player.rect)
+        if hit.any():
+            self.enemy_shots.kill(int(np.argmax(hit)))
+            self.enemy_shots.compact()
+            self.lives -= 1
+            if self.lives <= 0:
+                self.state = GameState.GAMEOVER
+
+    def get_state(self):
+        """
+        Copia completa dello stato della simulazione come dizionario di array
+        (keyframe delle replay, rollback); set_state() la ripristina
+        """
+        state = {}
+        for name in ENTITY_STORES:
+            for field, values in getattr(self, name).get_state().items():
+                state[f"{name}.{field}"] = values
+        state["player"] = np.array(self.player_values(), dtype=np.int64)
+        state["counters"] = np.array(self.counter_values(), dtype=np.int64)
+        state["rng"] = np.frombuffer(self.rng_words(), dtype=np.uint32)
+        return state
+
+    def player_values(self):
+        """Stato del giocatore: x, y, sinistra, destra, cooldown, x e y al tick precedente"""
+        player = self.player
+        return [player.rect.x, player.rect.y, player.moving["left"], player.moving["right"],
+                player.shoot_cooldown, *self.player_previous]
+
+    def counter_values(self):
+        """Contatori della partita: punteggio, vite, cooldown nemico, tick, stato, seme, ondata"""
+        return [self.score, self.lives, self.enemy_shot_cooldown,
+                self.frame, self.state.value, self.seed, self.wave]
+
+    def rng_words(self):
+        """Stato del generatore casuale (625 parole da 32 bit)"""
+        return array("I", self.rng.getstate()[1])
+
+    def set_state(self, state):
+        """Ripristina uno stato prodotto da get_state()"""
+        for name in ENTITY_STORES:
+            getattr(self, name).set_state({field: state[f"{name}.{field}"]
+                                           for field in (*EntityStore.FIELDS, "next_id")})
+        self.enemy_grid.sync(self.enemies)
+        self.formation.build(self.enemies)
+
+        x, y, left, right, cooldown, prev_x, prev_y = state["player"].tolist()
+        self.player.rect.topleft = (x, y)
+        self.player.moving = {"left": bool(left), "right": bool(right)}
+        self.player.shoot_cooldown = cooldown
+        self.player_previous = (prev_x, prev_y)
+
+        counters = state["counters"].tolist()
+        score, lives, shot_cooldown, frame, game_state, seed = counters[:6]
+        # Gli stati salvati prima delle ondate non hanno il contatore (prima ondata)
+        self.wave = counters[6] if len(counters) > 6 else 0
+        self.wave_layout = self.waves.wave(self.wave)
+        self.configure(self.config)
+        self.score, self.lives = score, lives
+        self.enemy_shot_cooldown = shot_cooldown
+        self.frame = frame
+        self.state = GameState(game_state)
+        self.seed = seed
+        self.rng.setstate((3, tuple(state["rng"].tolist()), None))
+        self.events.clear()
+
+    def _check_game_conditions(self):
+        # Formazione eliminata: ondata successiva o vittoria a fine campagna
+        if not self.enemies and self.state == GameState.PLAYING:
+            if self.waves.wave(self.wave + 1) is None:
+                self.state = GameState.VICTORY
+            else:
+                self._next_wave()
+            return
+
+        # Game Over: nemici raggiungono il giocatore o vite esaurite
+        player_line = self.player.rect.y
+        if self.state == GameState.PLAYING and self.formation.bottom >= player_line:
+            self.state = GameState.GAMEOVER
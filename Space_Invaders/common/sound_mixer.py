@@ -0,0 +1,80 @@
+import pygame
+
+# Configurazione del mixer: un buffer piccolo riduce il ritardo degli effetti
+# (256 campioni = ~6 ms a 44.1 kHz; il default di pygame è 512)
+MIXER_FREQUENCY = 44100
+MIXER_BUFFER = 256
+# Canali riservati per categoria di suono: una raffica di esplosioni non
+# può occupare i canali dei colpi
+CHANNEL_GROUPS = {"shoot": 2, "explosion": 3, "sfx": 1}
+# Voci contemporanee al massimo (oltre, si interrompe la più vecchia)
+MAX_VOICES = 4
+
+def pre_init_mixer(frequency=MIXER_FREQUENCY, buffer=MIXER_BUFFER):
+    """Imposta la configurazione del mixer: va chiamata prima di pygame.init()"""
+    pygame.mixer.pre_init(frequency, -16, 2, buffer)
+
+class SoundMixer:
+    def __init__(self, groups=CHANNEL_GROUPS, max_voices=MAX_VOICES):
+        """
+        Gestione delle voci degli effetti sonori:
+        - groups: canali riservati per ogni categoria
+        - max_voices: voci contemporanee al massimo su tutte le categorie
+        Se i canali della categoria sono occupati o si supera il limite di
+        voci, si interrompe la voce partita per prima. Lo stesso suono
+        richiesto più volte nello stesso frame viene suonato una volta sola.
+        """
+        total = sum(groups.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        # I canali riservati non vengono usati da Sound.play()
+        pygame.mixer.set_reserved(total)
+        self.groups = {}
+        first = 0
+        for category, count in groups.items():
+            self.groups[category] = [pygame.mixer.Channel(i) for i in range(first, first + count)]
+            first += count
+        self.max_voices = max_voices
+        self._order = 0
+        self._started = {}  # Canale -> ordine di avvio della voce
+        self._frame_sounds = set()
+        self.stolen = 0
+        self.deduplicated = 0
+
+    def begin_frame(self):
+        """Inizio di un nuovo frame: i suoni possono essere richiesti di nuovo"""
+        self._frame_sounds.clear()
+
+    def play(self, sound, category, key=None):
+        """
+        Suona un effetto sui canali della categoria; key identifica il suono
+        per il de-duplicamento nel frame. Restituisce il canale usato (o None).
+        """
+        key = key if key is not None else sound
+        if key in self._frame_sounds:
+            self.deduplicated += 1
+            return None
+        self._frame_sounds.add(key)
+
+        channels = self.groups.get(category) or self.groups["sfx"]
+        busy = [channel for group in self.groups.values() for channel in group if channel.get_busy()]
+        channel = next((channel for channel in channels if not channel.get_busy()), None)
+        if channel is None:
+            # Categoria piena: si ruba la sua voce più vecchia
+            channel = self._oldest(channels)
+            channel.stop()
+            self.stolen += 1
+        elif len(busy) >= self.max_voices:
+            # Limite globale raggiunto: si libera la voce più vecchia in assoluto
+            self._oldest(busy).stop()
+            self.stolen += 1
+        return self._start(channel, sound)
+
+    def _oldest(self, channels):
+        return min(channels, key=lambda channel: self._started.get(channel, -1))
+
+    def _start(self, channel, sound):
+        channel.play(sound)
+        self._order += 1
+        self._started[channel] = self._order
+        return channel
@@ -0,0 +1,148 @@
+import numpy as np
+
+# Oltre questa frazione di entità che cambiano celle, i bucket si ricostruiscono
+# da zero con operazioni sugli array invece di spostare le entità una a una
+REBUILD_FRACTION = 0.25
+
+class SpatialGrid:
+    def __init__(self, grid_width, grid_height, cell_size):
+        """
+        Griglia uniforme di bucket per la broadphase delle collisioni:
+        - grid_width, grid_height: numero di celle (la stessa griglia del gioco)
+        - cell_size: dimensione di una cella in pixel
+        Ogni bucket contiene gli id stabili delle entità che toccano la cella.
+        Le entità fuori dalla griglia finiscono nelle celle di bordo.
+        """
+        self.cols = grid_width
+        self.rows = grid_height
+        self.cell_size = cell_size
+        self.buckets = [set() for _ in range(grid_width * grid_height)]
+        # Celle coperte da ogni entità (x0, y0, x1, y1) codificate in un
+        # unico intero, indicizzate per id (-1 = entità non registrata)
+        self._span = np.full(64, -1, dtype=np.int64)
+
+    def clear(self):
+        """Svuota tutti i bucket"""
+        for bucket in self.buckets:
+            bucket.clear()
+        self._span[:] = -1
+
+    def _spans(self, x, y, w, h):
+        """Intervalli di celle coperti da un insieme di rettangoli, codificati"""
+        cs, last_col, last_row = self.cell_size, self.cols - 1, self.rows - 1
+        x0 = np.minimum(np.maximum(x // cs, 0), last_col).astype(np.int64)
+        y0 = np.minimum(np.maximum(y // cs, 0), last_row).astype(np.int64)
+        x1 = np.minimum(np.maximum((x + w - 1) // cs, 0), last_col).astype(np.int64)
+        y1 = np.minimum(np.maximum((y + h - 1) // cs, 0), last_row).astype(np.int64)
+        return x0 | (y0 << 16) | (x1 << 32) | (y1 << 48)
+
+    def _cells(self, span):
+        """Indici dei bucket coperti da un intervallo codificato"""
+        x0, y0 = span & 0xFFFF, (span >> 16) & 0xFFFF
+        x1, y1 = (span >> 32) & 0xFFFF, span >> 48
+        cols = self.cols
+        return [cy * cols + cx for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1)]
+
+    def update(self, store):
+        """
+        Aggiorna i bucket in modo incrementale: solo le entità che hanno
+        cambiato celle dall'ultimo aggiornamento vengono spostate
+        """
+        if not len(store):
+            return
+        ids = store.id
+        top_id = int(ids.max())
+        if top_id >= len(self._span):
+            size = len(self._span)
+            while size <= top_id:
+                size *= 2
+            span = np.full(size, -1, dtype=np.int64)
+            span[:len(self._span)] = self._span
+            self._span = span
+
+        new = self._spans(store.x, store.y, store.w, store.h)
+        old = self._span[ids]
+        changed = np.flatnonzero(new != old)
+        if not len(changed):
+            return
+        if len(changed) > REBUILD_FRACTION * len(ids) and self._rebuild(ids, new):
+            return
+
+        buckets = self.buckets
+        for entity_id, old_span, new_span in zip(ids[changed].tolist(),
+                                                 old[changed].tolist(), new[changed].tolist()):
+            if old_span >= 0:
+                for cell in self._cells(old_span):
+                    buckets[cell].discard(entity_id)
+            for cell in self._cells(new_span):
+                buckets[cell].add(entity_id)
+        self._span[ids[changed]] = new[changed]
+
+    def sync(self, store):
+        """
+        Allinea i bucket a un archivio sostituito in blocco (ripristino di uno
+        stato): toglie le entità che non ci sono più e aggiorna le altre
+        """
+        registered = np.flatnonzero(self._span >= 0)
+        self.remove(registered[~np.isin(registered, store.id)])
+        self.update(store)
+
+    def _rebuild(self, ids, spans):
+        """
+        Ricostruisce tutti i bucket (formazioni grandi che si spostano in blocco).
+        Vale per entità che coprono al massimo 2x2 celle: restituisce False
+        altrimenti, e si procede con l'aggiornamento incrementale.
+        """
+        x0, y0 = spans & 0xFFFF, (spans >> 16) & 0xFFFF
+        x1, y1 = (spans >> 32) & 0xFFFF, spans >> 48
+        if (x1 - x0 > 1).any() or (y1 - y0 > 1).any():
+            return False
+        # Celle dei quattro angoli ordinate per cella (i doppioni li scartano i set)
+        cells = np.concatenate((y0 * self.cols + x0, y0 * self.cols + x1,
+                                y1 * self.cols + x0, y1 * self.cols + x1))
+        order = np.argsort(cells, kind="stable")
+        cells, members = cells[order], np.tile(ids, 4)[order]
+        starts = np.flatnonzero(np.diff(cells, prepend=-1)).tolist()
+        members = members.tolist()
+        buckets = [set() for _ in range(self.cols * self.rows)]
+        for cell, start, end in zip(cells[starts].tolist(), starts, starts[1:] + [len(members)]):
+            buckets[cell] = set(members[start:end])
+        self.buckets = buckets
+        self._span[:] = -1
+        self._span[ids] = spans
+        return True
+
+    def remove(self, ids):
+        """Rimuove dai bucket le entità indicate (da chiamare prima della compattazione)"""
+        buckets = self.buckets
+        for entity_id in np.atleast_1d(ids).tolist():
+            span = int(self._span[entity_id])
+            if span >= 0:
+                for cell in self._cells(span):
+                    buckets[cell].discard(entity_id)
+            self._span[entity_id] = -1
+
+    def query(self, x, y, w, h):
+        """Restituisce gli id delle entità nelle celle toccate dal rettangolo"""
+        cs, cols, rows = self.cell_size, self.cols, self.rows
+        x0 = min(max(x // cs, 0), cols - 1)
+        y0 = min(max(y // cs, 0), rows - 1)
+        x1 = min(max((x + w - 1) // cs, 0), cols - 1)
+        y1 = min(max((y + h - 1) // cs, 0), rows - 1)
+        if x0 == x1 and y0 == y1:
+            return self.buckets[y0 * cols + x0]
+        return set().union(*(self.buckets[cy * cols + cx]
+                             for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1)))
+
+    def occupied(self, x, y, w, h):
+        """
+        Maschera dei rettangoli (array) che toccano almeno una cella non vuota:
+        usa una tabella a somme cumulative dell'occupazione delle celle
+        """
+        counts = np.fromiter(map(len, self.buckets), dtype=np.int32, count=len(self.buckets))
+        table = np.zeros((self.rows + 1, self.cols + 1), dtype=np.int32)
+        table[1:, 1:] = counts.reshape(self.rows, self.cols).cumsum(0).cumsum(1)
+        span = self._spans(x, y, w, h)
+        x0, y0 = span & 0xFFFF, (span >> 16) & 0xFFFF
+        x1, y1 = ((span >> 32) & 0xFFFF) + 1, (span >> 48) + 1
+        return (table[y1, x1] - table[y0, x1] - table[y1, x0] + table[y0, x0]) > 0
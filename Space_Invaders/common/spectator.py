@@ -0,0 +1,309 @@
+import socket
+import struct
+import time
+import numpy as np
+
+# Porta UDP predefinita del server per gli spettatori
+SPECTATOR_PORT = 47820
+# Snapshot conservate come possibili basi dei delta (server e client)
+SNAPSHOT_HISTORY = 64
+# Secondi senza conferme dopo i quali uno spettatore viene scollegato
+CLIENT_TIMEOUT = 5.0
+# Secondi senza pacchetti dopo i quali il client ripete la richiesta di ingresso
+REJOIN_INTERVAL = 1.0
+# Dimensione massima di un datagramma UDP
+MAX_PACKET = 65507
+
+PROTOCOL_VERSION = 1
+# Archivi di entità trasmessi agli spettatori
+SNAPSHOT_STORES = ("enemies", "bullets", "enemy_shots")
+
+# Pacchetti del server: intestazione, poi per ogni archivio un'intestazione
+# (rimossi, aggiunti, spostati a parte, spostamento comune) e i suoi array
+SNAPSHOT_HEADER = struct.Struct("<2sBIIiiiBBhhBHH")
+STORE_HEADER = struct.Struct("<HHHhh")
+# Pacchetti del client: tipo di messaggio e ultima snapshot ricevuta
+CLIENT_MESSAGE = struct.Struct("<2sBI")
+MSG_JOIN, MSG_ACK, MSG_LEAVE = 0, 1, 2
+
+# Tipi (little endian) degli array di ogni archivio: posizioni quantizzate a
+# pixel interi su 16 bit, tipo di sprite su 8 bit
+ID_TYPE, POSITION_TYPE, KIND_TYPE = np.dtype("<u4"), np.dtype("<i2"), np.dtype("u1")
+
+class Snapshot:
+    def __init__(self, seq, tick, score, wave, lives, state, player, enemy_size, screen_size, stores):
+        """
+        Stato di una partita visto da uno spettatore:
+        - seq: numero progressivo della snapshot (0 = nessuna)
+        - player: posizione (x, y) del giocatore
+        - stores: nome -> (id, x, y, kind), array ordinati per id
+        """
+        self.seq = seq
+        self.tick = tick
+        self.score = score
+        self.wave = wave
+        self.lives = lives
+        self.state = state
+        self.player = player
+        self.enemy_size = enemy_size
+        self.screen_size = screen_size
+        self.stores = stores
+
+    @classmethod
+    def capture(cls, sim, seq):
+        """Snapshot dello stato corrente di una Simulation"""
+        stores = {}
+        for name in SNAPSHOT_STORES:
+            store = getattr(sim, name)
+            order = np.argsort(store.id, kind="stable")
+            stores[name] = (store.id[order].astype(ID_TYPE), store.x[order].astype(POSITION_TYPE),
+                            store.y[order].astype(POSITION_TYPE), store.kind[order].astype(KIND_TYPE))
+        return cls(seq, sim.frame, sim.score, sim.wave, sim.lives, sim.state.value,
+                   sim.player.rect.topleft, sim.wave_layout.size, (sim.screen_width, sim.screen_height), stores)
+
+def _empty_store():
+    return (np.zeros(0, ID_TYPE), np.zeros(0, POSITION_TYPE), np.zeros(0, POSITION_TYPE), np.zeros(0, KIND_TYPE))
+
+def encode_snapshot(current, baseline=None):
+    """
+    Pacchetto con la snapshot current codificata come delta rispetto a
+    baseline (una snapshot già confermata dal client; None = completa).
+    Per ogni archivio si inviano gli id rimossi, le entità nuove complete
+    e uno spostamento comune: solo le entità che si sono mosse in modo
+    diverso (es. un proiettile accanto alla formazione) hanno un delta proprio.
+    Un id della base con un tipo diverso appartiene a un'altra entità (gli id
+    ripartono da 0 a ogni reset): viene inviato come rimosso e di nuovo aggiunto.
+    """
+    parts = [SNAPSHOT_HEADER.pack(b"SI", PROTOCOL_VERSION, current.seq, baseline.seq if baseline else 0,
+                                  current.tick, current.score, current.wave, current.lives, current.state,
+                                  *current.player, current.enemy_size, *current.screen_size)]
+    for name in SNAPSHOT_STORES:
+        ids, xs, ys, kinds = current.stores[name]
+        base_ids, base_xs, base_ys, base_kinds = baseline.stores[name] if baseline else _empty_store()
+
+        kept = np.isin(ids, base_ids, assume_unique=True)
+        base_index = np.searchsorted(base_ids, ids[kept])
+        replaced = kinds[kept] != base_kinds[base_index]
+        if replaced.any():
+            kept[np.flatnonzero(kept)[replaced]] = False
+            base_index = base_index[~replaced]
+        removed = base_ids[~np.isin(base_ids, ids[kept], assume_unique=True)]
+        dx = xs[kept].astype(np.int32) - base_xs[base_index]
+        dy = ys[kept].astype(np.int32) - base_ys[base_index]
+
+        common_dx = common_dy = 0
+        moved = np.zeros(len(dx), dtype=bool)
+        if len(dx):
+            # Spostamento più frequente (la formazione e i proiettili si muovono in blocco)
+            keys = dx.astype(np.int64) * 65536 + dy
+            values, counts = np.unique(keys, return_counts=True)
+            first = int(np.argmax(keys == values[np.argmax(counts)]))
+            common_dx, common_dy = int(dx[first]), int(dy[first])
+            moved = keys != keys[first]
+
+        added = ~kept
+        kept_ids = ids[kept]
+        parts.append(STORE_HEADER.pack(len(removed), int(added.sum()), int(moved.sum()), common_dx, common_dy))
+        parts += [removed.astype(ID_TYPE).tobytes(),
+                  ids[added].tobytes(), xs[added].tobytes(), ys[added].tobytes(), kinds[added].tobytes(),
+                  kept_ids[moved].tobytes(), dx[moved].astype(POSITION_TYPE).tobytes(),
+                  dy[moved].astype(POSITION_TYPE).tobytes()]
+    return b"".join(parts)
+
+def decode_snapshot(packet, baselines):
+    """
+    Ricostruisce una snapshot da un pacchetto di encode_snapshot():
+    - baselines: seq -> Snapshot già ricevute
+    Restituisce None se il pacchetto non è valido o la sua base non è disponibile.
+    """
+    if len(packet) < SNAPSHOT_HEADER.size:
+        return None
+    (magic, version, seq, baseline_seq, tick, score, wave, lives, state,
+     player_x, player_y, enemy_size, screen_width, screen_height) = SNAPSHOT_HEADER.unpack_from(packet)
+    if magic != b"SI" or version != PROTOCOL_VERSION:
+        return None
+    baseline = baselines.get(baseline_seq) if baseline_seq else None
+    if baseline_seq and baseline is None:
+        return None
+
+    offset = SNAPSHOT_HEADER.size
+    def take(dtype, count):
+        nonlocal offset
+        values = np.frombuffer(packet, dtype=dtype, count=count, offset=offset)
+        offset += values.nbytes
+        return values
+
+    stores = {}
+    for name in SNAPSHOT_STORES:
+        removed_count, added_count, moved_count, common_dx, common_dy = STORE_HEADER.unpack_from(packet, offset)
+        offset += STORE_HEADER.size
+        removed = take(ID_TYPE, removed_count)
+        added = (take(ID_TYPE, added_count), take(POSITION_TYPE, added_count),
+                 take(POSITION_TYPE, added_count), take(KIND_TYPE, added_count))
+        moved_ids = take(ID_TYPE, moved_count)
+        moved_dx, moved_dy = take(POSITION_TYPE, moved_count), take(POSITION_TYPE, moved_count)
+
+        ids, xs, ys, kinds = baseline.stores[name] if baseline else _empty_store()
+        keep = ~np.isin(ids, removed, assume_unique=True)
+        ids, kinds = ids[keep], kinds[keep]
+        xs = (xs[keep] + common_dx).astype(POSITION_TYPE)
+        ys = (ys[keep] + common_dy).astype(POSITION_TYPE)
+        index = np.searchsorted(ids, moved_ids)
+        xs[index] += moved_dx - common_dx
+        ys[index] += moved_dy - common_dy
+
+        ids = np.concatenate((ids, added[0]))
+        order = np.argsort(ids, kind="stable")
+        stores[name] = (ids[order], np.concatenate((xs, added[1]))[order],
+                        np.concatenate((ys, added[2]))[order], np.concatenate((kinds, added[3]))[order])
+    return Snapshot(seq, tick, score, wave, lives, state, (player_x, player_y),
+                    enemy_size, (screen_width, screen_height), stores)
+
+class SpectatorServer:
+    def __init__(self, sim, host="127.0.0.1", port=SPECTATOR_PORT, history=SNAPSHOT_HISTORY):
+        """
+        Trasmette lo stato della simulazione agli spettatori via UDP:
+        - sim: simulazione da trasmettere
+        - host, port: indirizzo su cui ricevere le richieste dei client
+        - history: snapshot conservate come basi dei delta
+        Ogni client riceve il delta rispetto all'ultima snapshot che ha
+        confermato; i client con la stessa base condividono lo stesso pacchetto,
+        quindi la codifica costa una volta per base e non per spettatore.
+        """
+        self.sim = sim
+        self.history = history
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.setblocking(False)
+        self.address = self.socket.getsockname()
+        self.clients = {}     # Indirizzo -> [seq confermata, ultimo messaggio]
+        self.snapshots = {}   # Seq -> Snapshot inviate di recente
+        self.seq = 0
+        # Statistiche di trasmissione
+        self.ticks = 0
+        self.packets_sent = 0
+        self.bytes_sent = 0
+        self.encode_time = 0.0
+
+    def poll(self):
+        """Legge le richieste di ingresso, le conferme e le uscite dei client"""
+        now = time.perf_counter()
+        while True:
+            try:
+                data, address = self.socket.recvfrom(CLIENT_MESSAGE.size)
+            except OSError:
+                # Coda vuota, client sparito o (su Windows) datagramma più grande del
+                # buffer: quest'ultimo viene scartato, la lettura riprende al prossimo poll
+                break
+            if len(data) != CLIENT_MESSAGE.size:
+                continue
+            magic, message, seq = CLIENT_MESSAGE.unpack(data)
+            if magic != b"SC":
+                continue
+            if message == MSG_LEAVE:
+                self.clients.pop(address, None)
+            elif message == MSG_JOIN:
+                self.clients[address] = [0, now]
+            elif address in self.clients:
+                client = self.clients[address]
+                if seq > client[0] and seq in self.snapshots:
+                    client[0] = seq
+                client[1] = now
+        for address in [address for address, (_, seen) in self.clients.items() if now - seen > CLIENT_TIMEOUT]:
+            del self.clients[address]
+
+    def publish(self):
+        """Invia a ogni spettatore la snapshot del tick corrente"""
+        self.poll()
+        if not self.clients:
+            return
+        start = time.perf_counter()
+        self.seq += 1
+        snapshot = Snapshot.capture(self.sim, self.seq)
+        self.snapshots[self.seq] = snapshot
+        self.snapshots.pop(self.seq - self.history, None)
+
+        packets = {}  # Seq della base -> pacchetto
+        for address, (acked, _) in self.clients.items():
+            baseline = self.snapshots.get(acked)
+            key = baseline.seq if baseline else 0
+            if key not in packets:
+                packets[key] = encode_snapshot(snapshot, baseline)
+            packet = packets[key]
+            if len(packet) > MAX_PACKET:
+                print(f"Snapshot {self.seq} troppo grande per UDP ({len(packet)} byte)")
+                continue
+            try:
+                self.socket.sendto(packet, address)
+            except OSError as e:
+                print(f"Errore nell'invio allo spettatore {address}: {e}")
+                continue
+            self.packets_sent += 1
+            self.bytes_sent += len(packet)
+        self.ticks += 1
+        self.encode_time += time.perf_counter() - start
+
+    def stats(self):
+        """Byte medi per pacchetto e tempo medio (ms) di cattura, codifica e invio per tick"""
+        if not self.ticks:
+            return 0.0, 0.0
+        return self.bytes_sent / max(self.packets_sent, 1), self.encode_time / self.ticks * 1000
+
+    def close(self):
+        self.socket.close()
+
+class SpectatorClient:
+    def __init__(self, host="127.0.0.1", port=SPECTATOR_PORT, history=SNAPSHOT_HISTORY):
+        """
+        Client spettatore: riceve i delta dal server, ricostruisce le
+        snapshot e conferma l'ultima ricevuta (diventa la base dei prossimi delta)
+        """
+        self.history = history
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.connect((host, port))
+        self.socket.setblocking(False)
+        self.snapshots = {}
+        self.latest = None  # Ultima snapshot ricevuta (resta visibile anche in attesa del server)
+        self.bytes_received = 0
+        self._last_seq = 0
+        self._last_packet = self._last_join = 0.0
+
+    def _send(self, message, seq=0):
+        try:
+            self.socket.send(CLIENT_MESSAGE.pack(b"SC", message, seq))
+        except OSError:
+            pass  # Server non ancora in ascolto: si riprova al prossimo poll
+
+    def poll(self):
+        """Legge i pacchetti arrivati e restituisce la snapshot più recente (o None)"""
+        now = time.perf_counter()
+        received = False
+        while True:
+            try:
+                packet = self.socket.recv(MAX_PACKET)
+            except (BlockingIOError, ConnectionRefusedError):
+                break
+            self.bytes_received += len(packet)
+            snapshot = decode_snapshot(packet, self.snapshots)
+            if snapshot is None or snapshot.seq <= self._last_seq:
+                continue
+            self.snapshots[snapshot.seq] = snapshot
+            self.snapshots.pop(snapshot.seq - self.history, None)
+            self.latest = snapshot
+            self._last_seq = snapshot.seq
+            received = True
+
+        if received:
+            self._last_packet = now
+            self._send(MSG_ACK, self.latest.seq)
+        elif now - max(self._last_packet, self._last_join) > REJOIN_INTERVAL:
+            # Primo collegamento, pausa o server riavviato: si riparte da una snapshot completa
+            self.snapshots.clear()
+            self._last_seq = 0
+            self._last_join = now
+            self._send(MSG_JOIN)
+        return self.latest
+
+    def close(self):
+        self._send(MSG_LEAVE)
+        self.socket.close()
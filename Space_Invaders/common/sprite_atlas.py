@@ -0,0 +1,45 @@
+import pygame
+
+class SpriteAtlas:
+    def __init__(self, max_width=512, padding=1):
+        """
+        Raccoglie più sprite in un'unica Surface (texture atlas):
+        - max_width: larghezza massima dell'atlante
+        - padding: pixel vuoti tra uno sprite e l'altro
+        Dopo build(), regions[nome] è il rettangolo sorgente dello sprite.
+        """
+        self.max_width = max_width
+        self.padding = padding
+        self._pending = {}
+        self.regions = {}
+        self.surface = None
+
+    def add(self, name, surface):
+        """Aggiunge uno sprite da includere nell'atlante"""
+        self._pending[name] = surface
+
+    def build(self):
+        """Impacchetta gli sprite per righe (dal più alto al più basso) e crea la Surface"""
+        pad = self.padding
+        order = sorted(self._pending.items(), key=lambda item: item[1].get_height(), reverse=True)
+
+        # Posizionamento a scaffali: si va a capo quando la riga è piena
+        x = y = shelf_height = width = 0
+        for name, sprite in order:
+            w, h = sprite.get_size()
+            if x and x + w > self.max_width:
+                x, y = 0, y + shelf_height + pad
+                shelf_height = 0
+            self.regions[name] = pygame.Rect(x, y, w, h)
+            x += w + pad
+            width = max(width, x)
+            shelf_height = max(shelf_height, h)
+
+        self.surface = pygame.Surface((max(width, 1), max(y + shelf_height, 1)), pygame.SRCALPHA)
+        for name, sprite in order:
+            # Copia esatta dei pixel (l'atlante parte trasparente)
+            self.surface.blit(sprite, self.regions[name], special_flags=pygame.BLEND_RGBA_MAX)
+        if pygame.display.get_surface():
+            self.surface = self.surface.convert_alpha()
+        self._pending.clear()
+        return self.surface
@@ -0,0 +1,211 @@
+import numpy as np
+
+from common.game_state import GameState, Action
+from common.shoot import SHOT_WIDTH, SHOT_HEIGHT
+from common.enemy import ENEMY_SIZE, ENEMY_DROP
+from common.game_config import GameConfig
+
+PLAYER_SIZE = 50
+KILL_SCORE = 100
+
+class VectorSimulation:
+    def __init__(self, num_envs, grid_width=15, grid_height=20, cell_size=40, sidebar_width=200,
+                 max_bullets=8, max_enemy_shots=8, autoreset=True, seed=None, config=None):
+        """
+        N partite indipendenti avanzate in parallelo con le stesse regole di
+        Simulation, con tutto lo stato in array condivisi di forma (N, ...):
+        - num_envs: numero di partite
+        - grid_width, grid_height, cell_size, sidebar_width: come Simulation
+        - max_bullets, max_enemy_shots: slot di proiettili per partita
+        - autoreset: le partite terminate ripartono automaticamente a fine step
+        - seed: seme del generatore casuale (numpy)
+        - config: costanti di bilanciamento (GameConfig, quelle predefinite se None)
+        Le regole sono le stesse, ma la sequenza casuale (scelta di chi spara)
+        è diversa da quella di Simulation a parità di seme.
+        """
+        self.num_envs = num_envs
+        self.game_width = grid_width * cell_size
+        self.screen_width = self.game_width + sidebar_width
+        self.screen_height = grid_height * cell_size
+        self.autoreset = autoreset
+        self.rng = np.random.default_rng(seed)
+        self.config = config or GameConfig()
+
+        # Formazione iniziale (stesso ordine per colonne di Simulation._init_enemies)
+        cols, rows = np.meshgrid(np.arange(8), np.arange(3), indexing="ij")
+        self.formation_x = (100 + cols.ravel() * 50).astype(np.int32)
+        self.formation_y = (50 + rows.ravel() * 50).astype(np.int32)
+        self.formation_shape = cols.shape  # (colonne, righe)
+        num_enemies = len(self.formation_x)
+
+        n = num_envs
+        self.player_x = np.zeros(n, dtype=np.int32)
+        self.player_y = self.screen_height - 60
+        self.shoot_cooldown = np.zeros(n, dtype=np.int32)
+        self.enemy_x = np.zeros((n, num_enemies), dtype=np.int32)
+        self.enemy_y = np.zeros((n, num_enemies), dtype=np.int32)
+        self.enemy_alive = np.zeros((n, num_enemies), dtype=bool)
+        self.enemy_direction = np.ones(n, dtype=np.int32)
+        self.enemy_shot_cooldown = np.zeros(n, dtype=np.int32)
+        self.bullet_x = np.zeros((n, max_bullets), dtype=np.int32)
+        self.bullet_y = np.zeros((n, max_bullets), dtype=np.int32)
+        self.bullet_alive = np.zeros((n, max_bullets), dtype=bool)
+        self.shot_x = np.zeros((n, max_enemy_shots), dtype=np.int32)
+        self.shot_y = np.zeros((n, max_enemy_shots), dtype=np.int32)
+        self.shot_alive = np.zeros((n, max_enemy_shots), dtype=bool)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lives = np.zeros(n, dtype=np.int32)
+        self.frame = np.zeros(n, dtype=np.int64)
+        self.state = np.zeros(n, dtype=np.int8)
+
+        # Osservazione: giocatore (4 valori) + x, y, vivo per nemici e proiettili
+        self.observation_size = 4 + 3 * (num_enemies + max_bullets + max_enemy_shots)
+        self._rows = np.arange(n)
+
+    def reset(self, mask=None):
+        """Riporta allo stato iniziale le partite selezionate (tutte se mask è None)"""
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        self.player_x[mask] = self.screen_width // 2 - 25
+        self.shoot_cooldown[mask] = 0
+        self.enemy_x[mask] = self.formation_x
+        self.enemy_y[mask] = self.formation_y
+        self.enemy_alive[mask] = True
+        self.enemy_direction[mask] = 1
+        self.enemy_shot_cooldown[mask] = 0
+        self.bullet_alive[mask] = False
+        self.shot_alive[mask] = False
+        self.score[mask] = 0
+        self.lives[mask] = 3
+        self.frame[mask] = 0
+        self.state[mask] = GameState.PLAYING.value
+        return self.observe()
+
+    def step(self, actions):
+        """
+        Avanza di un tick tutte le partite in corso.
+        - actions: array (N,) di flag Action
+        Restituisce (osservazioni, ricompense = punti guadagnati, partite terminate).
+        """
+        actions = np.asarray(actions, dtype=np.int32)
+        active = self.state == GameState.PLAYING.value
+        previous_score = self.score.copy()
+        rows = self._rows
+        config = self.config
+
+        # Sparo del giocatore (prima del movimento, come in Simulation)
+        free = ~self.bullet_alive
+        fire = active & ((actions & Action.SHOOT) != 0) & (self.shoot_cooldown <= 0) & free.any(axis=1)
+        slot = free.argmax(axis=1)
+        self.bullet_x[rows[fire], slot[fire]] = self.player_x[fire] + PLAYER_SIZE // 2 - 2
+        self.bullet_y[rows[fire], slot[fire]] = self.player_y
+        self.bullet_alive[rows[fire], slot[fire]] = True
+        self.shoot_cooldown[fire] = config.player_shot_cooldown
+
+        # Movimento del giocatore
+        left = active & ((actions & Action.LEFT) != 0)
+        right = active & ((actions & Action.RIGHT) != 0)
+        self.player_x[left] = np.maximum(0, self.player_x[left] - config.player_speed)
+        self.player_x[right] = np.minimum(self.screen_width - PLAYER_SIZE, self.player_x[right] + config.player_speed)
+        self.shoot_cooldown[active & (self.shoot_cooldown > 0)] -= 1
+
+        # Movimento della formazione con inversione ai bordi
+        alive = self.enemy_alive
+        any_alive = alive.any(axis=1)
+        rightmost = np.where(alive, self.enemy_x + ENEMY_SIZE, np.iinfo(np.int32).min).max(axis=1)
+        leftmost = np.where(alive, self.enemy_x, np.iinfo(np.int32).max).min(axis=1)
+        edge = active & any_alive & np.where(self.enemy_direction > 0,
+                                             rightmost >= self.game_width, leftmost <= 0)
+        self.enemy_y[edge] += ENEMY_DROP
+        self.enemy_direction[edge] *= -1
+        self.enemy_x += (config.enemy_speed * self.enemy_direction * active)[:, None]
+
+        # Sparo nemico: ogni enemy_shot_frequency tick spara il nemico in prima
+        # fila di una colonna non vuota scelta a caso (come Formation.random_shooter)
+        num_cols, num_rows = self.formation_shape
+        columns = alive.reshape(self.num_envs, num_cols, num_rows)
+        column_alive = columns.any(axis=2)
+        counts = column_alive.sum(axis=1)
+        enemy_fire = active & (counts > 0) & (self.enemy_shot_cooldown <= 0)
+        self.enemy_shot_cooldown[active & ~enemy_fire] -= 1
+        self.enemy_shot_cooldown[enemy_fire] = config.enemy_shot_frequency
+        pick = (self.rng.random(self.num_envs) * counts).astype(np.int64)
+        column = (np.cumsum(column_alive, axis=1) > pick[:, None]).argmax(axis=1)
+        front = num_rows - 1 - columns[rows, column, ::-1].argmax(axis=1)
+        shooter = column * num_rows + front
+        free = ~self.shot_alive
+        enemy_fire &= free.any(axis=1)
+        slot = free.argmax(axis=1)
+        fire_rows, fire_slots, fire_shooters = rows[enemy_fire], slot[enemy_fire], shooter[enemy_fire]
+        self.shot_x[fire_rows, fire_slots] = self.enemy_x[fire_rows, fire_shooters] + ENEMY_SIZE // 2 - 2
+        self.shot_y[fire_rows, fire_slots] = self.enemy_y[fire_rows, fire_shooters] + ENEMY_SIZE
+        self.shot_alive[fire_rows, fire_slots] = True
+
+        # Movimento dei proiettili e rimozione di quelli usciti dallo schermo
+        self.bullet_y -= (config.player_bullet_speed * active)[:, None]
+        self.bullet_alive &= (self.bullet_y + SHOT_HEIGHT >= 0)
+        self.shot_y += (config.enemy_bullet_speed * active)[:, None]
+        self.shot_alive &= (self.shot_y <= self.screen_height)
+
+        self._check_collisions(active)
+        self._check_game_conditions(active)
+        self.frame[active] += 1
+
+        rewards = self.score - previous_score
+        dones = active & (self.state != GameState.PLAYING.value)
+        if self.autoreset and dones.any():
+            self.reset(dones)
+        return self.observe(), rewards, dones
+
+    def _check_collisions(self, active):
+        # Proiettili contro nemici: ogni proiettile elimina il primo nemico colpito
+        bx, by = self.bullet_x[:, :, None], self.bullet_y[:, :, None]
+        ex, ey = self.enemy_x[:, None, :], self.enemy_y[:, None, :]
+        overlap = ((bx < ex + ENEMY_SIZE) & (ex < bx + SHOT_WIDTH) &
+                   (by < ey + ENEMY_SIZE) & (ey < by + SHOT_HEIGHT))
+        overlap &= (self.bullet_alive & active[:, None])[:, :, None]
+        if overlap.any():
+            alive = self.enemy_alive
+            for b in range(overlap.shape[1]):
+                hit = overlap[:, b, :] & alive
+                has_hit = hit.any(axis=1)
+                if has_hit.any():
+                    hit_rows = self._rows[has_hit]
+                    alive[hit_rows, hit[has_hit].argmax(axis=1)] = False
+                    self.bullet_alive[hit_rows, b] = False
+                    self.score[has_hit] += KILL_SCORE
+
+        # Colpi nemici contro il giocatore (al massimo uno per tick)
+        px = self.player_x[:, None]
+        hit = (self.shot_alive & active[:, None] &
+               (self.shot_x < px + PLAYER_SIZE) & (px < self.shot_x + SHOT_WIDTH) &
+               (self.shot_y < self.player_y + PLAYER_SIZE) & (self.player_y < self.shot_y + SHOT_HEIGHT))
+        has_hit = hit.any(axis=1)
+        if has_hit.any():
+            self.shot_alive[self._rows[has_hit], hit[has_hit].argmax(axis=1)] = False
+            self.lives[has_hit] -= 1
+            self.state[has_hit & (self.lives <= 0)] = GameState.GAMEOVER.value
+
+    def _check_game_conditions(self, active):
+        playing = active & (self.state == GameState.PLAYING.value)
+        # Vittoria: tutti i nemici eliminati
+        victory = playing & ~self.enemy_alive.any(axis=1)
+        self.state[victory] = GameState.VICTORY.value
+        # Game Over: un nemico raggiunge la linea del giocatore
+        invaded = (self.enemy_alive & (self.enemy_y + ENEMY_SIZE >= self.player_y)).any(axis=1)
+        self.state[playing & ~victory & invaded] = GameState.GAMEOVER.value
+
+    def observe(self):
+        """Osservazioni normalizzate, array float32 di forma (N, observation_size)"""
+        w, h = float(self.screen_width), float(self.screen_height)
+        parts = [
+            (self.player_x / w)[:, None],
+            (self.lives / 3.0)[:, None],
+            (self.shoot_cooldown / float(max(self.config.player_shot_cooldown, 1)))[:, None],
+            self.enemy_direction[:, None],
+        ]
+        for xs, ys, alive in ((self.enemy_x, self.enemy_y, self.enemy_alive),
+                              (self.bullet_x, self.bullet_y, self.bullet_alive),
+                              (self.shot_x, self.shot_y, self.shot_alive)):
+            parts.extend((xs / w * alive, ys / h * alive, alive))
+        return np.concatenate(parts, axis=1).astype(np.float32)
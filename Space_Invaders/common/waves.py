@@ -0,0 +1,145 @@
+import json
+import zlib
+from pathlib import Path
+import numpy as np
+
+from common.enemy import ENEMY_SIZE, ENEMY_TYPES
+
+# File delle ondate della campagna e della modalità infinita
+WAVES_FILE = Path(__file__).parent.parent / "assets" / "waves.json"
+
+# Valori predefiniti di un'ondata (la formazione classica 8x3)
+WAVE_DEFAULTS = {"x": 100, "y": 50, "spacing": 50, "size": ENEMY_SIZE}
+
+# Formazione usata quando non si caricano ondate (una sola ondata, poi vittoria)
+CLASSIC_WAVES = {"waves": [{"name": "Classic", "cols": 8, "rows": 3}]}
+
+class WaveLayout:
+    """
+    Ondata compilata: posizioni e tipi dei nemici in array compatti, più
+    le regole dell'ondata. Le posizioni sono ordinate per colonne, da
+    sinistra a destra (lo stesso ordine della formazione classica).
+    - speed, fire_rate: None = valori della GameConfig
+    - curve_remaining, curve_speed: la velocità diventa curve_speed[i]
+      quando la frazione di nemici rimasti scende a curve_remaining[i]
+    - kinds: tipo di sprite fisso (-1 = scelto a caso con weights)
+    """
+    __slots__ = ("name", "xs", "ys", "kinds", "weights", "size", "speed", "fire_rate",
+                 "curve_remaining", "curve_speed")
+
+    def __init__(self, definition):
+        spec = dict(WAVE_DEFAULTS, **definition)
+        self.name = spec.get("name", "")
+        self.size = int(spec["size"])
+        self.speed = spec.get("speed")
+        self.fire_rate = spec.get("fire_rate")
+
+        if "pattern" in spec:
+            # Righe di caratteri: '.' = vuoto, '1'..'9' = tipo fisso, altro = tipo casuale
+            cells = [(col, row, char) for row, line in enumerate(spec["pattern"])
+                     for col, char in enumerate(line) if char not in ". "]
+        else:
+            cells = [(col, row, "x") for col in range(spec["cols"]) for row in range(spec["rows"])]
+        cells.sort(key=lambda cell: (cell[0], cell[1]))
+        cols = np.array([cell[0] for cell in cells], dtype=np.int32)
+        rows = np.array([cell[1] for cell in cells], dtype=np.int32)
+        self.xs = spec["x"] + cols * spec["spacing"]
+        self.ys = spec["y"] + rows * spec["spacing"]
+        self.kinds = np.array([int(char) - 1 if char.isdigit() else -1 for _, _, char in cells], dtype=np.int8)
+        if (self.kinds >= len(ENEMY_TYPES)).any():
+            raise ValueError(f"Ondata '{self.name}': tipo di nemico oltre {len(ENEMY_TYPES)}")
+
+        mix = spec.get("sprite_mix")
+        self.weights = None if mix is None or len(set(mix)) == 1 else list(mix)
+
+        curve = sorted(spec.get("speed_curve", []), reverse=True)
+        self.curve_remaining = np.array([point[0] for point in curve], dtype=np.float64)
+        self.curve_speed = [int(point[1]) for point in curve]
+
+    def __len__(self):
+        return len(self.xs)
+
+    def spawn(self, store, rng, speed):
+        """Crea i nemici dell'ondata in un EntityStore (vx = speed verso destra)"""
+        kinds = self.kinds.tolist()
+        random_slots = [i for i, kind in enumerate(kinds) if kind < 0]
+        if self.weights is None:
+            picks = [rng.randrange(len(ENEMY_TYPES)) for _ in random_slots]
+        else:
+            picks = rng.choices(range(len(ENEMY_TYPES)), weights=self.weights, k=len(random_slots))
+        for slot, kind in zip(random_slots, picks):
+            kinds[slot] = kind
+        store.spawn_many(self.xs, self.ys, self.size, self.size, vx=speed, kinds=kinds)
+
+    def speed_for(self, remaining, base_speed):
+        """Velocità della formazione con remaining nemici ancora vivi"""
+        fraction = remaining / len(self) if len(self) else 0.0
+        reached = int(np.count_nonzero(self.curve_remaining >= fraction))
+        return self.curve_speed[reached - 1] if reached else base_speed
+
+class WaveSet:
+    def __init__(self, data=CLASSIC_WAVES, endless=False):
+        """
+        Sequenza di ondate letta dai dati (vedi assets/waves.json):
+        - data: {"waves": [...], "endless": {...}} già decodificato dal JSON
+        - endless: dopo la campagna continua con ondate generate sempre più grandi
+        Le ondate sono compilate una volta sola; quelle infinite alla prima richiesta.
+        """
+        self.data = data
+        self.endless = endless and "endless" in data
+        # Impronta dei dati (per riconoscere ondate cambiate rispetto a un salvataggio)
+        self.checksum = zlib.crc32(json.dumps(data, sort_keys=True).encode("utf-8"))
+        self.campaign = [WaveLayout(definition) for definition in data["waves"]]
+        self._generated = {}
+
+    @classmethod
+    def load(cls, path=WAVES_FILE, endless=False):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), endless)
+
+    def as_dict(self):
+        """Dati e modalità dell'insieme di ondate (serializzabili in JSON)"""
+        return {"data": self.data, "endless": self.endless}
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(values["data"], values["endless"])
+
+    def wave(self, index):
+        """Ondata indicata (None a campagna finita senza modalità infinita)"""
+        if index < len(self.campaign):
+            return self.campaign[index]
+        if not self.endless:
+            return None
+        level = index - len(self.campaign)
+        if level not in self._generated:
+            self._generated[level] = WaveLayout(self._endless_wave(self.data["endless"], level))
+        return self._generated[level]
+
+    @staticmethod
+    def _endless_wave(spec, level):
+        """
+        Definizione dell'ondata infinita di livello level: ogni livello
+        aggiunge colonne e righe e stringe la spaziatura per restare nell'area
+        indicata, fino alla dimensione minima dei nemici; velocità e
+        frequenza di fuoco salgono a scatti
+        """
+        min_pitch = spec["min_size"] + 1
+        cols, rows = spec["cols"], spec["rows"]
+        for _ in range(level):
+            next_cols, next_rows = cols + spec["cols_step"], rows + spec["rows_step"]
+            if min(spec["max_width"] // next_cols, spec["max_height"] // next_rows) < min_pitch:
+                break
+            cols, rows = next_cols, next_rows
+        pitch = min(spec["max_width"] // cols, spec["max_height"] // rows, WAVE_DEFAULTS["spacing"])
+        boost = min(level // spec["speed_every"], spec["max_speed"] - spec["speed"])
+        fire_rate = max(spec["fire_rate"] + level * spec["fire_rate_step"], spec["min_fire_rate"])
+        return {
+            "name": f"Endless {level + 1}",
+            "x": spec["x"], "y": spec["y"], "cols": cols, "rows": rows, "spacing": pitch,
+            "size": max(spec["min_size"], pitch * 4 // 5),
+            "speed": spec["speed"] + boost, "fire_rate": fire_rate,
+            "speed_curve": [[remaining, min(speed + boost, spec["max_speed"])]
+                            for remaining, speed in spec.get("speed_curve", [])],
+            "sprite_mix": spec.get("sprite_mix"),
+        }
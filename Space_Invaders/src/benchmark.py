@@ -0,0 +1,224 @@
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import time
+import numpy as np
+
+# Il benchmark gira senza finestra né audio: i driver vanno scelti prima di importare pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game import Game
+from common.game_state import GameState, Action
+from common.entity_store import EntityStore
+from common.enemy import ENEMY_SIZE, ENEMY_TYPES
+from common.shoot import SHOT_WIDTH, SHOT_HEIGHT, PROJECTILE_POOL_SIZE
+
+BASELINE_VERSION = 1
+
+# Scenari: (nemici, proiettili del giocatore, colpi nemici); None = formazione iniziale 3x8
+SCENARIOS = {
+    "default": (None, 3, 2),
+    "medium": (500, 200, 50),
+    "large": (2000, 1000, 200),
+    "huge": (5000, 3000, 500),
+}
+
+# Funzioni misurate: nome -> (chiamate per campione, solo nello scenario di default)
+BENCHMARKS = {
+    "update": (10, False),
+    "check_collisions": (1, False),
+    "render": (10, False),
+    "render_dirty": (10, False),
+    "render_scaled": (10, False),  # Area di gioco alla risoluzione più bassa
+    "reset_game": (1, True),
+}
+
+# Soglie del confronto: significatività statistica e rallentamento minimo della mediana
+# (tra due esecuzioni separate la mediana oscilla facilmente del 10%)
+SIGNIFICANCE = 0.01
+MIN_CHANGE = 0.15
+
+def build_scenario(game, enemies, bullets, enemy_shots, seed=0):
+    """Prepara una partita con il numero di entità richiesto e ne restituisce lo stato"""
+    game.reset_game()
+    sim = game.sim
+    sim.reset(seed)
+    rng = np.random.default_rng(seed)
+    player_top = sim.player.rect.top
+
+    if enemies is not None:
+        # Nemici sparsi nella metà alta dell'area di gioco (lontani dalla linea del giocatore)
+        sim.enemies.clear()
+        sim.enemy_grid.clear()
+        xs = rng.integers(0, sim.game_width - ENEMY_SIZE * 2, enemies)
+        ys = rng.integers(0, player_top // 2, enemies)
+        sim.enemies.spawn_many(xs, ys, ENEMY_SIZE, ENEMY_SIZE, vx=sim.config.enemy_speed,
+                               kinds=rng.integers(0, len(ENEMY_TYPES), enemies))
+        sim.enemy_grid.update(sim.enemies)
+        sim.formation.build(sim.enemies)
+
+    # Pool di proiettili ingranditi se lo scenario supera la capacità predefinita
+    for name, count, speed in (("bullets", bullets, -sim.config.player_bullet_speed),
+                               ("enemy_shots", enemy_shots, sim.config.enemy_bullet_speed)):
+        store = EntityStore(max(count, PROJECTILE_POOL_SIZE), fixed=True)
+        xs = rng.integers(0, sim.game_width - SHOT_WIDTH, count)
+        ys = rng.integers(0, player_top - SHOT_HEIGHT, count)
+        if count:
+            store.spawn_many(xs, ys, SHOT_WIDTH, SHOT_HEIGHT, 0, speed, 0)
+        setattr(sim, name, store)
+
+    game.held_actions = Action.LEFT
+    return sim.get_state()
+
+def restore(game, state, dirty=False, tier=0):
+    """Riporta la partita allo stato dello scenario prima di un campione"""
+    game.sim.set_state(state)
+    game.recorder.start()
+    game.replay = None
+    game.current_state = GameState.PLAYING
+    game.DIRTY_RENDERING = dirty
+    game.resolution.level = tier
+    game.dirty_renderer.invalidate()
+
+def measure(game, state, name, calls, repeats):
+    """Tempo medio per chiamata (secondi) di ogni campione"""
+    target = {
+        "update": game.update,
+        "check_collisions": game.sim._check_collisions,
+        "render": game.render,
+        "render_dirty": game.render,
+        "render_scaled": game.render,
+        "reset_game": game.reset_game,
+    }[name]
+    samples = []
+    for _ in range(repeats):
+        tier = len(game.resolution.tiers) - 1 if name == "render_scaled" else 0
+        restore(game, state, dirty=name == "render_dirty", tier=tier)
+        if name == "render_dirty":
+            game.render()  # Il primo frame a aree sporche ridisegna tutto
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        for _ in range(calls):
+            target()
+        elapsed = time.perf_counter() - start
+        gc.enable()
+        samples.append(elapsed / calls)
+    return samples
+
+def run_benchmarks(scenarios, repeats, seed=0):
+    """Esegue tutti i benchmark sugli scenari indicati; restituisce {"scenario/nome": campioni}"""
+    game = Game()
+    results = {}
+    for scenario in scenarios:
+        state = build_scenario(game, *SCENARIOS[scenario], seed=seed)
+        for name, (calls, default_only) in BENCHMARKS.items():
+            if default_only and scenario != "default":
+                continue
+            samples = measure(game, state, name, calls, repeats)
+            results[f"{scenario}/{name}"] = samples
+            print(f"{scenario}/{name}: {np.median(samples) * 1000:.3f} ms")
+    pygame.quit()
+    return results
+
+def summary(samples):
+    """Statistiche di un insieme di campioni (in secondi)"""
+    values = np.asarray(samples)
+    return {
+        "median": float(np.median(values)),
+        "mean": float(values.mean()),
+        "stdev": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+        "samples": [float(value) for value in values],
+    }
+
+def save_baseline(path, results, repeats):
+    """Salva i risultati come baseline JSON"""
+    baseline = {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "results": {key: summary(samples) for key, samples in results.items()},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+
+def slower_probability(baseline, current):
+    """
+    Test di Mann-Whitney a una coda (approssimazione normale, con correzione
+    per i pareggi): p-value dell'ipotesi che i campioni correnti siano più lenti
+    """
+    a, b = np.asarray(baseline), np.asarray(current)
+    n1, n2 = len(a), len(b)
+    values = np.concatenate([a, b])
+    order = values.argsort(kind="mergesort")
+    ranks = np.empty(len(values))
+    ranks[order] = np.arange(1, len(values) + 1)
+    # Ranghi medi per i valori uguali
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    ranks = (np.bincount(inverse, weights=ranks) / counts)[inverse]
+
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    ties = (counts ** 3 - counts).sum()
+    n = n1 + n2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2) / sigma
+    # U basso = campioni della baseline con ranghi bassi = correnti più lenti
+    return 0.5 * math.erfc(-z / math.sqrt(2))
+
+def compare(path, results, min_change=MIN_CHANGE):
+    """Confronta i risultati con una baseline; restituisce le chiavi in regressione"""
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Versione della baseline non supportata: {baseline.get('version')}")
+
+    regressions = []
+    print(f"\n{'benchmark':<28}{'baseline':>12}{'corrente':>12}{'diff':>9}{'p':>9}")
+    for key, samples in results.items():
+        reference = baseline["results"].get(key)
+        if reference is None:
+            print(f"{key:<28}{'-':>12}{np.median(samples) * 1000:>10.3f}ms   (nuovo)")
+            continue
+        before, after = reference["median"], float(np.median(samples))
+        change = after / before - 1
+        p_slower = slower_probability(reference["samples"], samples)
+        p_faster = slower_probability(samples, reference["samples"])
+        status = ""
+        if p_slower < SIGNIFICANCE and change > min_change:
+            status = "REGRESSIONE"
+            regressions.append(key)
+        elif p_faster < SIGNIFICANCE and change < -min_change:
+            status = "migliorato"
+        print(f"{key:<28}{before * 1000:>10.3f}ms{after * 1000:>10.3f}ms{change:>+9.1%}"
+              f"{min(p_slower, p_faster):>9.4f}  {status}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark di update, collisioni e rendering")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="scenari da eseguire (default: tutti, ripetibile)")
+    parser.add_argument("--repeats", type=int, default=30, help="campioni per benchmark (default 30)")
+    parser.add_argument("--seed", type=int, default=0, help="seme degli scenari")
+    parser.add_argument("--save", metavar="FILE", help="salva i risultati come baseline JSON")
+    parser.add_argument("--compare", metavar="FILE", help="confronta con una baseline e segnala le regressioni")
+    parser.add_argument("--threshold", type=float, default=MIN_CHANGE,
+                        help=f"rallentamento minimo della mediana da segnalare (default {MIN_CHANGE})")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.scenario or list(SCENARIOS), args.repeats, args.seed)
+    if args.save:
+        save_baseline(args.save, results, args.repeats)
+    if args.compare:
+        regressions = compare(args.compare, results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regressioni: {', '.join(regressions)}")
+            raise SystemExit(1)
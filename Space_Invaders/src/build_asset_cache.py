@@ -0,0 +1,20 @@
+import os
+
+# La cache si costruisce senza finestra né audio
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from game import Game
+from common.asset_manager import AssetManager, IMAGE_CACHE_FILE
+
+if __name__ == "__main__":
+    # Si riparte da una cache vuota: il gioco carica ogni immagine nelle
+    # dimensioni finali e a caricamento completato le salva su disco
+    cache_path = AssetManager(disk_cache=None).base_path / IMAGE_CACHE_FILE
+    if cache_path.exists():
+        os.remove(cache_path)
+    game = Game()
+    game._finish_loading(wait=True)
+    print(f"Cache immagini scritta in {cache_path} ({os.path.getsize(cache_path)} byte)")
+    pygame.quit()
@@ -1,593 +1,1032 @@
-import pygame
-import random
-
-import sys
-import os
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))
-
-from common.game_state import GameState
-from common.asset_manager import AssetManager
-from common.player import Player
-from common.shoot import Shoot, EnemyShot
-from common.enemy import Enemy
-from common.button import Button
-
-class Game:
-    def __init__(self):
-        pygame.init()
-
-        # Inizializzazione assets manager
-        self.assets = AssetManager()
-        # Caricamento degli asset audio
-        self._load_audio_assets()
-
-        # Inizializzazione schermo
-        self.grid_width, self.grid_height, self.cell_size = 15, 20, 40
-        self.sidebar_width = 200  # Larghezza sidebar
-        # Area di gioco + sidebar
-        self.screen_width = self.grid_width * self.cell_size + self.sidebar_width
-        self.screen_height = self.grid_height * self.cell_size
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        pygame.display.set_caption("Space Invaders")
-
-        # Inizializzazione sfondo
-        self.background = self.assets.load_background("images/menu_background.jpg", (self.screen_width, self.screen_height))
-
-        # Inizializzazione logo
-        self.logo = self.assets.load_image("images/game_logo.png")
-        self.logo = pygame.transform.scale(self.logo, (300, 150)) if self.logo else None
-
-        # Inizializzazione giocatore
-        self.player = Player(
-            x = self.screen_width // 2 - 25,
-            y = self.screen_height - 60,
-            width = 50,
-            height = 50,
-            screen_width = self.screen_width,
-            asset_manager=self.assets
-        )
-
-        # Inizializzazione variabili di stato
-        self.DEBUG_MODE = False  # Imposta a False per nascondere la griglia
-        self.grid_surface = None
-        self._init_debug_grid()
-
-        self.score = 0
-        self.lives = 3
-        self.bullets = []
-        self.enemies = []
-        self._init_enemies()
-        self.enemy_shots = []
-        self.enemy_shot_cooldown = 0
-        self.enemy_shot_frequency = 60  # Frame tra i colpi
-        self.current_state = GameState.MENU
-
-        # Inizializzazione bottoni
-        self._init_menu_buttons()
-        self._init_result_buttons()
-
-        self.clock = pygame.time.Clock()
-        self.running = True
-
-        # Inizializzazione bottoni
-        self._init_menu_buttons()
-        self._init_result_buttons()
-
-    def _load_audio_assets(self):
-        """Carica tutti gli asset audio necessari"""
-        # Musica di sottofondo
-        self.assets.load_music("sounds/background_music.mp3", volume=0.5)
-        
-        # Effetti sonori
-        self.assets.load_sound("sounds/shoot.wav", volume=0.3)
-        self.assets.load_sound("sounds/explosion.wav", volume=0.3)
-
-    # INIZIALIZZAZIONE GRIGLIA PER DEBUG
-    def _init_debug_grid(self):
-        if self.DEBUG_MODE:
-            # Crea la griglia solo per l'area di gioco (senza sidebar)
-            self.grid_surface = self._create_grid_surface(
-                self.screen_width,  # Solo area di gioco
-                self.screen_height,
-                self.cell_size,
-                (160, 160, 160)  # Colore grigio chiaro
-            )
-            
-    def _create_grid_surface(self, width, height, cell_size, color):
-        grid_surface = pygame.Surface((width, height), pygame.SRCALPHA)
-
-        for x in range(0, width, cell_size):
-            pygame.draw.line(grid_surface, color, (x, 0), (x, height))
-        for y in range(0, height, cell_size):
-            pygame.draw.line(grid_surface, color, (0, y), (width, y))
-
-        return grid_surface
-
-    def _draw_sidebar(self):
-        """Disegna la barra laterale con punteggio e vite - SOLO in PLAYING"""
-        if self.current_state != GameState.PLAYING:
-            return
-        
-        sidebar_rect = pygame.Rect(self.grid_width * self.cell_size, 0, 
-                                self.sidebar_width, self.screen_height)
-        
-        # Sfondo sidebar
-        pygame.draw.rect(self.screen, (50, 50, 50), sidebar_rect)
-        
-        # Punteggio
-        font = pygame.font.SysFont(None, 36)
-        score_text = font.render(f"Score: {self.score}", True, (255, 255, 255))
-        self.screen.blit(score_text, (sidebar_rect.x + 10, 30))
-        
-        # Vite
-        lives_text = font.render("Lives:", True, (255, 255, 255))
-        self.screen.blit(lives_text, (sidebar_rect.x + 10, 80))
-        
-        for i in range(self.lives):
-            pygame.draw.circle(self.screen, (255, 0, 0),
-                            (sidebar_rect.x + 30 + i * 40, 120), 15)
-            
-    def start_action(self):
-        '''
-            Impostazione stato di gioco
-            Avvio musica
-        '''
-
-        print("Avvio il gioco!")
-        self.current_state = GameState.PLAYING
-        self.assets.play_music()
-
-    def quit_action(self):
-        '''
-            Stop finestra di gioco
-        '''
-
-        self.running = False
-
-    def _init_enemies(self):
-        # Crea una formazione di nemici ordinata da sinistra a destra
-        enemies = []
-        for row in range(3):
-            for col in range(8):
-                x = 100 + col * 50
-                y = 50 + row * 50
-                enemies.append(Enemy(x, y, self.assets))  # Passa l'asset_manager
-        
-        # Ordina i nemici per coordinata x (importante per il nuovo movimento)
-        self.enemies = sorted(enemies, key=lambda e: e.rect.x)
-
-    def reset_game(self):
-        """Resetta completamente lo stato del gioco"""
-        # Pulisci tutte le liste
-        self.enemies.clear()
-        self.bullets.clear()
-        self.enemy_shots.clear()
-        
-        # Re-inizializza i nemici
-        self._init_enemies()
-        
-        # Resetta il giocatore
-        self.player.reset()
-        self.player.rect.x = self.screen_width // 2 - 25
-        self.player.rect.y = self.screen_height - 60
-        
-        # Resetta le variabili di stato
-        self.score = 0
-        self.lives = 3
-        self.enemy_shot_cooldown = 0
-        
-        # Ripristina lo stato di gioco
-        self.current_state = GameState.PLAYING
-        
-        # Re-inizializza la griglia di debug se necessario
-        self._init_debug_grid()
-        
-        # Gestione musica
-        self.assets.stop_music()
-        self.assets.play_music()
-        
-        # Forza un render immediato
-        self.render()
-        pygame.display.flip()
-            
-    def _init_menu_buttons(self):
-        """Inizializza i bottoni del menu principale"""
-        button_width, button_height = 200, 50
-        center_x = self.screen_width // 2 - button_width // 2
-        
-        # Riorganizza i bottoni con più spazio e posizione migliore
-        self.menu_buttons = [
-            Button(
-                center_x, 300, button_width, button_height,
-                "Start",
-                color=(50, 120, 50),
-                hover_color=(70, 150, 70),
-                text_color=(255, 255, 255),
-                action=self.start_action
-            ),
-            Button(
-                center_x, 380, button_width, button_height,
-                "How to Play",
-                color=(50, 50, 120),
-                hover_color=(70, 70, 150),
-                text_color=(255, 255, 255),
-                action=self.show_instructions
-            ),
-            Button(
-                center_x, 460, button_width, button_height,
-                "Quit",
-                color=(120, 50, 50),
-                hover_color=(150, 70, 70),
-                text_color=(255, 255, 255),
-                action=self.quit_action
-            )
-        ]
-
-    def _init_result_buttons(self):
-        """Inizializza i bottoni per gli schermi di vittoria/sconfitta"""
-        button_width, button_height = 200, 50
-        center_x = self.screen_width // 2 - button_width // 2
-        
-        # Bottoni condivisi per VICTORY e GAMEOVER
-        self.victory_buttons = [
-            Button(
-                center_x, 300, button_width, button_height,  # Spostato più in basso
-                "Play Again",
-                color=(50, 120, 50),
-                hover_color=(70, 150, 70),
-                text_color=(255, 255, 255),
-                action=self.reset_game
-            ),
-            Button(
-                center_x, 380, button_width, button_height,
-                "Main Menu",
-                color=(50, 50, 120),
-                hover_color=(70, 70, 150),
-                text_color=(255, 255, 255),
-                action=self.return_to_menu
-            ),
-            Button(
-                center_x, 460, button_width, button_height,
-                "Quit",
-                color=(120, 50, 50),
-                hover_color=(150, 70, 70),
-                text_color=(255, 255, 255),
-                action=self.quit_action
-            )
-        ]
-        
-        self.gameover_buttons = [
-            Button(
-                center_x, 300, button_width, button_height,
-                "Retry",
-                color=(50, 120, 50),
-                hover_color=(70, 150, 70),
-                text_color=(255, 255, 255),
-                action=self.reset_game
-            ),
-            Button(
-                center_x, 380, button_width, button_height,
-                "Main Menu",
-                color=(50, 50, 120),
-                hover_color=(70, 70, 150),
-                text_color=(255, 255, 255),
-                action=self.return_to_menu
-            ),
-            Button(
-                center_x, 460, button_width, button_height,
-                "Quit",
-                color=(120, 50, 50),
-                hover_color=(150, 70, 70),
-                text_color=(255, 255, 255),
-                action=self.quit_action
-            )
-        ]
-        
-        # Aggiungi stato per le istruzioni
-        self.instructions_shown = False
-
-    def show_instructions(self):
-        """Mostra le istruzioni del gioco"""
-        self.instructions_shown = True
-
-    def return_to_menu(self):
-        """Torna al menu principale e resetta il gioco"""
-        self.reset_game()
-        self.current_state = GameState.MENU
-        self.instructions_shown = False
-        self.assets.stop_music()
-
-    def handle_events(self):
-        """Gestisce tutti gli eventi del gioco"""
-        mouse_pos = pygame.mouse.get_pos()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            
-            # Gestione bottoni in base allo stato corrente
-            if self.current_state == GameState.MENU and not self.instructions_shown:
-                for button in self.menu_buttons:
-                    if button.handle_event(event, mouse_pos):
-                        self.render()  # Forza il render dopo il click
-                        return
-
-            elif self.current_state == GameState.VICTORY:
-                for button in self.victory_buttons:
-                    if button.handle_event(event, mouse_pos):
-                        self.render()  # Forza il render dopo il click
-                        return
-
-            elif self.current_state == GameState.GAMEOVER:
-                for button in self.gameover_buttons:
-                    if button.handle_event(event, mouse_pos):
-                        self.render()  # Forza il render dopo il click
-                        return
-
-            elif self.current_state == GameState.PLAYING:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_LEFT:
-                        self.player.set_moving("left", True)
-                    elif event.key == pygame.K_RIGHT:
-                        self.player.set_moving("right", True)
-                    elif event.key == pygame.K_SPACE:
-                        bullet = self.player.shoot()
-                        if bullet:
-                            self.bullets.append(bullet)
-                            self.assets.play_sound("sounds/shoot.wav")
-                
-                if event.type == pygame.KEYUP:
-                    if event.key == pygame.K_LEFT:
-                        self.player.set_moving("left", False)
-                    elif event.key == pygame.K_RIGHT:
-                        self.player.set_moving("right", False)
-
-    def update(self):
-        """Aggiorna lo stato del gioco"""
-        if hasattr(self, 'skip_checks') and self.skip_checks:
-            self.skip_checks = False
-            return
-        
-        mouse_pos = pygame.mouse.get_pos()
-        
-        # Aggiorna hover per tutti i bottoni visibili
-        if self.current_state == GameState.MENU:
-            for button in self.menu_buttons:
-                button.check_hover(mouse_pos)
-        elif self.current_state == GameState.VICTORY:
-            for button in self.victory_buttons:
-                button.check_hover(mouse_pos)
-        elif self.current_state == GameState.GAMEOVER:
-            for button in self.gameover_buttons:
-                button.check_hover(mouse_pos)
-
-        elif self.current_state == GameState.PLAYING:
-            self.player.update()
-            
-            # Movimento nemici
-            edge_hit = False
-            if self.enemies:
-                if self.enemies[0].direction > 0:
-                    rightmost = max(enemy.rect.right for enemy in self.enemies)
-                    if rightmost >= self.grid_width * self.cell_size:
-                        edge_hit = True
-                else:
-                    leftmost = min(enemy.rect.left for enemy in self.enemies)
-                    if leftmost <= 0:
-                        edge_hit = True
-            
-            if edge_hit:
-                for enemy in self.enemies:
-                    enemy.move_down()
-            
-            for enemy in self.enemies:
-                enemy.update(self.grid_width * self.cell_size)
-            
-            # Sparo nemico casuale
-            if self.enemies and self.enemy_shot_cooldown <= 0:
-                shooter = random.choice(self.enemies)
-                self.enemy_shots.append(EnemyShot(
-                    shooter.rect.centerx - 2,
-                    shooter.rect.bottom
-                ))
-                self.enemy_shot_cooldown = self.enemy_shot_frequency
-            else:
-                self.enemy_shot_cooldown -= 1
-            
-            # Aggiorna proiettili giocatore
-            for bullet in self.bullets[:]:
-                bullet.update()
-                if not bullet.active:
-                    self.bullets.remove(bullet)
-            
-            # Aggiorna colpi nemici
-            for shot in self.enemy_shots[:]:
-                shot.update()
-                if not shot.active:
-                    self.enemy_shots.remove(shot)
-            
-            # Controlla collisioni
-            self._check_collisions()
-            self._check_game_conditions()
-
-    def _check_collisions(self):
-        # Non controllare le collisioni se stiamo saltando i controlli
-        if hasattr(self, 'skip_checks') and self.skip_checks:
-            return
-
-        # Collisione proiettili giocatore con nemici
-        for bullet in self.bullets[:]:
-            for enemy in self.enemies[:]:
-                if bullet.rect.colliderect(enemy.rect):
-                    self.bullets.remove(bullet)
-                    self.enemies.remove(enemy)
-                    self.assets.play_sound("sounds/explosion.wav")  # Suono nemico colpito
-                    self.score += 100  # Aggiungi 100 punti per ogni nemico ucciso
-                    break
-        
-        # Collisione colpi nemici con giocatore
-        for shot in self.enemy_shots[:]:
-            if shot.rect.colliderect(self.player.rect):
-                self.enemy_shots.remove(shot)
-                self.lives -= 1
-                if self.lives <= 0:
-                    self.current_state = GameState.GAMEOVER
-                break
-
-    def _check_game_conditions(self):
-        # Non controllare le condizioni se stiamo saltando i controlli
-        if hasattr(self, 'skip_checks') and self.skip_checks:
-            return
-            
-        # Vittoria: tutti i nemici eliminati
-        if not self.enemies and self.current_state == GameState.PLAYING:
-            self.current_state = GameState.VICTORY
-            return
-        
-        # Game Over: nemici raggiungono il giocatore o vite esaurite
-        player_line = self.player.rect.y
-        for enemy in self.enemies:
-            if enemy.rect.bottom >= player_line and self.current_state == GameState.PLAYING:
-                self.current_state = GameState.GAMEOVER
-                return
-
-    # Renderizza elementi a schermo
-    def render(self):
-        """Renderizza tutti gli elementi del gioco in base allo stato corrente"""
-        # Sfondo
-        self.screen.blit(self.background, (0, 0))
-        
-        # Griglia di debug (se attiva)
-        if self.DEBUG_MODE and self.grid_surface:
-            self.screen.blit(self.grid_surface, (0, 0))
-        
-        mouse_pos = pygame.mouse.get_pos()
-        
-        # Render in base allo stato corrente
-        if self.current_state == GameState.MENU:
-            if not self.instructions_shown:
-                # Logo del gioco
-                if self.logo:
-                    logo_rect = self.logo.get_rect(center=(self.screen_width//2, 120))
-                    self.screen.blit(self.logo, logo_rect)
-                
-                # Bottoni del menu
-                for button in self.menu_buttons:
-                    button.check_hover(mouse_pos)
-                    button.draw(self.screen)
-            else:
-                # Schermata delle istruzioni
-                self._render_instructions()
-                
-        elif self.current_state == GameState.PLAYING:
-            # Elementi di gioco
-            self.player.draw(self.screen)
-            for enemy in self.enemies:
-                enemy.draw(self.screen)
-            for bullet in self.bullets:
-                bullet.draw(self.screen)
-            for shot in self.enemy_shots:
-                shot.draw(self.screen)
-            
-            # Sidebar con punteggio e vite
-            self._draw_sidebar()
-            
-        elif self.current_state == GameState.VICTORY:
-            # Messaggio di vittoria
-            font = pygame.font.SysFont(None, 72)
-            text = font.render("VICTORY!", True, (0, 255, 0))
-            text_rect = text.get_rect(center=(self.screen_width//2, 150))
-            self.screen.blit(text, text_rect)
-            
-            # Punteggio finale
-            score_font = pygame.font.SysFont(None, 48)
-            score_text = score_font.render(f"Final Score: {self.score}", True, (255, 255, 255))
-            score_rect = score_text.get_rect(center=(self.screen_width//2, 220))
-            self.screen.blit(score_text, score_rect)
-            
-            # Bottoni
-            for button in self.victory_buttons:
-                button.check_hover(mouse_pos)
-                button.draw(self.screen)
-                
-        elif self.current_state == GameState.GAMEOVER:
-            # Messaggio di game over
-            font = pygame.font.SysFont(None, 72)
-            text = font.render("GAME OVER", True, (255, 0, 0))
-            text_rect = text.get_rect(center=(self.screen_width//2, 150))
-            self.screen.blit(text, text_rect)
-            
-            # Punteggio finale
-            score_font = pygame.font.SysFont(None, 48)
-            score_text = score_font.render(f"Final Score: {self.score}", True, (255, 255, 255))
-            score_rect = score_text.get_rect(center=(self.screen_width//2, 220))
-            self.screen.blit(score_text, score_rect)
-            
-            # Bottoni
-            for button in self.gameover_buttons:
-                button.check_hover(mouse_pos)
-                button.draw(self.screen)
-        
-        # Aggiornamento dello schermo
-        pygame.display.flip()
-
-    def _render_instructions(self):
-        """Renderizza la schermata delle istruzioni"""
-        # Titolo
-        font = pygame.font.SysFont(None, 72)
-        title = font.render("HOW TO PLAY", True, (255, 255, 0))
-        title_rect = title.get_rect(center=(self.screen_width//2, 80))
-        self.screen.blit(title, title_rect)
-        
-        # Istruzioni
-        instructions = [
-            "Use LEFT and RIGHT arrow keys to move",
-            "Press SPACE to shoot",
-            "Destroy all aliens to win",
-            "Don't let them reach you!",
-            "Avoid their shots to survive"
-        ]
-        
-        font = pygame.font.SysFont(None, 36)
-        for i, line in enumerate(instructions):
-            text = font.render(line, True, (255, 255, 255))
-            text_rect = text.get_rect(center=(self.screen_width//2, 180 + i * 40))
-            self.screen.blit(text, text_rect)
-        
-        # Bottone per tornare indietro
-        back_button = Button(
-            self.screen_width//2 - 100, 400, 200, 50,
-            "Back to Menu",
-            color=(50, 50, 120),
-            hover_color=(70, 70, 150),
-            text_color=(255, 255, 255),
-            action=self.return_to_menu
-        )
-        
-        mouse_pos = pygame.mouse.get_pos()
-        back_button.check_hover(mouse_pos)
-        
-        # Gestione degli eventi per il bottone back
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if back_button.is_hovered:
-                    back_button.action()
-        
-        back_button.draw(self.screen)
-
-    # Avvio del gioco
-    def run(self):
-        while self.running:
-            self.handle_events()
-            
-            # Aggiorna solo se in stato PLAYING
-            if self.current_state == GameState.PLAYING:
-                self.update()
-            
-            self.render()
-            self.clock.tick(60)
-        
+import pygame
+import numpy as np
+import time
+from functools import partial
+
+import sys
+import os
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from common.game_state import GameState, Action
+from common.asset_manager import AssetManager
+from common.simulation import Simulation, TICK_RATE, EVENT_SHOOT, EVENT_EXPLOSION, EVENT_WAVE
+from common.waves import WaveSet
+from common.enemy import Enemy, ENEMY_TYPES
+from common.shoot import Shoot, EnemyShot
+from common.button import Button
+from common.sprite_atlas import SpriteAtlas
+from common.dirty_renderer import DirtyRectRenderer, MAX_DIRTY_RECTS
+from common.compositor import LayerCompositor
+from common.replay import ReplayRecorder
+from common.profiler import PROFILER
+from common.asset_loader import BackgroundLoader
+from common.sound_mixer import pre_init_mixer, MAX_VOICES
+from common.input_dispatch import InputDispatcher, InputLatency
+from common.savestate import write_save, read_save
+from common.resolution import ResolutionScaler
+from common.quality import QualityGovernor
+
+# Limite di frame renderizzati al secondo (0 = nessun limite)
+MAX_FPS = 240
+# Tick massimi recuperati in un frame: oltre, il tempo in eccesso viene scartato
+MAX_CATCH_UP_TICKS = 5
+# Salvataggio rapido (F5 salva durante la partita, F9 ricarica)
+QUICKSAVE_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "saves", "quicksave.bin"))
+# Frame tra due aggiornamenti dei numeri del profiler a schermo
+PROFILE_OVERLAY_REFRESH = 30
+# Qualità ridotta: voci degli effetti sonori e secondi tra due aggiornamenti della sidebar
+REDUCED_VOICES = 2
+REDUCED_HUD_INTERVAL = 0.25
+
+# Schermata delle istruzioni (sotto-stato del MENU) nella tabella degli input
+INSTRUCTIONS = "instructions"
+
+# Sprite decodificati in background durante il menu
+SPRITE_IMAGES = ["images/player.png"] + [f"images/{name}" for name in ENEMY_TYPES]
+
+# Suoni associati agli eventi della simulazione
+EVENT_SOUNDS = {
+    EVENT_SHOOT: "sounds/shoot.wav",
+    EVENT_EXPLOSION: "sounds/explosion.wav",
+}
+
+class Game:
+    def __init__(self, scaled_window=False):
+        """
+        - scaled_window: finestra ridimensionabile, ingrandita da SDL mantenendo
+          la risoluzione logica del gioco (coordinate e mouse non cambiano)
+        """
+        # Mixer a bassa latenza: la configurazione va impostata prima di pygame.init()
+        pre_init_mixer()
+        pygame.init()
+
+        # Inizializzazione assets manager
+        self.assets = AssetManager()
+        # Audio e sprite di gioco si caricano in background: il menu appare
+        # appena sono pronti sfondo e logo (vedi _finish_loading)
+        self.assets_ready = False
+        self.loader = BackgroundLoader(
+            [("audio", self._load_audio_assets)] +
+            [(path, partial(self.assets.preload_image, path)) for path in SPRITE_IMAGES]
+        ).start()
+
+        # Inizializzazione simulazione (logica di gioco senza display) con le ondate della campagna
+        self.sim = Simulation(grid_width=15, grid_height=20, cell_size=40, sidebar_width=200,
+                              waves=WaveSet.load())
+        # Bilanciamento e ondate della partita: replay e salvataggi li sostituiscono
+        # nella simulazione, ogni nuova partita riparte da questi
+        self.config = self.sim.config
+        self.waves = self.sim.waves
+
+        # Inizializzazione schermo
+        self.grid_width, self.grid_height, self.cell_size = self.sim.grid_width, self.sim.grid_height, self.sim.cell_size
+        self.sidebar_width = self.sim.sidebar_width  # Larghezza sidebar
+        # Area di gioco + sidebar
+        self.screen_width = self.sim.screen_width
+        self.screen_height = self.sim.screen_height
+        flags = pygame.SCALED | pygame.RESIZABLE if scaled_window else 0
+        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height), flags)
+        # Area di gioco sullo schermo (destinazione dell'ingrandimento a risoluzione ridotta)
+        self.playfield_view = self.screen.subsurface((0, 0, self.sim.game_width, self.screen_height))
+        pygame.display.set_caption("Space Invaders")
+
+        # Inizializzazione sfondo
+        self.background = self.assets.load_background("images/menu_background.jpg", (self.screen_width, self.screen_height))
+
+        # Inizializzazione logo
+        self.logo = self.assets.load_image("images/game_logo.png", (300, 150))
+
+        # Giocatore (lo sprite arriva con il caricamento in background)
+        self.player = self.sim.player
+
+        # Inizializzazione variabili di stato
+        self.DEBUG_MODE = False  # Imposta a False per nascondere la griglia
+        self.grid_surface = None
+        self._init_debug_grid()
+
+        # Livelli precomposti (sfondo, sidebar, griglia) e HUD
+        self.layers = LayerCompositor()
+
+        # Rendering a rettangoli sporchi durante il PLAYING
+        self.DIRTY_RENDERING = False  # Imposta a True per aggiornare solo le aree cambiate
+        self.dirty_renderer = DirtyRectRenderer(self.screen, self._static_layer(playing=True))
+
+        # Risoluzione dinamica: l'area di gioco si disegna a risoluzione ridotta
+        # quando il frame supera il budget (sidebar e testi restano nativi)
+        self.DYNAMIC_RESOLUTION = False  # Imposta a True per adattare la risoluzione al tempo di frame
+        self.resolution = ResolutionScaler()
+        self._scaled_targets = {}  # Superfici fuori schermo per ogni livello
+
+        # Qualità adattiva: i costi opzionali si sospendono quando il frame è lento
+        # (l'ordine è in common/quality.py; ogni cambio va nel log del governor)
+        self.ADAPTIVE_QUALITY = False  # Imposta a True per ridurre la qualità quando i frame sono lenti
+        self.quality = QualityGovernor()
+        self._budget_owner = None  # Regolatore che ha ricevuto l'ultimo frame
+        self._hud_values = None  # Valori mostrati dalla sidebar e istante dell'ultimo aggiornamento
+        self._hud_time = 0.0
+
+        # Input tenuti premuti e sparo in attesa del prossimo step
+        self.held_actions = Action.NONE
+        self.pending_shot = False
+
+        # Registrazione degli input di ogni partita e riproduzione delle replay
+        self.REPLAY_PATH = None  # Imposta un percorso per salvare la replay di ogni partita
+        self.recorder = ReplayRecorder(self.sim)
+        self.replay = None
+        self.replay_speed = 1
+
+        # Trasmissione della partita agli spettatori (SpectatorServer, vedi main.py --serve)
+        self.spectators = None
+
+        # Profiler per fase: F3 mostra i percentili a schermo
+        self.PROFILE_PATH = None  # Imposta un percorso per salvare la traccia all'uscita
+        self.show_profiler = False
+        self.current_state = GameState.MENU
+
+        # Inizializzazione bottoni
+        self._init_menu_buttons()
+        self._init_result_buttons()
+        # Input: un'unica lettura della coda eventi per frame, smistata per stato
+        self.input = InputDispatcher()
+        self.input_latency = InputLatency()
+        self._init_input()
+        # Start resta disabilitato finché il caricamento non è completo
+        self.start_button = self.menu_buttons[0]
+        self.start_button.enabled = False
+        self._finish_loading()
+
+        self.clock = pygame.time.Clock()
+        self.running = True
+        # Frazione di tick trascorsa dall'ultimo step (interpolazione del rendering)
+        self.interpolation = 1.0
+
+    def _load_audio_assets(self):
+        """Carica tutti gli asset audio necessari"""
+        # Musica di sottofondo
+        self.assets.load_music("sounds/background_music.mp3", volume=0.5)
+        
+        # Effetti sonori
+        self.assets.load_sound("sounds/shoot.wav", volume=0.3, category="shoot")
+        self.assets.load_sound("sounds/explosion.wav", volume=0.3, category="explosion")
+
+    def _finish_loading(self, wait=False):
+        """
+        Completa sul thread principale il caricamento in background (conversione
+        degli sprite e atlante). Senza wait aggiorna solo l'avanzamento sul
+        bottone Start se il caricamento non è ancora finito.
+        Restituisce True quando gli asset sono pronti.
+        """
+        if self.assets_ready:
+            return True
+        if wait:
+            self.loader.wait()
+        elif not self.loader.done:
+            self.start_button.text = f"Loading {int(self.loader.progress * 100)}%"
+            return False
+
+        self.player.load_image(self.assets)
+        self._load_sprites()
+        # Le immagini scalate caricate finora finiscono nella cache su disco
+        self.assets.save_disk_cache()
+        self.start_button.text = "Start"
+        self.start_button.enabled = True
+        self.assets_ready = True
+        return True
+
+    # INIZIALIZZAZIONE GRIGLIA PER DEBUG
+    def _init_debug_grid(self):
+        # La griglia non cambia: viene creata una sola volta
+        if self.DEBUG_MODE and self.grid_surface is None:
+            # Crea la griglia solo per l'area di gioco (senza sidebar)
+            self.grid_surface = self._create_grid_surface(
+                self.screen_width,  # Solo area di gioco
+                self.screen_height,
+                self.cell_size,
+                (160, 160, 160)  # Colore grigio chiaro
+            )
+            
+    def _create_grid_surface(self, width, height, cell_size, color):
+        grid_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+
+        for x in range(0, width, cell_size):
+            pygame.draw.line(grid_surface, color, (x, 0), (x, height))
+        for y in range(0, height, cell_size):
+            pygame.draw.line(grid_surface, color, (0, y), (width, y))
+
+        return grid_surface
+
+    def _static_layer(self, playing):
+        """
+        Livello statico precomposto: sfondo, griglia di debug e, durante il
+        PLAYING, la cornice della sidebar. Costruito una volta per configurazione.
+        """
+        key = ("playing" if playing else "menu", self.DEBUG_MODE)
+        return self.layers.static_layer(key, lambda: self._build_static_layer(playing))
+
+    def _build_static_layer(self, playing):
+        surface = self.background.copy()
+        
+        # Griglia di debug (se attiva)
+        if self.DEBUG_MODE:
+            self._init_debug_grid()
+            surface.blit(self.grid_surface, (0, 0))
+        
+        # Sfondo sidebar
+        if playing:
+            pygame.draw.rect(surface, (50, 50, 50), self._sidebar_rect())
+        return surface
+
+    def _sidebar_rect(self):
+        return pygame.Rect(self.grid_width * self.cell_size, 0,
+                           self.sidebar_width, self.screen_height)
+
+    def _hud_layer(self):
+        """
+        Sidebar con punteggio, vite e ondata: ricostruita solo quando cambiano
+        (Surface, cambiata). A qualità ridotta al massimo ogni REDUCED_HUD_INTERVAL.
+        """
+        values, now = (self.score, self.lives, self.sim.wave), time.perf_counter()
+        if values != self._hud_values:
+            if self.quality.degraded("hud") and now - self._hud_time < REDUCED_HUD_INTERVAL:
+                values = self._hud_values
+            else:
+                self._hud_values, self._hud_time = values, now
+        return self.layers.hud_layer("sidebar", values, partial(self._build_hud_layer, *values))
+
+    def _build_hud_layer(self, score, lives, wave):
+        sidebar_rect = self._sidebar_rect()
+        # Parte dalla cornice già presente nel livello statico
+        hud = self._static_layer(playing=True).subsurface(sidebar_rect).copy()
+        
+        # Punteggio
+        score_text = self.assets.render_text(f"Score: {score}", 36, (255, 255, 255))
+        hud.blit(score_text, (10, 30))
+        
+        # Vite
+        lives_text = self.assets.render_text("Lives:", 36, (255, 255, 255))
+        hud.blit(lives_text, (10, 80))
+        
+        for i in range(lives):
+            pygame.draw.circle(hud, (255, 0, 0), (30 + i * 40, 120), 15)
+
+        # Ondata corrente
+        wave_text = self.assets.render_text(f"Wave: {wave + 1}", 36, (255, 255, 255))
+        hud.blit(wave_text, (10, 160))
+        return hud
+
+    def _draw_sidebar(self):
+        """Disegna la barra laterale con punteggio e vite - SOLO in PLAYING"""
+        if self.current_state != GameState.PLAYING:
+            return
+        hud, _ = self._hud_layer()
+        self.screen.blit(hud, self._sidebar_rect())
+
+    def toggle_profiler(self):
+        """Mostra/nasconde i tempi per fase (il profiler misura finché è visibile o si salva la traccia)"""
+        self.show_profiler = not self.show_profiler
+        PROFILER.enable(self.show_profiler or self.PROFILE_PATH is not None)
+        self.dirty_renderer.invalidate()
+
+    def _profiler_layer(self):
+        """Tabella dei percentili per fase, ricostruita ogni PROFILE_OVERLAY_REFRESH frame"""
+        refresh = PROFILER.frame_count // PROFILE_OVERLAY_REFRESH
+        overlay, _ = self.layers.hud_layer("profiler", refresh, self._build_profiler_layer)
+        return overlay
+
+    def _build_profiler_layer(self):
+        rows = [("fase", "p50", "p95", "p99")]
+        rows.extend((phase, *(f"{value:.2f}" for value in values))
+                    for phase, values in PROFILER.summary().items())
+        latency = self.input_latency.summary()
+        if latency:
+            # Latenza dall'arrivo di un input al frame che ne mostra l'effetto
+            rows.append(("input lag", *(f"{value:.2f}" for value in latency)))
+        line_height, columns = 18, (8, 185, 240, 295)
+        overlay = pygame.Surface((300, line_height * len(rows) + 8))
+        overlay.fill((20, 20, 20))
+        for i, row in enumerate(rows):
+            y = 4 + i * line_height
+            color = (255, 255, 0) if i == 0 else (255, 255, 255)
+            overlay.blit(self.assets.render_text(row[0], 20, color), (columns[0], y))
+            for value, right in zip(row[1:], columns[1:]):
+                text = self.assets.render_text(value, 20, color)
+                overlay.blit(text, text.get_rect(topright=(right, y)))
+        return overlay
+
+    def _draw_profiler(self):
+        """Disegna i tempi per fase sopra l'area di gioco (accanto alla griglia di debug)"""
+        if not self.show_profiler:
+            return None
+        overlay = self._profiler_layer()
+        return self.screen.blit(overlay, (10, 10))
+            
+    def start_action(self):
+        '''
+            Impostazione stato di gioco
+            Avvio musica
+        '''
+
+        print("Avvio il gioco!")
+        self._finish_loading(wait=True)
+        self.current_state = GameState.PLAYING
+        self.assets.play_music()
+
+    def start_replay(self, replay, speed=1, tick=None):
+        '''
+            Riproduce una replay caricata con Replay.load
+            - speed: tick di replay eseguiti per ogni tick di gioco (avanzamento veloce)
+            - tick: tick da cui iniziare (parte dal keyframe più vicino)
+        '''
+
+        self._finish_loading(wait=True)
+        self.replay = replay
+        self.replay_speed = speed
+        replay.seek(self.sim, replay.start_tick if tick is None else tick)
+        self.current_state = GameState.PLAYING
+        self.assets.play_music()
+
+    def save_game(self, path=QUICKSAVE_PATH):
+        """Salva la partita in corso (simulazione e schermata corrente)"""
+        size = write_save(path, self.sim, self.current_state)
+        print(f"Partita salvata in {path} ({size} byte)")
+
+    def resume(self, path=QUICKSAVE_PATH):
+        """
+        Riprende una partita salvata con save_game: lo stato viene caricato
+        nella simulazione esistente, senza ricreare oggetti né ricaricare asset
+        """
+        self._finish_loading(wait=True)
+        try:
+            state = read_save(path, self.sim)
+        except (OSError, ValueError) as e:
+            print(f"Errore nel caricamento del salvataggio {path}: {e}")
+            return False
+        # Da qui la registrazione della replay riparte dallo stato ripristinato
+        self.recorder.start()
+        self.replay = None
+        self.held_actions = Action.NONE
+        self.pending_shot = False
+        self.instructions_shown = False
+        self.current_state = state
+        self._enemy_sprite_set(self.sim.wave_layout.size)
+        self.dirty_renderer.invalidate()
+        self.assets.play_music()
+        return True
+
+    def _sprite_count(self):
+        return 1 + len(self.enemies) + len(self.bullets) + len(self.enemy_shots)
+
+    def _record_frame(self, frame_ms):
+        """
+        Passa il tempo del frame a un solo regolatore. La risoluzione dinamica
+        ha la precedenza: la qualità scende solo quando la risoluzione è al
+        minimo e il frame è ancora lento, e va ripristinata del tutto prima
+        che la risoluzione possa risalire.
+        """
+        resolution, quality = self.resolution, self.quality
+        if not (self.DYNAMIC_RESOLUTION or self.ADAPTIVE_QUALITY):
+            return
+        if self.DYNAMIC_RESOLUTION and not (self.ADAPTIVE_QUALITY and (quality.level or resolution.pressure > 0)):
+            owner = resolution
+        else:
+            owner = quality
+        if owner is not self._budget_owner:
+            # Le misure raccolte prima del passaggio non riguardano la situazione attuale
+            owner.restart()
+            self._budget_owner = owner
+
+        if owner is resolution:
+            if resolution.record(frame_ms):
+                print(f"Risoluzione dell'area di gioco: {resolution.scale:.0%}")
+        elif quality.record(frame_ms):
+            self._apply_quality()
+        elif quality.level == 0 and quality.pressure < 0:
+            # Qualità piena con margine: la risoluzione può tornare a salire
+            resolution.pressure = 0
+
+    def _apply_quality(self):
+        """Applica il livello di qualità del governor ai costi che non si leggono a ogni frame"""
+        self.assets.sound_mixer.max_voices = REDUCED_VOICES if self.quality.degraded("effects") else MAX_VOICES
+        self.dirty_renderer.invalidate()
+
+    def quit_action(self):
+        '''
+            Stop finestra di gioco
+        '''
+
+        self.running = False
+
+    # Stato della simulazione esposto al livello di presentazione
+    @property
+    def score(self):
+        return self.sim.score
+
+    @property
+    def lives(self):
+        return self.sim.lives
+
+    @property
+    def enemies(self):
+        return self.sim.enemies
+
+    @property
+    def bullets(self):
+        return self.sim.bullets
+
+    @property
+    def enemy_shots(self):
+        return self.sim.enemy_shots
+
+    def _load_sprites(self, sizes=()):
+        """
+        Costruisce l'atlante degli sprite del PLAYING: i tipi di nemico in
+        ogni dimensione usata dalle ondate, giocatore e proiettili
+        pre-renderizzati in un'unica Surface
+        """
+        campaign_sizes = {wave.size for wave in self.sim.waves.campaign}
+        sizes = sorted(set(sizes) | campaign_sizes | {self.sim.wave_layout.size})
+        templates = {}
+        for size in sizes:
+            for t in range(len(ENEMY_TYPES)):
+                enemy = Enemy(0, 0, t)
+                enemy.rect.size = (size, size)
+                enemy.load_image(self.assets)
+                templates[f"enemy{t}@{size}"] = enemy
+        templates["player"] = self.player
+        templates["bullet"] = Shoot(0, 0)
+        templates["enemy_shot"] = EnemyShot(0, 0)
+        images = {name: self._sprite_image(entity) for name, entity in templates.items()}
+
+        # Un atlante per ogni livello di risoluzione, con gli sprite già scalati:
+        # a risoluzione ridotta il frame non scala nessuno sprite
+        self.sprite_tiers = {scale: self._build_sprite_tier(images, sizes, scale)
+                             for scale in self.resolution.tiers}
+        self.atlas, self.sprite_offsets, self.enemy_sprites = self.sprite_tiers[1.0]
+
+    def _build_sprite_tier(self, images, sizes, scale):
+        """Atlante, offset e sprite nemici per dimensione con gli sprite scalati di scale"""
+        atlas, offsets = SpriteAtlas(), {}
+        for name, (image, (ox, oy)) in images.items():
+            if scale != 1.0:
+                w, h = image.get_size()
+                image = pygame.transform.smoothscale(image, (max(1, round(w * scale)), max(1, round(h * scale))))
+                ox, oy = round(ox * scale), round(oy * scale)
+            atlas.add(name, image)
+            offsets[name] = (ox, oy)
+        atlas.build()
+
+        # Rettangoli sorgente e offset dei nemici indicizzati per tipo, per ogni dimensione
+        enemy_sprites = {}
+        for size in sizes:
+            names = [f"enemy{t}@{size}" for t in range(len(ENEMY_TYPES))]
+            enemy_sprites[size] = ([atlas.regions[name] for name in names],
+                                   np.array([offsets[name] for name in names], dtype=np.int32))
+        return atlas, offsets, enemy_sprites
+
+    def _enemy_sprite_set(self, size, scale=1.0):
+        """Regioni e offset degli sprite nemici di una dimensione (gli atlanti si estendono se manca)"""
+        if size not in self.enemy_sprites:
+            self._load_sprites(list(self.enemy_sprites) + [size])
+            self.dirty_renderer.invalidate()
+        return self.sprite_tiers[scale][2][size]
+
+    def _sprite_image(self, entity):
+        """Immagine di un'entità e suo offset rispetto al rettangolo di collisione"""
+        image = getattr(entity, "image", None)
+        if image:
+            return image, (entity.image_offset_x, entity.image_offset_y)
+        # Fallback grafico: disegna l'entità su una Surface delle sue dimensioni
+        surface = pygame.Surface(entity.rect.size, pygame.SRCALPHA)
+        position = entity.rect.topleft
+        entity.rect.topleft = (0, 0)
+        entity.draw(surface)
+        entity.rect.topleft = position
+        return surface, (0, 0)
+
+    def _draw_playfield(self):
+        """Disegna giocatore, nemici e proiettili con un'unica chiamata blits sull'atlante"""
+        self.screen.blits(self._playfield_batch(), doreturn=False)
+
+    def _playfield_batch(self, scale=1.0):
+        """
+        Sequenza (atlante, posizione, area) di tutti gli sprite del PLAYING;
+        con scale < 1 usa l'atlante del livello e posizioni ridotte
+        """
+        enemies = self.enemies
+        # Prima dell'atlante: una dimensione nuova ricostruisce gli atlanti
+        enemy_regions, enemy_offsets = self._enemy_sprite_set(self.sim.wave_layout.size, scale)
+        atlas, sprite_offsets, _ = self.sprite_tiers[scale]
+        atlas, regions = atlas.surface, atlas.regions
+        alpha = self.interpolation
+
+        # Giocatore interpolato tra il tick precedente e quello corrente
+        ox, oy = sprite_offsets["player"]
+        (px, py), (x, y) = self.sim.player_previous, self.player.rect.topleft
+        if alpha < 1.0:
+            x, y = px + round((x - px) * alpha), py + round((y - py) * alpha)
+        if scale != 1.0:
+            x, y = round(x * scale), round(y * scale)
+        batch = [(atlas, (x + ox, y + oy), regions["player"])]
+
+        if len(enemies):
+            xs, ys = self._scaled_positions(enemies, alpha, scale)
+            offsets = enemy_offsets[enemies.kind]
+            batch.extend(zip([atlas] * len(enemies),
+                             zip((xs + offsets[:, 0]).tolist(), (ys + offsets[:, 1]).tolist()),
+                             [enemy_regions[kind] for kind in enemies.kind.tolist()]))
+
+        for store, name in ((self.bullets, "bullet"), (self.enemy_shots, "enemy_shot")):
+            if len(store):
+                xs, ys = self._scaled_positions(store, alpha, scale)
+                region = regions[name]
+                batch.extend((atlas, position, region)
+                             for position in zip(xs.tolist(), ys.tolist()))
+        return batch
+
+    @staticmethod
+    def _scaled_positions(store, alpha, scale):
+        """Posizioni interpolate di un archivio, ridotte alla risoluzione del livello"""
+        xs, ys = store.positions(alpha)
+        if scale != 1.0:
+            xs, ys = np.rint(xs * scale).astype(np.int32), np.rint(ys * scale).astype(np.int32)
+        return xs, ys
+
+    def _scaled_static_layer(self, scale):
+        """Sfondo dell'area di gioco ridotto alla risoluzione del livello (costruito una volta)"""
+        key = ("playfield", scale, self.DEBUG_MODE)
+        size = self._scaled_target(scale).get_size()
+        static = self._static_layer(playing=True).subsurface(self.playfield_view.get_rect())
+        return self.layers.static_layer(key, lambda: pygame.transform.smoothscale(static, size))
+
+    def _scaled_target(self, scale):
+        """Superficie fuori schermo su cui si disegna l'area di gioco a risoluzione ridotta"""
+        target = self._scaled_targets.get(scale)
+        if target is None:
+            width, height = self.playfield_view.get_size()
+            target = pygame.Surface((round(width * scale), round(height * scale))).convert()
+            self._scaled_targets[scale] = target
+        return target
+
+    def _render_scaled(self, scale):
+        """
+        Render del PLAYING con l'area di gioco a risoluzione ridotta: gli sprite
+        pre-scalati si disegnano fuori schermo e l'immagine viene ingrandita
+        (senza filtro: è il passaggio più economico) sull'area di gioco.
+        Sidebar e profiler restano alla risoluzione nativa.
+        """
+        self.dirty_renderer.invalidate()
+        target = self._scaled_target(scale)
+        target.blit(self._scaled_static_layer(scale), (0, 0))
+        PROFILER.mark("render_static")
+        target.blits(self._playfield_batch(scale), doreturn=False)
+        pygame.transform.scale(target, self.playfield_view.get_size(), self.playfield_view)
+        PROFILER.mark("render_playfield")
+        self._draw_sidebar()
+        PROFILER.mark("render_hud")
+        if self._draw_profiler():
+            PROFILER.mark("render_overlay")
+        pygame.display.flip()
+        PROFILER.mark("flip")
+
+    def _render_dirty(self):
+        """Render del PLAYING che aggiorna solo le aree cambiate dal frame precedente"""
+        dirty = self.dirty_renderer
+        static = self._static_layer(playing=True)
+        if dirty.background is not static:
+            dirty.set_background(static)
+        dirty.begin()
+        PROFILER.mark("render_static")
+        dirty.draw(self._playfield_batch())
+        PROFILER.mark("render_playfield")
+
+        # La sidebar si ridisegna se cambiano punteggio/vite o se uno sprite l'ha toccata
+        sidebar_rect = self._sidebar_rect()
+        hud, changed = self._hud_layer()
+        if changed or dirty.touches(sidebar_rect):
+            self.screen.blit(hud, sidebar_rect)
+            dirty.mark(sidebar_rect)
+        PROFILER.mark("render_hud")
+
+        overlay_rect = self._draw_profiler()
+        if overlay_rect:
+            dirty.mark(overlay_rect)
+            PROFILER.mark("render_overlay")
+
+        dirty.present()
+        PROFILER.mark("flip")
+
+    def reset_game(self):
+        """Resetta completamente lo stato del gioco"""
+        # Re-inizializza simulazione, nemici e giocatore
+        self._finish_loading(wait=True)
+        self.sim.waves = self.waves
+        self.sim.configure(self.config)
+        self.sim.reset()
+        self.recorder.start()
+        self.replay = None
+        self.held_actions = Action.NONE
+        self.pending_shot = False
+        
+        # Ripristina lo stato di gioco
+        self.current_state = GameState.PLAYING
+        
+        # Gestione musica
+        self.assets.stop_music()
+        self.assets.play_music()
+        
+        # Forza un render immediato
+        self.render()
+        pygame.display.flip()
+            
+    def _init_menu_buttons(self):
+        """Inizializza i bottoni del menu principale"""
+        button_width, button_height = 200, 50
+        center_x = self.screen_width // 2 - button_width // 2
+        
+        # Riorganizza i bottoni con più spazio e posizione migliore
+        self.menu_buttons = [
+            Button(
+                center_x, 300, button_width, button_height,
+                "Start",
+                color=(50, 120, 50),
+                hover_color=(70, 150, 70),
+                text_color=(255, 255, 255),
+                action=self.start_action,
+                asset_manager=self.assets
+            ),
+            Button(
+                center_x, 380, button_width, button_height,
+                "How to Play",
+                color=(50, 50, 120),
+                hover_color=(70, 70, 150),
+                text_color=(255, 255, 255),
+                action=self.show_instructions,
+                asset_manager=self.assets
+            ),
+            Button(
+                center_x, 460, button_width, button_height,
+                "Quit",
+                color=(120, 50, 50),
+                hover_color=(150, 70, 70),
+                text_color=(255, 255, 255),
+                action=self.quit_action,
+                asset_manager=self.assets
+            )
+        ]
+
+    def _init_result_buttons(self):
+        """Inizializza i bottoni per gli schermi di vittoria/sconfitta"""
+        button_width, button_height = 200, 50
+        center_x = self.screen_width // 2 - button_width // 2
+        
+        # Bottoni condivisi per VICTORY e GAMEOVER
+        self.victory_buttons = [
+            Button(
+                center_x, 300, button_width, button_height,  # Spostato più in basso
+                "Play Again",
+                color=(50, 120, 50),
+                hover_color=(70, 150, 70),
+                text_color=(255, 255, 255),
+                action=self.reset_game,
+                asset_manager=self.assets
+            ),
+            Button(
+                center_x, 380, button_width, button_height,
+                "Main Menu",
+                color=(50, 50, 120),
+                hover_color=(70, 70, 150),
+                text_color=(255, 255, 255),
+                action=self.return_to_menu,
+                asset_manager=self.assets
+            ),
+            Button(
+                center_x, 460, button_width, button_height,
+                "Quit",
+                color=(120, 50, 50),
+                hover_color=(150, 70, 70),
+                text_color=(255, 255, 255),
+                action=self.quit_action,
+                asset_manager=self.assets
+            )
+        ]
+        
+        self.gameover_buttons = [
+            Button(
+                center_x, 300, button_width, button_height,
+                "Retry",
+                color=(50, 120, 50),
+                hover_color=(70, 150, 70),
+                text_color=(255, 255, 255),
+                action=self.reset_game,
+                asset_manager=self.assets
+            ),
+            Button(
+                center_x, 380, button_width, button_height,
+                "Main Menu",
+                color=(50, 50, 120),
+                hover_color=(70, 70, 150),
+                text_color=(255, 255, 255),
+                action=self.return_to_menu,
+                asset_manager=self.assets
+            ),
+            Button(
+                center_x, 460, button_width, button_height,
+                "Quit",
+                color=(120, 50, 50),
+                hover_color=(150, 70, 70),
+                text_color=(255, 255, 255),
+                action=self.quit_action,
+                asset_manager=self.assets
+            )
+        ]
+        
+        # Bottone per tornare indietro dalla schermata delle istruzioni
+        self.back_button = Button(
+            self.screen_width//2 - 100, 400, 200, 50,
+            "Back to Menu",
+            color=(50, 50, 120),
+            hover_color=(70, 70, 150),
+            text_color=(255, 255, 255),
+            action=self.return_to_menu,
+            asset_manager=self.assets
+        )
+        
+        # Aggiungi stato per le istruzioni
+        self.instructions_shown = False
+
+    def show_instructions(self):
+        """Mostra le istruzioni del gioco"""
+        self.instructions_shown = True
+
+    def return_to_menu(self):
+        """Torna al menu principale e resetta il gioco"""
+        self.reset_game()
+        self.current_state = GameState.MENU
+        self.instructions_shown = False
+        self.assets.stop_music()
+
+    def _init_input(self):
+        """Registra gli handler di input per ogni stato"""
+        register = self.input.register
+        register(None, pygame.QUIT, lambda event: self.quit_action())
+        register(None, pygame.KEYDOWN, lambda event: self.toggle_profiler(), key=pygame.K_F3)
+
+        # Bottoni delle schermate
+        for state, buttons in ((GameState.MENU, self.menu_buttons),
+                               (INSTRUCTIONS, [self.back_button]),
+                               (GameState.VICTORY, self.victory_buttons),
+                               (GameState.GAMEOVER, self.gameover_buttons)):
+            register(state, pygame.MOUSEBUTTONDOWN, partial(self._click_buttons, buttons), key=1)
+
+        # Comandi di gioco: frecce tenute premute, sparo alla pressione
+        for key, action in ((pygame.K_LEFT, Action.LEFT), (pygame.K_RIGHT, Action.RIGHT)):
+            register(GameState.PLAYING, pygame.KEYDOWN, partial(self._hold_action, action, True), key=key)
+            register(GameState.PLAYING, pygame.KEYUP, partial(self._hold_action, action, False), key=key)
+        register(GameState.PLAYING, pygame.KEYDOWN, self._queue_shot, key=pygame.K_SPACE)
+        register(GameState.PLAYING, pygame.KEYDOWN, lambda event: self.save_game(), key=pygame.K_F5)
+        register(None, pygame.KEYDOWN, lambda event: self.resume(), key=pygame.K_F9)
+
+    def _input_state(self):
+        """Chiave della tabella degli input per la schermata corrente"""
+        if self.current_state == GameState.MENU and self.instructions_shown:
+            return INSTRUCTIONS
+        return self.current_state
+
+    def _click_buttons(self, buttons, event):
+        return any(button.handle_event(event, event.pos) for button in buttons)
+
+    def _hold_action(self, action, pressed, event):
+        if pressed:
+            self.held_actions |= action
+        else:
+            self.held_actions &= ~action
+
+    def _queue_shot(self, event):
+        self.pending_shot = True
+
+    def handle_events(self):
+        """
+        Legge la coda degli eventi (unico punto del gioco) e passa ogni evento
+        agli handler dello stato corrente. L'arrivo degli input gestiti viene
+        registrato per la misura della latenza: durante il PLAYING l'effetto
+        arriva con il prossimo tick, nelle altre schermate subito.
+        """
+        for event in pygame.event.get():
+            arrival = time.perf_counter()
+            # Lo stato può cambiare a metà coda (es. click su Start): gli
+            # eventi successivi vanno agli handler del nuovo stato
+            if self.input.dispatch(self._input_state(), event) and event.type != pygame.QUIT:
+                self.input_latency.arrived(arrival)
+        if self.current_state != GameState.PLAYING:
+            self.input_latency.applied()
+
+    def update(self):
+        """Avanza la simulazione con l'input corrente e riproduce i suoni degli eventi"""
+        if self.replay:
+            # In riproduzione gli input arrivano dalla replay
+            events = self.replay.advance(self.sim, self.replay_speed)
+        else:
+            actions = self.held_actions
+            if self.pending_shot:
+                actions |= Action.SHOOT
+                self.pending_shot = False
+            events = self.recorder.step(actions)
+        # Gli input letti finora sono entrati nella simulazione
+        self.input_latency.applied()
+        if self.spectators:
+            self.spectators.publish()
+
+        for event in events:
+            if event == EVENT_WAVE:
+                # Sprite della nuova ondata pronti prima del primo frame
+                self._enemy_sprite_set(self.sim.wave_layout.size)
+            else:
+                self.assets.play_sound(EVENT_SOUNDS[event])
+
+        # Fine partita decisa dalla simulazione
+        if self.sim.state != GameState.PLAYING:
+            self.current_state = self.sim.state
+            if self.replay is None and self.REPLAY_PATH:
+                self.recorder.save(self.REPLAY_PATH)
+        elif self.replay and self.replay.finished(self.sim):
+            # Replay interrotta prima della fine della partita
+            self.return_to_menu()
+        PROFILER.mark("update")
+
+    # Renderizza elementi a schermo
+    def render(self):
+        """Renderizza tutti gli elementi del gioco in base allo stato corrente"""
+        if self.current_state == GameState.PLAYING and self.resolution.scale != 1.0:
+            self._render_scaled(self.resolution.scale)
+            return
+        # A qualità ridotta lo sfondo si ridisegna solo sotto gli sprite, finché
+        # gli sprite sono pochi (oltre, il ridisegno completo costa meno)
+        dirty = self.DIRTY_RENDERING or (self.quality.degraded("background") and self._sprite_count() < MAX_DIRTY_RECTS)
+        if dirty and self.current_state == GameState.PLAYING:
+            self._render_dirty()
+            return
+        # Le altre schermate ridisegnano tutto: il prossimo frame a aree sporche riparte da zero
+        self.dirty_renderer.invalidate()
+
+        # Livello statico: sfondo, griglia di debug e cornice della sidebar
+        self.screen.blit(self._static_layer(self.current_state == GameState.PLAYING), (0, 0))
+        PROFILER.mark("render_static")
+        
+        mouse_pos = pygame.mouse.get_pos()
+        
+        # Render in base allo stato corrente
+        if self.current_state == GameState.MENU:
+            if not self.instructions_shown:
+                # Logo del gioco
+                if self.logo:
+                    logo_rect = self.logo.get_rect(center=(self.screen_width//2, 120))
+                    self.screen.blit(self.logo, logo_rect)
+                
+                # Bottoni del menu
+                for button in self.menu_buttons:
+                    button.check_hover(mouse_pos)
+                    button.draw(self.screen)
+            else:
+                # Schermata delle istruzioni
+                self._render_instructions()
+                
+        elif self.current_state == GameState.PLAYING:
+            # Elementi di gioco
+            self._draw_playfield()
+            PROFILER.mark("render_playfield")
+            
+            # Sidebar con punteggio e vite
+            self._draw_sidebar()
+            PROFILER.mark("render_hud")
+            
+        elif self.current_state == GameState.VICTORY:
+            # Messaggio di vittoria
+            text = self.assets.render_text("VICTORY!", 72, (0, 255, 0))
+            text_rect = text.get_rect(center=(self.screen_width//2, 150))
+            self.screen.blit(text, text_rect)
+            
+            # Punteggio finale
+            score_text = self.assets.render_text(f"Final Score: {self.score}", 48, (255, 255, 255))
+            score_rect = score_text.get_rect(center=(self.screen_width//2, 220))
+            self.screen.blit(score_text, score_rect)
+            
+            # Bottoni
+            for button in self.victory_buttons:
+                button.check_hover(mouse_pos)
+                button.draw(self.screen)
+                
+        elif self.current_state == GameState.GAMEOVER:
+            # Messaggio di game over
+            text = self.assets.render_text("GAME OVER", 72, (255, 0, 0))
+            text_rect = text.get_rect(center=(self.screen_width//2, 150))
+            self.screen.blit(text, text_rect)
+            
+            # Punteggio finale
+            score_text = self.assets.render_text(f"Final Score: {self.score}", 48, (255, 255, 255))
+            score_rect = score_text.get_rect(center=(self.screen_width//2, 220))
+            self.screen.blit(score_text, score_rect)
+            
+            # Bottoni
+            for button in self.gameover_buttons:
+                button.check_hover(mouse_pos)
+                button.draw(self.screen)
+        PROFILER.mark("render_screens")
+
+        # Tempi per fase (se visibili)
+        if self._draw_profiler():
+            PROFILER.mark("render_overlay")
+        
+        # Aggiornamento dello schermo
+        pygame.display.flip()
+        PROFILER.mark("flip")
+
+    def _render_instructions(self):
+        """Renderizza la schermata delle istruzioni"""
+        # Titolo
+        title = self.assets.render_text("HOW TO PLAY", 72, (255, 255, 0))
+        title_rect = title.get_rect(center=(self.screen_width//2, 80))
+        self.screen.blit(title, title_rect)
+        
+        # Istruzioni
+        instructions = [
+            "Use LEFT and RIGHT arrow keys to move",
+            "Press SPACE to shoot",
+            "Destroy all aliens to win",
+            "Don't let them reach you!",
+            "Avoid their shots to survive"
+        ]
+        
+        for i, line in enumerate(instructions):
+            text = self.assets.render_text(line, 36, (255, 255, 255))
+            text_rect = text.get_rect(center=(self.screen_width//2, 180 + i * 40))
+            self.screen.blit(text, text_rect)
+        
+        # Bottone per tornare indietro (il click è gestito da handle_events)
+        back_button = self.back_button
+        back_button.check_hover(pygame.mouse.get_pos())
+        back_button.draw(self.screen)
+
+    # Avvio del gioco
+    def run(self):
+        """
+        Ciclo a passo fisso: la simulazione avanza sempre a TICK_RATE tick al
+        secondo, il rendering gira alla velocità consentita (MAX_FPS) e
+        interpola le posizioni tra gli ultimi due tick. Se il frame è in
+        ritardo si eseguono più tick senza renderizzare (frame-skip), al
+        massimo MAX_CATCH_UP_TICKS per frame.
+        """
+        tick_duration = 1.0 / TICK_RATE
+        accumulator = 0.0
+        previous_time = time.perf_counter()
+
+        if self.PROFILE_PATH:
+            PROFILER.enable()
+
+        while self.running:
+            PROFILER.begin_frame()
+            self.assets.sound_mixer.begin_frame()
+            self._finish_loading()
+            now = time.perf_counter()
+            accumulator += now - previous_time
+            previous_time = now
+
+            self.handle_events()
+            PROFILER.mark("events")
+            
+            # Aggiorna solo se in stato PLAYING
+            ticks = 0
+            while accumulator >= tick_duration and ticks < MAX_CATCH_UP_TICKS:
+                if self.current_state == GameState.PLAYING:
+                    self.update()
+                accumulator -= tick_duration
+                ticks += 1
+            if accumulator >= tick_duration:
+                # Troppo in ritardo: si scarta il tempo che non si può recuperare
+                accumulator %= tick_duration
+            
+            # Senza interpolazione (qualità ridotta) gli sprite restano sull'ultimo tick
+            self.interpolation = 1.0 if self.quality.degraded("smoothing") else accumulator / tick_duration
+            self.render()
+            self.input_latency.presented()
+            if self.current_state == GameState.PLAYING:
+                # Tempo di lavoro del frame (senza l'attesa del limite di FPS)
+                self._record_frame((time.perf_counter() - now) * 1000)
+            self.clock.tick(MAX_FPS)
+            PROFILER.mark("idle")
+            PROFILER.end_frame()
+        
+        if self.PROFILE_PATH:
+            PROFILER.export_trace(self.PROFILE_PATH)
+        if self.spectators:
+            packet_size, publish_ms = self.spectators.stats()
+            print(f"Spettatori: {self.spectators.packets_sent} pacchetti, {packet_size:.0f} byte in media, "
+                  f"{publish_ms:.3f} ms per tick")
+            self.spectators.close()
+        if self.quality.changes:
+            print("Qualità: {} riduzioni, {} ripristini, livello più basso {}".format(*self.quality.summary()))
+        latency = self.input_latency.summary()
+        if latency:
+            print("Latenza input -> schermo: p50 {:.1f} ms, p95 {:.1f} ms, p99 {:.1f} ms "
+                  "({} input)".format(*latency, self.input_latency.count))
         pygame.quit()
\ No newline at end of file
@@ -1,5 +1,45 @@
-from game import Game
-
-if __name__ == "__main__":
-    game = Game()
-    game.run() 
\ No newline at end of file
+import argparse
+from game import Game, QUICKSAVE_PATH
+from common.replay import Replay
+from common.waves import WaveSet
+from common.spectator import SpectatorServer, SPECTATOR_PORT
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Space Invaders")
+    parser.add_argument("--record", metavar="FILE", help="salva la replay di ogni partita nel file")
+    parser.add_argument("--replay", metavar="FILE", help="riproduce una replay salvata")
+    parser.add_argument("--speed", type=int, default=1, help="tick di replay per tick di gioco (default 1)")
+    parser.add_argument("--seek", type=int, metavar="TICK", help="tick da cui iniziare la replay")
+    parser.add_argument("--endless", action="store_true", help="dopo l'ultima ondata continua con ondate sempre più grandi")
+    parser.add_argument("--serve", type=int, nargs="?", const=SPECTATOR_PORT, metavar="PORT",
+                        help=f"trasmette la partita agli spettatori (src/spectate.py) sulla porta UDP indicata (default {SPECTATOR_PORT}, 0 per una porta libera)")
+    parser.add_argument("--serve-host", default="127.0.0.1",
+                        help="indirizzo su cui ricevere gli spettatori (default 127.0.0.1, 0.0.0.0 per la rete)")
+    parser.add_argument("--resume", metavar="FILE", nargs="?", const=QUICKSAVE_PATH,
+                        help="riprende una partita salvata (default il salvataggio rapido di F5)")
+    parser.add_argument("--dynamic-resolution", action="store_true",
+                        help="riduce la risoluzione dell'area di gioco quando il frame supera il budget di 60 fps")
+    parser.add_argument("--scaled", action="store_true", help="finestra ridimensionabile, ingrandita mantenendo la risoluzione del gioco")
+    parser.add_argument("--adaptive-quality", action="store_true",
+                        help="riduce la qualità un passo alla volta quando il frame supera il budget di 60 fps")
+    parser.add_argument("--quality-log", metavar="FILE", help="aggiunge al file (JSON lines) ogni cambio di qualità")
+    parser.add_argument("--profile", metavar="FILE", help="misura le fasi di ogni frame e salva la traccia (Chrome trace JSON)")
+    args = parser.parse_args()
+
+    game = Game(scaled_window=args.scaled)
+    game.DYNAMIC_RESOLUTION = args.dynamic_resolution
+    game.ADAPTIVE_QUALITY = args.adaptive_quality
+    game.quality.log_path = args.quality_log
+    game.REPLAY_PATH = args.record
+    game.PROFILE_PATH = args.profile
+    if args.serve is not None:
+        game.spectators = SpectatorServer(game.sim, host=args.serve_host, port=args.serve)
+        host, port = game.spectators.address[:2]
+        print(f"Spettatori su {host}:{port} (python src/spectate.py --port {port})")
+    if args.endless:
+        game.waves = game.sim.waves = WaveSet.load(endless=True)
+    if args.replay:
+        game.start_replay(Replay.load(args.replay), speed=args.speed, tick=args.seek)
+    elif args.resume:
+        game.resume(args.resume)
+    game.run()
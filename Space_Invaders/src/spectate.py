@@ -0,0 +1,99 @@
+import argparse
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import pygame
+
+from common.asset_manager import AssetManager
+from common.enemy import ENEMY_TYPES
+from common.game_state import GameState
+from common.shoot import SHOT_WIDTH, SHOT_HEIGHT, PLAYER_BULLET_COLOR, ENEMY_BULLET_COLOR
+from common.spectator import SpectatorClient, SPECTATOR_PORT
+
+# Frame al secondo del client (le snapshot arrivano a 60 tick/s)
+SPECTATOR_FPS = 60
+PLAYER_SIZE = 50
+SIDEBAR_WIDTH = 200
+
+class SpectatorView:
+    def __init__(self, client):
+        """
+        Client leggero: disegna le snapshot ricevute dal server, senza
+        simulazione. Gli sprite dei nemici si caricano per dimensione alla
+        prima ondata che la usa.
+        """
+        self.client = client
+        self.screen = None
+        self.assets = AssetManager()
+        self.player_image = self._sprite("images/player.png", PLAYER_SIZE)
+        self._enemy_images = {}
+        self.bullet = pygame.Surface((SHOT_WIDTH, SHOT_HEIGHT))
+        self.bullet.fill(PLAYER_BULLET_COLOR)
+        self.enemy_shot = pygame.Surface((SHOT_WIDTH, SHOT_HEIGHT))
+        self.enemy_shot.fill(ENEMY_BULLET_COLOR)
+
+    def _sprite(self, path, size):
+        """Immagine scalata nel quadrato size x size e offset per centrarla"""
+        image = self.assets.load_image(path, (size, size), keep_aspect_ratio=True)
+        return image, ((size - image.get_width()) // 2, (size - image.get_height()) // 2)
+
+    def _enemy_sprites(self, size):
+        if size not in self._enemy_images:
+            self._enemy_images[size] = [self._sprite(f"images/{name}", size) for name in ENEMY_TYPES]
+        return self._enemy_images[size]
+
+    def draw(self, snapshot):
+        width, height = snapshot.screen_size
+        if self.screen is None or self.screen.get_size() != (width, height):
+            self.screen = pygame.display.set_mode((width, height))
+        screen = self.screen
+        screen.fill((0, 0, 0))
+
+        batch = []
+        sprites = self._enemy_sprites(snapshot.enemy_size)
+        ids, xs, ys, kinds = snapshot.stores["enemies"]
+        for x, y, kind in zip(xs.tolist(), ys.tolist(), kinds.tolist()):
+            image, (ox, oy) = sprites[kind]
+            batch.append((image, (x + ox, y + oy)))
+        for name, image in (("bullets", self.bullet), ("enemy_shots", self.enemy_shot)):
+            _, xs, ys, _ = snapshot.stores[name]
+            batch.extend((image, position) for position in zip(xs.tolist(), ys.tolist()))
+        image, (ox, oy) = self.player_image
+        batch.append((image, (snapshot.player[0] + ox, snapshot.player[1] + oy)))
+        screen.blits(batch, doreturn=False)
+
+        # Sidebar con punteggio, vite, ondata e stato della partita
+        sidebar = pygame.Rect(width - SIDEBAR_WIDTH, 0, SIDEBAR_WIDTH, height)
+        pygame.draw.rect(screen, (50, 50, 50), sidebar)
+        state = GameState(snapshot.state)
+        lines = [f"Score: {snapshot.score}", f"Lives: {snapshot.lives}", f"Wave: {snapshot.wave + 1}",
+                 "LIVE" if state == GameState.PLAYING else state.name]
+        for i, line in enumerate(lines):
+            screen.blit(self.assets.render_text(line, 36, (255, 255, 255)), (sidebar.x + 10, 30 + i * 50))
+        pygame.display.flip()
+
+    def run(self):
+        clock = pygame.time.Clock()
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    running = False
+            snapshot = self.client.poll()
+            if snapshot is not None:
+                self.draw(snapshot)
+            clock.tick(SPECTATOR_FPS)
+        self.client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Segue una partita trasmessa da main.py --serve")
+    parser.add_argument("--host", default="127.0.0.1", help="indirizzo del server (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=SPECTATOR_PORT, help=f"porta del server (default {SPECTATOR_PORT})")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_caption("Space Invaders - Spettatore")
+    pygame.display.set_mode((15 * 40 + SIDEBAR_WIDTH, 20 * 40))
+    SpectatorView(SpectatorClient(args.host, args.port)).run()
+    pygame.quit()
@@ -0,0 +1,162 @@
+import argparse
+import csv
+import itertools
+import math
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from common.game_state import GameState, Action
+from common.game_config import GameConfig
+from common.enemy import ENEMY_SIZE
+from common.vector_env import VectorSimulation, PLAYER_SIZE
+
+# Limite di tick per partita: oltre, la partita viene contata come non finita
+MAX_GAME_TICKS = 20000
+# Distanza (in pixel sopra il giocatore) entro cui un colpo nemico viene schivato
+DODGE_DISTANCE = 120
+
+def scripted_actions(vec):
+    """
+    Politica scriptata per tutte le partite di una VectorSimulation:
+    spara sempre, si allinea al nemico vivo più vicino e schiva i colpi
+    nemici in arrivo. Restituisce un array (N,) di flag Action.
+    """
+    center = vec.player_x + PLAYER_SIZE // 2
+    enemy_center = np.where(vec.enemy_alive, vec.enemy_x + ENEMY_SIZE // 2, 1 << 30)
+    nearest = np.abs(enemy_center - center[:, None]).argmin(axis=1)
+    target = enemy_center[np.arange(vec.num_envs), nearest]
+
+    actions = np.full(vec.num_envs, int(Action.SHOOT), dtype=np.int32)
+    actions[target < center - 2] |= Action.LEFT
+    actions[target > center + 2] |= Action.RIGHT
+
+    # Schivata: un colpo sopra il giocatore e allineato ha la precedenza
+    incoming = (vec.shot_alive & (vec.shot_y > vec.player_y - DODGE_DISTANCE) &
+                (np.abs(vec.shot_x - center[:, None]) < PLAYER_SIZE))
+    danger = incoming.any(axis=1)
+    threat_x = np.where(incoming, vec.shot_x, 0).max(axis=1)
+    dodge_left = danger & (threat_x >= center)
+    dodge_right = danger & (threat_x < center)
+    actions[danger] &= ~(Action.LEFT | Action.RIGHT)
+    actions[dodge_left] |= Action.LEFT
+    actions[dodge_right] |= Action.RIGHT
+    return actions
+
+def play_games(values, games, seed, max_ticks=MAX_GAME_TICKS):
+    """
+    Gioca in modalità headless un blocco di partite con una configurazione
+    (eseguita nei processi worker). Restituisce vittorie, durate e punteggi.
+    """
+    vec = VectorSimulation(games, autoreset=False, seed=seed, config=GameConfig(**values))
+    vec.reset()
+    ticks = 0
+    while ticks < max_ticks and (vec.state == GameState.PLAYING.value).any():
+        vec.step(scripted_actions(vec))
+        ticks += 1
+    finished = vec.state != GameState.PLAYING.value
+    return {
+        "values": values,
+        "games": games,
+        "wins": int((vec.state == GameState.VICTORY.value).sum()),
+        "unfinished": int((~finished).sum()),
+        "ticks": vec.frame.tolist(),
+        "scores": vec.score.tolist(),
+    }
+
+def grid_combinations(space):
+    """Tutte le combinazioni dei valori (prodotto cartesiano)"""
+    names = list(space)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(space[name] for name in names))]
+
+def random_combinations(space, count, seed=None):
+    """
+    count combinazioni estratte a caso (senza ripetizioni) dallo spazio dei valori:
+    ogni parametro viene estratto indipendentemente, senza costruire la griglia
+    """
+    names = list(space)
+    if count >= math.prod(len(space[name]) for name in names):
+        return grid_combinations(space)
+    rng = random.Random(seed)
+    seen = set()
+    combos = []
+    while len(combos) < count:
+        combo = tuple(rng.choice(space[name]) for name in names)
+        if combo not in seen:
+            seen.add(combo)
+            combos.append(dict(zip(names, combo)))
+    return combos
+
+def run_sweep(combos, games=64, workers=None, seed=0, max_ticks=MAX_GAME_TICKS):
+    """
+    Distribuisce le combinazioni su un ProcessPoolExecutor e aggrega i risultati:
+    una riga per combinazione con win rate, durata media (tick) e punteggio medio.
+    """
+    base = GameConfig()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_games, base.replace(**combo).as_dict(), games, seed + i, max_ticks)
+                   for i, combo in enumerate(combos)]
+        results = [future.result() for future in futures]
+
+    rows = []
+    for combo, result in zip(combos, results):
+        ticks, scores = np.array(result["ticks"]), np.array(result["scores"])
+        rows.append({
+            **combo,
+            "games": result["games"],
+            "win_rate": result["wins"] / result["games"],
+            "avg_ticks": float(ticks.mean()),
+            "p95_ticks": float(np.percentile(ticks, 95)),
+            "avg_score": float(scores.mean()),
+            "unfinished": result["unfinished"],
+        })
+    rows.sort(key=lambda row: row["win_rate"], reverse=True)
+    return rows
+
+def print_table(rows):
+    """Stampa i risultati come tabella allineata"""
+    if not rows:
+        return
+    columns = list(rows[0])
+    cells = [[f"{row[c]:.3f}" if isinstance(row[c], float) else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(line[i]) for line in cells)) for i, c in enumerate(columns)]
+    print("  ".join(c.rjust(w) for c, w in zip(columns, widths)))
+    for line in cells:
+        print("  ".join(value.rjust(w) for value, w in zip(line, widths)))
+
+def parse_param(text):
+    """Interpreta 'nome=v1,v2,...' in (nome, [valori])"""
+    name, _, values = text.partition("=")
+    if name not in GameConfig.FIELDS or not values:
+        raise argparse.ArgumentTypeError(
+            f"parametro non valido: {text} (nomi validi: {', '.join(GameConfig.FIELDS)})")
+    return name, [int(value) for value in values.split(",")]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Sweep dei parametri di bilanciamento. Le partite usano VectorSimulation, "
+                    "che gioca solo l'ondata classica: le ondate di assets/waves.json non vengono misurate.")
+    parser.add_argument("--param", type=parse_param, action="append", default=[], metavar="NOME=V1,V2",
+                        help="valori da provare per un parametro di GameConfig (ripetibile)")
+    parser.add_argument("--random", type=int, metavar="N", help="prova N combinazioni casuali invece della griglia")
+    parser.add_argument("--games", type=int, default=64, help="partite per combinazione (default 64)")
+    parser.add_argument("--workers", type=int, help="processi worker (default: numero di CPU)")
+    parser.add_argument("--seed", type=int, default=0, help="seme delle partite e del campionamento")
+    parser.add_argument("--max-ticks", type=int, default=MAX_GAME_TICKS, help="limite di tick per partita")
+    parser.add_argument("--csv", metavar="FILE", help="salva i risultati anche in CSV")
+    args = parser.parse_args()
+
+    space = dict(args.param)
+    combos = random_combinations(space, args.random, args.seed) if args.random else grid_combinations(space)
+    rows = run_sweep(combos, args.games, args.workers, args.seed, args.max_ticks)
+    print("Risultati sulla sola ondata classica (le ondate di assets/waves.json non sono simulate)")
+    print_table(rows)
+    if args.csv and rows:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
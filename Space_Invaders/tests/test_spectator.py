@@ -0,0 +1,158 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from common.game_state import Action
+from common.simulation import Simulation
+from common.spectator import (Snapshot, SpectatorServer, SpectatorClient, encode_snapshot, decode_snapshot,
+                              SNAPSHOT_STORES, ID_TYPE, POSITION_TYPE, KIND_TYPE)
+
+def make_snapshot(seq, enemies=(), bullets=(), enemy_shots=()):
+    """Snapshot costruita a mano: per ogni archivio una lista di (id, x, y, kind)"""
+    stores = {}
+    for name, entities in zip(SNAPSHOT_STORES, (enemies, bullets, enemy_shots)):
+        entities = sorted(entities)
+        columns = list(zip(*entities)) if entities else ([], [], [], [])
+        stores[name] = tuple(np.array(column, dtype=dtype)
+                             for column, dtype in zip(columns, (ID_TYPE, POSITION_TYPE, POSITION_TYPE, KIND_TYPE)))
+    return Snapshot(seq, seq, 0, 0, 3, 0, (375, 740), 30, (800, 800), stores)
+
+class SnapshotCodecTest(unittest.TestCase):
+    def assertSameSnapshot(self, decoded, expected):
+        self.assertIsNotNone(decoded)
+        self.assertEqual((decoded.seq, decoded.tick, decoded.score, decoded.wave, decoded.lives, decoded.state),
+                         (expected.seq, expected.tick, expected.score, expected.wave, expected.lives, expected.state))
+        self.assertEqual(tuple(decoded.player), tuple(expected.player))
+        for name in SNAPSHOT_STORES:
+            for decoded_field, expected_field in zip(decoded.stores[name], expected.stores[name]):
+                np.testing.assert_array_equal(decoded_field, expected_field, err_msg=name)
+
+    def roundtrip(self, current, baseline=None):
+        baselines = {baseline.seq: baseline} if baseline else {}
+        return decode_snapshot(encode_snapshot(current, baseline), baselines)
+
+    def test_full_snapshot(self):
+        sim = Simulation(seed=1)
+        snapshot = Snapshot.capture(sim, 1)
+        self.assertSameSnapshot(self.roundtrip(snapshot), snapshot)
+
+    def test_adds_removes_and_moves(self):
+        base = make_snapshot(1, enemies=[(0, 10, 10, 0), (1, 50, 10, 1), (2, 90, 10, 2)],
+                             bullets=[(0, 200, 500, 0)])
+        # Formazione spostata in blocco, un nemico rimosso, un proiettile mosso e uno nuovo
+        current = make_snapshot(2, enemies=[(0, 14, 10, 0), (2, 94, 10, 2)],
+                                bullets=[(0, 200, 490, 0), (1, 300, 700, 0)], enemy_shots=[(0, 40, 60, 0)])
+        self.assertSameSnapshot(self.roundtrip(current, base), current)
+
+    def test_pool_slot_reuse(self):
+        # Il proiettile 0 è sparito e un colpo nuovo ha ripreso lo stesso id
+        base = make_snapshot(1, bullets=[(0, 200, 20, 0), (1, 300, 400, 0)])
+        current = make_snapshot(2, bullets=[(0, 380, 740, 0), (1, 300, 390, 0)])
+        self.assertSameSnapshot(self.roundtrip(current, base), current)
+
+    def test_reused_id_with_new_kind(self):
+        base = make_snapshot(1, enemies=[(0, 10, 10, 0), (1, 50, 10, 1)])
+        current = make_snapshot(2, enemies=[(0, 10, 10, 2), (1, 50, 10, 1)])
+        self.assertSameSnapshot(self.roundtrip(current, base), current)
+
+    def test_simulation_deltas(self):
+        sim = Simulation(seed=3)
+        baseline = Snapshot.capture(sim, 1)
+        for seq in range(2, 300):
+            sim.step(Action.SHOOT | (Action.LEFT if seq % 80 < 40 else Action.RIGHT))
+            current = Snapshot.capture(sim, seq)
+            decoded = self.roundtrip(current, baseline)
+            self.assertSameSnapshot(decoded, current)
+            baseline = decoded
+
+    def test_reset(self):
+        sim = Simulation(seed=1)
+        for _ in range(120):
+            sim.step(Action.SHOOT)
+        baseline = Snapshot.capture(sim, 1)
+        sim.reset(seed=2)
+        current = Snapshot.capture(sim, 2)
+        base_kinds, kinds = baseline.stores["enemies"][3], current.stores["enemies"][3]
+        shared = min(len(base_kinds), len(kinds))
+        # Stessi id con tipi ritirati: il caso che il delta deve riconoscere
+        self.assertTrue((base_kinds[:shared] != kinds[:shared]).any())
+        self.assertSameSnapshot(self.roundtrip(current, baseline), current)
+
+    def test_missing_baseline(self):
+        base = make_snapshot(1, enemies=[(0, 10, 10, 0)])
+        packet = encode_snapshot(make_snapshot(2, enemies=[(0, 12, 10, 0)]), base)
+        self.assertIsNone(decode_snapshot(packet, {}))
+        self.assertIsNone(decode_snapshot(packet[:10], {1: base}))
+
+class SpectatorLoopbackTest(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulation(seed=4)
+        self.server = SpectatorServer(self.sim, port=0, history=8)
+        self.client = SpectatorClient(*self.server.address, history=8)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+
+    def pump(self, ticks, client_polls=True):
+        for _ in range(ticks):
+            self.sim.step(Action.SHOOT)
+            self.server.publish()
+            time.sleep(0.002)
+            if client_polls:
+                self.client.poll()
+
+    def drop_packets(self):
+        while True:
+            try:
+                self.client.socket.recv(65535)
+            except BlockingIOError:
+                return
+
+    def wait_for_client(self, condition, timeout=2.0):
+        end = time.perf_counter() + timeout
+        while not condition():
+            self.assertLess(time.perf_counter(), end, "lo spettatore non ha ricevuto le snapshot")
+            self.server.poll()
+            self.client.poll()
+            time.sleep(0.002)
+
+    def assertClientMatches(self):
+        latest, expected = self.client.latest, self.server.snapshots[self.server.seq]
+        self.assertEqual(latest.seq, expected.seq)
+        for name in SNAPSHOT_STORES:
+            for received, sent in zip(latest.stores[name], expected.stores[name]):
+                np.testing.assert_array_equal(received, sent)
+
+    def test_acks_and_resync(self):
+        self.wait_for_client(lambda: self.server.clients)
+        self.pump(30)
+        self.wait_for_client(lambda: self.client.latest and self.client.latest.seq == self.server.seq)
+        self.server.poll()
+        acked = next(iter(self.server.clients.values()))[0]
+        # Le conferme arrivano: i pacchetti successivi sono delta
+        self.assertGreater(acked, 0)
+        self.assertClientMatches()
+
+        # Pacchetti persi finché la base confermata esce dalla storia del server:
+        # lo spettatore riparte da una snapshot completa
+        acked = next(iter(self.server.clients.values()))[0]
+        self.pump(3 * self.server.history, client_polls=False)
+        self.drop_packets()
+        self.assertNotIn(acked, self.server.snapshots)
+        self.pump(2)
+        self.wait_for_client(lambda: self.client.latest.seq == self.server.seq)
+        self.assertClientMatches()
+
+        # Reset della partita con lo spettatore collegato
+        self.sim.reset(seed=5)
+        self.pump(5)
+        self.wait_for_client(lambda: self.client.latest.seq == self.server.seq)
+        self.assertClientMatches()
+
+if __name__ == "__main__":
+    unittest.main()